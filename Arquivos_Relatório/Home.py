@@ -1,6 +1,6 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+from inferify.data import load_songs, load_popularity, load_artists
 
 # --- Configuração da Página ---
 st.set_page_config(
@@ -9,9 +9,9 @@ st.set_page_config(
 )
 
 # --- Carregamento dos dados ---
-df = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Arquivos_Relat%C3%B3rio/songs_info.csv")
-df_um = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Arquivos_Relat%C3%B3rio/artistas_popularidade.csv")
-df_dois = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Arquivos_Relat%C3%B3rio/artistas_info.csv")
+df = load_songs()
+df_um = load_popularity()
+df_dois = load_artists()
 
 # --- Barra Lateral (Filtros) ---
 st.sidebar.header("🔍 Filtros")
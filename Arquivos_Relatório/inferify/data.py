@@ -0,0 +1,137 @@
+"""Carregamento compartilhado dos dados do Inferify.
+
+Os CSVs que acompanham o app são a fonte padrão, então o painel funciona sem
+internet. Se ``INFERIFY_REMOTE_BASE`` estiver definida (ex.: a pasta ``raw`` do
+GitHub), o arquivo remoto é baixado uma vez e depois só revalidado com
+``If-None-Match``/``If-Modified-Since``. O resultado já tipado fica no cache do
+Streamlit por ``INFERIFY_CACHE_TTL`` segundos, evitando reler os arquivos a cada
+interação com os filtros.
+
+Esta é a versão do relatório, publicada a partir desta pasta com o próprio
+``requirements.txt`` (só pandas, Streamlit e Plotly) e os próprios CSVs. Por
+isso ela não importa o ``Inferify/inferify/data.py``, que lê o dataset colunar
+e os índices gerados (pyarrow, SciPy) e não existe no app publicado. Só a parte
+de fonte remota e leitura dos CSVs é igual à do painel.
+"""
+import json
+import os
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+# Pasta do app (onde ficam os CSVs) e pasta de cache local
+APP_DIR = Path(__file__).resolve().parent.parent
+CACHE_DIR = APP_DIR / ".cache"
+
+# Fonte remota opcional e tempo de vida do cache em memória
+REMOTE_BASE = os.environ.get("INFERIFY_REMOTE_BASE", "")
+CACHE_TTL = int(os.environ.get("INFERIFY_CACHE_TTL", 3600))
+REMOTE_TIMEOUT = 5
+
+# Tipos de cada coluna, aplicados na leitura para evitar conversões nas páginas
+SONGS_DTYPES = {
+    "artist": "string",
+    "title": "string",
+    "genre": "string",
+    "lyrics": "string",
+    "Album": "string",
+    "release_year": "int64",
+    "Word Count": "int64",
+    "score": "float64",
+    "sentiment": "string",
+    "filter": "string",
+    "joy": "float64",
+    "sadness": "float64",
+    "surprise": "float64",
+    "trust": "float64",
+    "anger": "float64",
+    "disgust": "float64",
+    "anticipation": "float64",
+    "fear": "float64",
+}
+POPULARITY_DTYPES = {
+    "nome": "string",
+    "popularidade": "int64",
+    "seguidores": "int64",
+    "imagem_principal": "string",
+    "tipo": "string",
+    "pais": "string",
+}
+ARTISTS_DTYPES = {
+    "nome": "string",
+    "sexo": "string",
+    "banda": "string",
+}
+
+
+def _fetch_remote(filename):
+    """Revalida a cópia local do arquivo remoto e retorna o caminho dela.
+
+    Retorna ``None`` quando não há fonte remota configurada ou quando a
+    requisição falha sem que exista uma cópia anterior.
+    """
+    if not REMOTE_BASE:
+        return None
+
+    copy_path = CACHE_DIR / filename
+    meta_path = CACHE_DIR / f"{filename}.meta.json"
+    meta = json.loads(meta_path.read_text()) if meta_path.exists() and copy_path.exists() else {}
+
+    request = urllib.request.Request(f"{REMOTE_BASE.rstrip('/')}/{filename}")
+    if meta.get("etag"):
+        request.add_header("If-None-Match", meta["etag"])
+    if meta.get("last_modified"):
+        request.add_header("If-Modified-Since", meta["last_modified"])
+
+    try:
+        with urllib.request.urlopen(request, timeout=REMOTE_TIMEOUT) as response:
+            content = response.read()
+            headers = response.headers
+    except (urllib.error.URLError, TimeoutError, OSError):
+        # 304 (não modificado) ou falha de rede: a cópia anterior, se existir, continua valendo
+        return copy_path if meta else None
+
+    # Grava primeiro em arquivo temporário para não deixar cópia pela metade
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = copy_path.with_suffix(copy_path.suffix + ".tmp")
+    tmp_path.write_bytes(content)
+    tmp_path.replace(copy_path)
+    meta_path.write_text(json.dumps({
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }))
+    return copy_path
+
+
+def resolve_source(filename):
+    """Retorna o caminho a ser lido: cópia remota revalidada ou arquivo local."""
+    remote_path = _fetch_remote(filename)
+    return remote_path if remote_path is not None else APP_DIR / filename
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _read_csv(filename, dtypes):
+    df = pd.read_csv(resolve_source(filename), dtype=dtypes)
+    # Padroniza os textos uma única vez, em vez de repetir em cada página
+    for col, dtype in dtypes.items():
+        if dtype == "string" and col in df.columns:
+            df[col] = df[col].str.strip()
+    return df
+
+
+def load_songs():
+    """Músicas com letras, metadados e emoções inferidas (``songs_info.csv``)."""
+    return _read_csv("songs_info.csv", SONGS_DTYPES)
+
+
+def load_popularity():
+    """Popularidade e seguidores dos artistas no Spotify (``artistas_popularidade.csv``)."""
+    return _read_csv("artistas_popularidade.csv", POPULARITY_DTYPES)
+
+
+def load_artists():
+    """Relação entre integrantes e bandas (``artistas_info.csv``)."""
+    return _read_csv("artistas_info.csv", ARTISTS_DTYPES)
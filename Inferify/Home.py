@@ -1,6 +1,7 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+from inferify.data import load_lyrics_at, load_popularity, load_artists, load_cube, load_member_filter
+from inferify.sidebar import render_sidebar, filtered_songs, cached, cached_figure
 
 # --- Configuração da Página ---
 st.set_page_config(
@@ -9,70 +10,26 @@ st.set_page_config(
 )
 
 # --- Carregamento dos dados ---
-df = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Inferify/songs_info.csv")
-df_um = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Inferify/artistas_popularidade.csv")
-df_dois = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Inferify/artistas_info.csv")
+df_um = load_popularity()
+df_dois = load_artists()
+cubo = load_cube()
 
 # --- Barra Lateral (Filtros) ---
-st.sidebar.header("🔍 Filtros")
-
-# --- Filtro de Ano (com Slider mais bonito) ---
-anos_disponiveis = sorted(df['release_year'].dropna().unique())
-ano_min, ano_max = int(min(anos_disponiveis)), int(max(anos_disponiveis))
-
-anos_selecionados = st.sidebar.slider(
-    "Intervalo de Anos",
-    min_value=ano_min,
-    max_value=ano_max,
-    value=(ano_min, ano_max),
-    step=1
-)
-
-# --- Filtro de Artista ---
-artista_disponiveis = sorted(df['artist'].dropna().unique())
-artista_selecionadas = st.sidebar.multiselect(
-    "Selecione Artista(s) ou Banda(s)",
-    options=artista_disponiveis,
-    default=artista_disponiveis[:5],  # mostra só alguns como padrão
-    help="Pesquise pelo nome do artista ou banda"
-)
-
-# --- Filtro de Álbum ---
-album_disponiveis = sorted(df['Album'].dropna().unique())
-album_selecionados = st.sidebar.multiselect(
-    "Selecione Álbum(s)",
-    options=album_disponiveis,
-    default=album_disponiveis[:5],
-    help="Pesquise pelo nome do álbum"
-)
-
-# --- Filtro de Gênero ---
-genero = sorted(df['genre'].dropna().astype(str).unique())
-genero_um = st.sidebar.multiselect(
-    "Selecione Gênero(s) Musicais",
-    options=genero,
-    default=genero[:5],
-    help="Pesquise ou selecione múltiplos gêneros"
-)
+estado = render_sidebar()
 
 # --- Filtragem do DataFrame Principal ---
-df_filtrado = df[
-    (df['release_year'] >= anos_selecionados[0]) &
-    (df['release_year'] <= anos_selecionados[1]) &
-    (df['artist'].isin(artista_selecionadas)) &
-    (df['Album'].isin(album_selecionados)) &
-    (df['genre'].isin(genero_um))
-]
+df_filtrado = filtered_songs(estado)
+
+# Mesmos filtros aplicados às células do cubo, usado nos gráficos
+celulas = cached("celulas", estado, lambda: cubo.select(*estado))
 
 # --- Aplicar filtros também em df_um e df_dois ---
 artistas_filtrados = df_filtrado['artist'].unique()
 
 df_um_filtrado = df_um[df_um['nome'].isin(artistas_filtrados)]
 
-df_dois_filtrado = df_dois[
-    (df_dois['nome'].isin(artistas_filtrados)) |
-    (df_dois['banda'].isin(artistas_filtrados))
-].copy()
+membros = load_member_filter()
+df_dois_filtrado = df_dois.iloc[membros.rows(membros.members(artistas_filtrados))].copy()
 
 # --- Conteúdo Principal ---
 st.title("🎲 Inferify - Explorando letras musicais")
@@ -81,9 +38,11 @@ st.markdown("O Inferify é um panorama de dados para visualização e análise d
 # --- Métricas Principais (KPIs) ---
 st.subheader("Métricas Gerais")
 
-qntd_artista = df_filtrado['artist'].nunique() if not df_filtrado.empty else 0
-total_musicas = df_filtrado.shape[0]
-total_albuns = df_filtrado['Album'].nunique()
+qntd_artista, total_musicas, total_albuns = cached("home/kpis", estado, lambda: (
+    cubo.nunique("artist", mask=celulas),
+    cubo.count(mask=celulas),
+    cubo.nunique("Album", mask=celulas),
+))
 
 col1, col2, col3 = st.columns(3)
 
@@ -95,26 +54,30 @@ st.markdown("---")
 
 # Quantidade de músicas lançadas por gênero musical
 st.subheader("Quantidade de Músicas por Gênero")
-musicas_por_genero = df_filtrado.groupby("genre")["title"].count().reset_index().sort_values("title", ascending=False)
-fig1 = px.bar(musicas_por_genero, x="genre", y="title", color="title", text="title")
+fig1 = cached_figure("home/musicas_por_genero", estado, lambda: px.bar(
+    cubo.count("genre", celulas).rename("title").reset_index().sort_values("title", ascending=False),
+    x="genre", y="title", color="title", text="title"))
 st.plotly_chart(fig1, use_container_width=True)
 
 # Quantidade de gêneros musicais usados por artista
 st.subheader("Quantidade de Gêneros por Artista")
-musicas_por_genero = df_filtrado.groupby("artist")["genre"].nunique().reset_index().sort_values("genre", ascending=False)
-fig1 = px.bar(musicas_por_genero, x="artist", y="genre", color="genre", text="genre")
+fig1 = cached_figure("home/generos_por_artista", estado, lambda: px.bar(
+    cubo.nunique("genre", "artist", celulas).reset_index().sort_values("genre", ascending=False),
+    x="artist", y="genre", color="genre", text="genre"))
 st.plotly_chart(fig1, use_container_width=True)
 
 # Quantidade de Álbuns por Artista
 st.subheader("Quantidade de Álbuns por Artista")
-artist_album = df_filtrado.groupby("artist")["Album"].nunique().reset_index().sort_values("Album", ascending=False)
-fig10 = px.bar(artist_album, x="artist", y="Album", color="Album", text="Album")
+fig10 = cached_figure("home/albuns_por_artista", estado, lambda: px.bar(
+    cubo.nunique("Album", "artist", celulas).reset_index().sort_values("Album", ascending=False),
+    x="artist", y="Album", color="Album", text="Album"))
 st.plotly_chart(fig10)
 
 # Quantidade de Álbuns por Ano
 st.subheader("Quantidade de Álbuns por Ano")
-ano_album = df_filtrado.groupby("release_year")["Album"].nunique().reset_index().sort_values("Album", ascending=False)
-fig11 = px.bar(ano_album, x="release_year", y="Album", color="Album", text="Album")
+fig11 = cached_figure("home/albuns_por_ano", estado, lambda: px.bar(
+    cubo.nunique("Album", "release_year", celulas).reset_index().sort_values("Album", ascending=False),
+    x="release_year", y="Album", color="Album", text="Album"))
 st.plotly_chart(fig11)
 
 st.markdown("---")
@@ -147,4 +110,5 @@ st.markdown("""
 
 # --- Tabela de Dados Detalhados ---
 st.subheader("Dados Detalhados")
-st.dataframe(df_filtrado)
+# As letras só são lidas aqui, para as linhas filtradas
+st.dataframe(df_filtrado.join(load_lyrics_at(tuple(df_filtrado.index))))
@@ -0,0 +1 @@
+"""Medições de desempenho do pipeline do Inferify."""
@@ -0,0 +1,77 @@
+"""Compara a limpeza em etapas dos notebooks com o ``Cleaner`` de uma passada.
+
+Uso (dentro da pasta ``Inferify``): ``python -m benchmarks.bench_cleaning [repetições]``
+
+As letras brutas de todos os ``Lyrics_*.json`` do repositório são repetidas
+``repetições`` vezes. A versão dos notebooks consulta ``stopwords.words('english')``
+a cada token; sem o corpus do NLTK instalado, a lista é recriada a cada token a
+partir do ``STOPWORDS``, o que ainda é mais rápido que reler o arquivo do NLTK.
+"""
+import json
+import re
+import sys
+import time
+
+from inferify.build import ARTIST_ALIASES, discover
+from inferify.cleaning import ARTIST_STOPWORDS, STOPWORDS, Cleaner
+
+try:
+    from nltk.corpus import stopwords
+
+    stopwords.words("english")
+    english_stopwords = lambda: stopwords.words("english")  # noqa: E731
+except (ImportError, LookupError):
+    english_stopwords = lambda: sorted(STOPWORDS)  # noqa: E731
+
+
+def notebook_cleaning(artist, text):
+    """Células de limpeza do ``Lyrics.ipynb`` seguidas das ``indesejadas`` do ``Analytics_Lyric.ipynb``."""
+    text = " ".join([x for x in text.split(" ") if x not in english_stopwords()])
+    text = " ".join(re.findall("[a-zA-Z]+", text))
+    text = " ".join([x for x in text.split(" ") if len(x) > 3]).lower()
+    word_count = len(text.split(" "))
+    for word in ["embed", "intro", "verse", "chorus", "outro", "instrumental"]:
+        text = re.sub(r"\b" + word + r"\b", "", text, flags=re.IGNORECASE)
+    indesejadas = ARTIST_STOPWORDS.get(artist, [])
+    text = " ".join([palavra for palavra in text.split() if palavra not in indesejadas])
+    return text, word_count
+
+
+def load_raw_lyrics():
+    songs = []
+    for path in discover():
+        with open(path, encoding="utf-8") as arquivo:
+            data = json.load(arquivo)
+        # Mesmo nome do build, para que as indesejadas dos artistas renomeados sejam aplicadas
+        artist = ARTIST_ALIASES.get(data["name"], data["name"])
+        songs += [(artist, song["lyrics"] or "") for song in data["songs"]]
+    return songs
+
+
+def run(repeat=20):
+    songs = load_raw_lyrics() * repeat
+    print(f"Corpus: {len(songs)} músicas")
+
+    cleaner = Cleaner(ARTIST_STOPWORDS)
+    start = time.perf_counter()
+    cleaned = list(cleaner.stream(songs))
+    fused_time = time.perf_counter() - start
+    print(f"Cleaner.stream:     {len(songs) / fused_time:,.0f} músicas/s")
+
+    # A versão dos notebooks é lenta demais para o corpus inteiro
+    sample = songs[:max(1, len(songs) // repeat)]
+    start = time.perf_counter()
+    reference = [notebook_cleaning(artist, text) for artist, text in sample]
+    reference_time = time.perf_counter() - start
+    print(f"Etapas do notebook: {len(sample) / reference_time:,.0f} músicas/s")
+    print(f"Aceleração: {(reference_time / len(sample)) / (fused_time / len(songs)):.1f}x")
+
+    same = sum(
+        text == expected and count == expected_count
+        for (text, count), (expected, expected_count) in zip(cleaned, reference)
+    )
+    print(f"Resultados iguais ao notebook: {same}/{len(reference)}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,95 @@
+"""Detecção de duplicatas (``inferify.dedup``) num corpus sintético com cópias conhecidas.
+
+Uso (dentro da pasta ``Inferify``): ``python -m benchmarks.bench_dedup [tamanho]``
+
+O corpus de ``benchmarks.synthetic`` (padrão: 100k músicas) é limpo como no
+build e recebe ``DUPLICATE_SHARE`` de cópias com ``EDIT_SHARE`` das palavras
+trocadas e um trecho extra (como ad-libs de uma versão ao vivo). Metade das
+cópias leva a marcação ``(Remix)`` no título e a outra metade um título novo,
+para medir o que o MinHash encontra só pela letra. Para comparação, mede a
+comparação exata de todos os pares numa amostra e estima o tempo no corpus todo.
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticCorpus, parse_size
+from inferify.cleaning import Cleaner
+from inferify.dedup import SHINGLE_SIZE, find_duplicates
+
+DUPLICATE_SHARE = 0.05
+EDIT_SHARE = 0.03
+SAMPLE = 2_000
+
+
+def corpus_frame(size):
+    cleaner = Cleaner()
+    rows = []
+    for chunk in SyntheticCorpus(size).chunks():
+        for artist in chunk:
+            for song in artist["songs"]:
+                rows.append((artist["name"], song["title"], cleaner.clean(song["lyrics"], artist["name"])[0],
+                             int(song["release_date"][:4])))
+    return pd.DataFrame(rows, columns=["artist", "title", "lyrics", "release_year"])
+
+
+def add_copies(songs, rng):
+    """Acrescenta as cópias editadas; devolve o corpus e a posição do original de cada cópia."""
+    originals = rng.choice(len(songs), int(len(songs) * DUPLICATE_SHARE), replace=False)
+    vocabulary = songs["lyrics"].iloc[:1000].str.split().explode().dropna().unique()
+    lyrics = []
+    for text in songs["lyrics"].iloc[originals]:
+        words = np.array(text.split(), dtype=object)
+        edits = rng.random(len(words)) < EDIT_SHARE
+        words[edits] = rng.choice(vocabulary, edits.sum())
+        lyrics.append(" ".join(words) + " " + " ".join(rng.choice(vocabulary, 8)))
+    remix = np.arange(len(originals)) % 2 == 0
+    titles = np.where(remix, songs["title"].iloc[originals].to_numpy() + " (Remix)",
+                      [f"Cópia {i}" for i in range(len(originals))])
+    copies = songs.iloc[originals].assign(lyrics=lyrics, title=titles)
+    return pd.concat([songs, copies], ignore_index=True), originals, remix
+
+
+def shingle_set(text):
+    words = text.lower().split()
+    return {tuple(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def pairwise_seconds(texts):
+    """Jaccard exato entre todos os pares da amostra."""
+    sets = [shingle_set(text) for text in texts]
+    start = time.perf_counter()
+    for i in range(len(sets)):
+        for j in range(i + 1, len(sets)):
+            len(sets[i] & sets[j]) / max(len(sets[i] | sets[j]), 1)
+    return time.perf_counter() - start
+
+
+def run(size=100_000):
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    songs, originals, remix = add_copies(corpus_frame(size), rng)
+    print(f"Corpus: {len(songs):,} músicas ({len(originals):,} cópias) em {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    found = find_duplicates(songs)
+    elapsed = time.perf_counter() - start
+    copies = np.arange(size, len(songs))
+    matched = found["cluster"].to_numpy()[copies] == found["cluster"].to_numpy()[originals]
+    removed = found["canonical"].to_numpy() != np.arange(len(songs))
+    print(f"MinHash + LSH: {elapsed:.1f}s")
+    print(f"Cópias encontradas: {matched.mean():.1%} (só pela letra: {matched[~remix].mean():.1%})")
+    print(f"Originais removidos no lugar da cópia: {removed[originals].sum()}, "
+          f"músicas sem cópia removidas: {removed[:size].sum() - removed[originals].sum()}")
+
+    sample = songs["lyrics"].iloc[:SAMPLE].tolist()
+    seconds = pairwise_seconds(sample)
+    pairs = len(songs) * (len(songs) - 1) / 2
+    print(f"Todos os pares, {SAMPLE} músicas: {seconds:.1f}s; estimado para o corpus: "
+          f"{seconds / (SAMPLE * (SAMPLE - 1) / 2) * pairs / 3600:.0f}h")
+
+
+if __name__ == "__main__":
+    run(parse_size(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
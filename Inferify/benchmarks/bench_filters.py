@@ -0,0 +1,66 @@
+"""Compara os filtros das páginas (máscaras com ``isin``) com o ``SongFilter``.
+
+Uso (dentro da pasta ``Inferify``): ``python -m benchmarks.bench_filters [músicas]``
+
+As músicas do dataset são reamostradas até ``músicas`` linhas (padrão 1 milhão),
+mantendo artistas, álbuns, gêneros e anos reais. Cada seleção é resolvida pelos
+dois caminhos, que precisam marcar exatamente as mesmas linhas.
+"""
+import sys
+import time
+
+import numpy as np
+
+from inferify.dataset import SONGS_PARQUET, read_dataset
+from inferify.filters import SongFilter
+
+
+def pandas_filter(df, years, artists, albums, genres):
+    """Máscara montada como nas páginas."""
+    return (
+        (df['release_year'] >= years[0]) &
+        (df['release_year'] <= years[1]) &
+        (df['artist'].isin(artists)) &
+        (df['Album'].isin(albums)) &
+        (df['genre'].isin(genres))
+    ).to_numpy()
+
+
+def best_of(func, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(size=1_000_000):
+    songs = read_dataset(SONGS_PARQUET)
+    rng = np.random.default_rng(0)
+    df = songs.iloc[rng.integers(0, len(songs), size)].reset_index(drop=True)
+    print(f"Corpus: {len(df):,} músicas")
+
+    start = time.perf_counter()
+    index = SongFilter.build(df)
+    print(f"Montagem do índice: {time.perf_counter() - start:.2f}s")
+
+    artists, albums, genres = (sorted(df[col].dropna().unique()) for col in ("artist", "Album", "genre"))
+    years = (int(df["release_year"].min()), int(df["release_year"].max()))
+    selections = {
+        "padrão das páginas": (years, artists[:5], albums[:5], genres[:5]),
+        "metade de tudo": ((2010, 2018), artists[::2], albums[::2], genres[::2]),
+        "tudo selecionado": (years, artists, albums, genres),
+    }
+    for name, selection in selections.items():
+        expected = pandas_filter(df, *selection)
+        assert (index.mask(index.select(*selection)) == expected).all(), name
+        reference = best_of(lambda: pandas_filter(df, *selection), repeat=5)
+        bitmap = best_of(lambda: index.select(*selection))
+        rows = best_of(lambda: index.rows(index.select(*selection)))
+        print(f"{name:<20} isin: {reference * 1e3:7.2f}ms  bitmaps: {bitmap * 1e3:6.2f}ms  "
+              f"com posições: {rows * 1e3:6.2f}ms  ({expected.sum():,} linhas)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,79 @@
+"""Compara a busca de músicas parecidas linha a linha com o ``EmotionNeighbors``.
+
+Uso (dentro da pasta ``Inferify``): ``python -m benchmarks.bench_neighbors [músicas]``
+
+As músicas do dataset são reamostradas até ``músicas`` linhas (padrão 1 milhão)
+e as emoções recebem um ruído pequeno, para que as cópias não fiquem empatadas.
+A referência calcula o cosseno da música escolhida com todas as outras no
+DataFrame, como faria uma página sem índice; o índice responde uma música e um
+lote de músicas pela árvore, e também com uma máscara pequena (força bruta nas
+permitidas). Os vizinhos precisam ter as mesmas similaridades nos dois caminhos.
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from inferify.dataset import EMOTION_COLUMNS, SONGS_PARQUET, read_dataset
+from inferify.neighbors import EmotionNeighbors
+
+K = 10
+BATCH = 1_000
+
+
+def pandas_neighbors(df, row, k=K):
+    """Cosseno da música com todas as linhas do DataFrame e os ``k`` maiores."""
+    emotions = df[EMOTION_COLUMNS]
+    target = emotions.iloc[row]
+    similarity = emotions.dot(target) / (np.sqrt((emotions ** 2).sum(axis=1)) * np.sqrt((target ** 2).sum()))
+    return similarity.drop(index=row).nlargest(k)
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(size=1_000_000):
+    songs = read_dataset(SONGS_PARQUET)
+    rng = np.random.default_rng(0)
+    df = songs.iloc[rng.integers(0, len(songs), size)].reset_index(drop=True)
+    noise = rng.uniform(0.95, 1.05, (size, len(EMOTION_COLUMNS))).astype(np.float32)
+    df[EMOTION_COLUMNS] = df[EMOTION_COLUMNS].to_numpy() * noise
+    print(f"Corpus: {len(df):,} músicas")
+
+    start = time.perf_counter()
+    index = EmotionNeighbors.build(df)
+    print(f"Montagem da árvore: {time.perf_counter() - start:.2f}s")
+    with tempfile.TemporaryDirectory() as workdir:
+        path = index.save(Path(workdir) / "vizinhos.pkl")
+        start = time.perf_counter()
+        index = EmotionNeighbors.load(path)
+        print(f"Leitura do índice salvo: {time.perf_counter() - start:.3f}s ({path.stat().st_size / 2 ** 20:.0f} MB)")
+
+    rows = rng.choice(np.flatnonzero(index.profiled), BATCH, replace=False)
+    row = int(rows[0])
+    expected = pandas_neighbors(df, row).to_numpy()
+    _, similarity = index.query(row, K)
+    assert np.allclose(similarity[0], expected, atol=1e-5)
+
+    reference = best_of(lambda: pandas_neighbors(df, row), repeat=3)
+    single = best_of(lambda: index.query(row, K), repeat=20)
+    batch = best_of(lambda: index.query(rows, K))
+    print(f"Uma música, DataFrame inteiro: {reference * 1000:9.1f} ms")
+    print(f"Uma música, árvore:            {single * 1000:9.2f} ms  ({reference / single:.0f}x)")
+    print(f"{BATCH} músicas, árvore:        {batch * 1000:9.1f} ms  ({batch / BATCH * 1000:.3f} ms por música)")
+
+    allowed = (df["artist"] == df.at[row, "artist"]).to_numpy()
+    subset = best_of(lambda: index.query(row, K, allowed), repeat=20)
+    print(f"Uma música, só o artista ({allowed.sum():,} músicas): {subset * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
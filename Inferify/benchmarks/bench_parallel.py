@@ -0,0 +1,62 @@
+"""Escalabilidade da pontuação em paralelo (``inferify.parallel``).
+
+Uso (dentro da pasta ``Inferify``): ``python -m benchmarks.bench_parallel [repetições] [processos...]``
+
+As letras do dataset são repetidas ``repetições`` vezes. Para cada número de
+processos (padrão: 1, 2, 4... até o número de núcleos) mede a pontuação NRC
+(``Lexicon.count_emotions``) e, se o NLTK tiver o léxico do VADER, a polaridade
+VADER, e confere se o resultado é idêntico ao da execução em série.
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from inferify.dataset import SONGS_PARQUET, read_lyrics
+from inferify.parallel import default_workers
+from inferify.nrc_binary import load_lexicon
+from inferify.vader import load_analyzer, polarity_scores
+
+
+def worker_counts(limit):
+    counts, workers = [], 1
+    while workers < limit:
+        counts.append(workers)
+        workers *= 2
+    return counts + [limit]
+
+
+def measure(name, function, workers_list, same):
+    baseline, serial_time = None, None
+    for workers in workers_list:
+        start = time.perf_counter()
+        result = function(workers)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline, serial_time = result, elapsed
+        print(f"{name:<6} {workers:>3} processos: {elapsed:7.3f}s  "
+              f"aceleração {serial_time / elapsed:4.1f}x  idêntico: {same(result, baseline)}")
+
+
+def run(repeat=20, workers_list=None):
+    lyrics = pd.concat([read_lyrics(SONGS_PARQUET)] * repeat, ignore_index=True).tolist()
+    workers_list = workers_list or worker_counts(default_workers())
+    print(f"Corpus: {len(lyrics)} músicas, {default_workers()} núcleos")
+
+    lexicon = load_lexicon()
+    measure("NRC", lambda workers: lexicon.count_emotions(lyrics, workers), workers_list,
+            lambda a, b: all(np.array_equal(x, y) for x, y in zip(a, b)))
+
+    try:
+        analyzer = load_analyzer()
+    except (ImportError, LookupError) as erro:
+        print(f"VADER ignorado: {erro}")
+        return
+    measure("VADER", lambda workers: polarity_scores(lyrics, analyzer, workers), workers_list,
+            lambda a, b: a.equals(b))
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    run(repeat, [int(arg) for arg in sys.argv[2:]] or None)
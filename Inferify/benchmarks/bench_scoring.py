@@ -0,0 +1,87 @@
+"""Compara o ``analyze_text`` do notebook com o ``Lexicon.score`` em lote.
+
+Uso (dentro da pasta ``Inferify``): ``python -m benchmarks.bench_scoring [repetições]``
+
+As letras do dataset são repetidas ``repetições`` vezes para simular um corpus
+maior. Além das músicas por segundo, confere se ``score``, ``sentiment`` e
+``filter`` batem com a função original.
+
+Única diferença esperada: no notebook o cálculo do ``score`` consulta o
+``defaultdict`` e cria chaves zeradas, então uma letra sem nenhuma palavra do
+léxico recebe uma emoção arbitrária em vez de ``neutral``. O ``Lexicon.score``
+devolve ``neutral`` nesses casos, como a função pretendia.
+"""
+import sys
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+from inferify.dataset import SONGS_PARQUET, read_lyrics
+from inferify.scoring import NEGATIVE, NRC_TSV, POSITIVE, Lexicon
+
+try:
+    from nltk.tokenize import word_tokenize
+except ImportError:
+    word_tokenize = None
+
+
+def notebook_analyzer():
+    """Reproduz a célula do ``Analytics_Lyric.ipynb`` (léxico + ``analyze_text``)."""
+    nrc = pd.read_csv(NRC_TSV, sep="\t", names=["word", "sentiment", "association"])
+    nrc = nrc[nrc["association"] == 1]
+    emotion_sentiments = {"anger", "anticipation", "disgust", "fear", "joy", "sadness", "surprise", "trust"}
+    nrc_dict = defaultdict(list)
+    for _, row in nrc.iterrows():
+        if row["sentiment"] in emotion_sentiments:
+            nrc_dict[row["word"]].append(row["sentiment"])
+
+    def analyze_text(text):
+        # preserve_line evita depender do punkt; as letras limpas não têm pontuação
+        tokens = word_tokenize(text.lower(), preserve_line=True)
+        sentiments_count = defaultdict(int)
+        for token in tokens:
+            for sentiment in nrc_dict.get(token, []):
+                sentiments_count[sentiment] += 1
+        score = sum(sentiments_count[s] for s in POSITIVE) - sum(sentiments_count[s] for s in NEGATIVE)
+        dominant_emotion = max(sentiments_count, key=sentiments_count.get) if sentiments_count else "neutral"
+        filter_label = "intenso" if abs(score) > 2 else "neutro"
+        return pd.Series([score, dominant_emotion, filter_label], index=["score", "sentiment", "filter"])
+
+    return analyze_text
+
+
+def run(repeat=10):
+    lyrics = pd.concat([read_lyrics(SONGS_PARQUET)] * repeat, ignore_index=True)
+    print(f"Corpus: {len(lyrics)} músicas")
+
+    start = time.perf_counter()
+    lexicon = Lexicon.from_tsv()
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = lexicon.score(lyrics)
+    batch_time = time.perf_counter() - start
+    print(f"Lexicon.score:  compilação {compile_time:.3f}s, {len(lyrics) / batch_time:,.0f} músicas/s")
+
+    if word_tokenize is None:
+        print("NLTK não instalado: comparação com o notebook ignorada.")
+        return
+
+    start = time.perf_counter()
+    analyze_text = notebook_analyzer()
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    reference = lyrics.apply(analyze_text)
+    reference_time = time.perf_counter() - start
+    print(f"analyze_text:   compilação {compile_time:.3f}s, {len(lyrics) / reference_time:,.0f} músicas/s")
+    print(f"Aceleração: {reference_time / batch_time:.1f}x")
+
+    columns = ["score", "sentiment", "filter"]
+    same = (batch[columns].astype(str) == reference[columns].astype(str)).all(axis=1)
+    empty = batch["sentiment"] == "neutral"
+    print(f"Resultados iguais ao notebook: {same.sum()}/{len(same)}")
+    print(f"Diferenças fora das letras sem palavras do léxico: {(~same & ~empty).sum()}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,94 @@
+"""Tempo de consulta do índice de busca (``inferify.search``) num corpus sintético.
+
+Uso (dentro da pasta ``Inferify``): ``python -m benchmarks.bench_search [tamanho]``
+
+O corpus de ``benchmarks.synthetic`` (padrão: 100k músicas; ``1m`` para um
+milhão) é limpo como no build e indexado em partes. Cada consulta roda com o
+corpus inteiro e com uma máscara de metade das músicas, como a dos filtros da
+barra lateral, e o resultado é a mediana de várias execuções. A frase
+frequente, de dois dos termos mais comuns, é o pior caso: as posições de quase
+todas as músicas são lidas. Para comparação, mede também a busca linear com
+``str.contains`` nas letras.
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticCorpus, parse_size
+from inferify.cleaning import Cleaner
+from inferify.search import SearchIndex, parse_query, write_index
+
+RUNS = 20
+
+
+def cleaned_chunks(corpus, lyrics):
+    """Letras limpas de cada parte do corpus; guarda uma amostra em ``lyrics`` para a busca linear."""
+    cleaner = Cleaner()
+    for chunk in corpus.chunks():
+        texts = [cleaner.clean(song["lyrics"], artist["name"])[0] for artist in chunk for song in artist["songs"]]
+        if len(lyrics) < 100_000:
+            lyrics.extend(texts)
+        yield texts
+
+
+def median_ms(function, runs=RUNS):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+def queries(index, lyrics):
+    """Consultas montadas a partir do próprio índice: termos frequente e raro, frases e prefixo."""
+    order = np.argsort(-index.terms["df"].astype(np.int64))
+    common = [index.word(i) for i in order[:50] if len(index.word(i)) >= 4]
+    rare = index.word(order[len(order) // 20])
+    # Frase de uma música real do corpus: o termo raro e a palavra seguinte
+    docs, _ = index.postings(order[len(order) // 20])
+    words = lyrics[docs[0]].split()
+    following = words[words.index(rare) + 1] if words.index(rare) + 1 < len(words) else words[0]
+    return {
+        "termo frequente": common[0],
+        "termo raro": rare,
+        "dois termos": f"{common[0]} {common[1]}",
+        "frase": f'"{rare} {following}"',
+        "frase frequente": f'"{common[0]} {common[1]}"',
+        "prefixo": f"{common[2][:3]}*",
+    }
+
+
+def run(size=100_000):
+    corpus = SyntheticCorpus(size)
+    lyrics = []
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        path = write_index(cleaned_chunks(corpus, lyrics), Path(workdir) / "busca.idx")
+        print(f"Corpus: {size} músicas; índice em {time.perf_counter() - start:.1f}s "
+              f"({path.stat().st_size / 2 ** 20:.0f} MB)")
+
+        start = time.perf_counter()
+        index = SearchIndex.open(path)
+        print(f"Abertura por mmap: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        mask = np.random.default_rng(0).random(len(index)) < 0.5
+        for name, query in queries(index, lyrics).items():
+            clauses = index.normalize(parse_query(query))
+            total = index.search(clauses).total
+            full = median_ms(lambda: index.search(clauses))
+            masked = median_ms(lambda: index.search(clauses, mask=mask))
+            print(f"{name:<16} {query:<24} {total:>8} músicas  {full:8.2f} ms  com filtro {masked:8.2f} ms")
+
+        sample = pd.Series(lyrics)
+        word = queries(index, lyrics)["termo raro"]
+        linear = median_ms(lambda: sample.str.contains(rf"\b{word}\b"), runs=3)
+        print(f"Busca linear (str.contains) em {len(sample)} músicas: {linear:.1f} ms")
+
+
+if __name__ == "__main__":
+    run(parse_size(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
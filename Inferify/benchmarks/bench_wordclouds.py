@@ -0,0 +1,80 @@
+"""Compara as nuvens por emoção do notebook com o ``WordCloudService``.
+
+Uso (dentro da pasta ``Inferify``): ``python -m benchmarks.bench_wordclouds [repetições]``
+
+Mede só a preparação das palavras, que é onde as duas abordagens diferem: o
+notebook junta as letras e tokeniza de novo o corpus para a nuvem geral e para
+cada emoção, e o ``WordCloud.generate`` ainda conta as palavras do texto
+(``process_text``); o serviço monta as tabelas de frequência uma vez e cada
+nuvem é uma linha da tabela. Em seguida mede a nuvem desenhada pela primeira
+vez e lida do cache em disco.
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from wordcloud import WordCloud
+
+from inferify.dataset import EMOTION_COLUMNS, SONGS_PARQUET, read_dataset
+from inferify.terms import TermIndex
+from inferify.wordclouds import WordCloudService
+
+try:
+    from nltk.tokenize import word_tokenize
+except ImportError:
+    word_tokenize = None
+
+
+def notebook_words(songs):
+    """Reproduz as células do ``Analytics_Lyric.ipynb``: contagens da nuvem geral e de cada emoção."""
+    cloud = WordCloud()
+    text = " ".join(twt for twt in songs["lyrics"])
+    result = {"todas": cloud.process_text(text)}
+    for emotion in EMOTION_COLUMNS:
+        words = []
+        for text in songs[songs["sentiment"] == emotion]["lyrics"]:
+            # preserve_line evita depender do punkt; as letras limpas não têm pontuação
+            words.extend(word_tokenize(text.lower(), preserve_line=True))
+        result[emotion] = cloud.process_text(" ".join(words))
+    return result
+
+
+def service_words(songs):
+    service = WordCloudService(TermIndex.build(songs["lyrics"]), songs)
+    result = {"todas": service.frequencies()}
+    for emotion in EMOTION_COLUMNS:
+        result[emotion] = service.frequencies(emotion=emotion)
+    return service, result
+
+
+def run(repeat=5):
+    songs = read_dataset(SONGS_PARQUET, lyrics=True)
+    songs = pd.concat([songs] * repeat, ignore_index=True)
+    songs["lyrics"] = songs["lyrics"].fillna("")
+    print(f"Corpus: {len(songs)} músicas")
+
+    if word_tokenize is not None:
+        start = time.perf_counter()
+        notebook_words(songs)
+        print(f"Notebook (9 tokenizações + process_text): {time.perf_counter() - start:.3f}s")
+    else:
+        print("Notebook ignorado: NLTK não instalado")
+
+    start = time.perf_counter()
+    service, result = service_words(songs)
+    print(f"Tabelas de frequência (1 tokenização):    {time.perf_counter() - start:.3f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        service.directory = Path(directory)
+        start = time.perf_counter()
+        service.render(result["joy"])
+        print(f"Nuvem 'joy' desenhada:                    {time.perf_counter() - start:.3f}s")
+        start = time.perf_counter()
+        service.render(result["joy"])
+        print(f"Nuvem 'joy' do cache em disco:            {time.perf_counter() - start:.4f}s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,315 @@
+"""Suíte de desempenho do pipeline inteiro sobre um corpus sintético.
+
+Uso (dentro da pasta ``Inferify``)::
+
+    python -m benchmarks.suite 100k                   # 1k, 100k, 1m, 10m ou um número
+    python -m benchmarks.suite --compare antes.json depois.json
+
+O corpus de ``benchmarks.synthetic`` é processado em partes de ``--chunk-size``
+músicas, como faria um build de um corpus grande. Na primeira passada, cada
+parte passa por leitura dos JSONs, limpeza, pontuação NRC e estatísticas de
+normalização, e é gravada (metadados, letras e contagens brutas) num Parquet
+temporário. Na segunda, as partes são lidas de volta, normalizadas com as
+estatísticas do corpus inteiro e gravadas no dataset colunar; só as
+estatísticas ficam em memória entre as partes, então ``10m`` cabe em poucos GB.
+Em seguida vêm a leitura do dataset (sem as letras) e as agregações de cada
+página do painel (cubo, filtros, métricas e gráficos) para os cinco primeiros
+artistas com todos os seus álbuns e gêneros.
+
+O resultado vai para um JSON (por padrão ``dados/benchmarks/suite-<tamanho>-<commit>.json``)
+com o tempo e as músicas por segundo de cada etapa. ``--compare`` mostra a
+razão entre dois resultados e marca as etapas que ficaram mais lentas.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from benchmarks.synthetic import SyntheticCorpus, parse_size
+from inferify.build import genius_frame
+from inferify.cleaning import Cleaner
+from inferify.cube import EmotionCube
+from inferify.dataset import DATASET_DIR, EMOTION_COLUMNS, RAW_COLUMNS, read_dataset, to_columnar
+from inferify.distributions import box_summary, histogram
+from inferify.filters import SongFilter
+from inferify.normalization import ScoreStats
+from inferify.nrc_binary import load_lexicon
+from inferify.scoring import REPO_DIR
+from inferify.terms import TermIndex
+
+RESULTS_DIR = DATASET_DIR / "benchmarks"
+
+# O índice de termos guarda todas as palavras de todas as letras em memória
+TERMS_LIMIT = 1_000_000
+# Contagens normalizadas, na ordem de ``RAW_COLUMNS``
+SCORE_COLUMNS = ["score"] + EMOTION_COLUMNS
+
+# Etapas mais lentas que isso (razão entre os tempos) são marcadas no ``--compare``
+REGRESSION_RATIO = 1.10
+
+
+class Timer:
+    """Soma o tempo e as linhas de cada etapa, mesmo quando ela roda em partes."""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.rows = defaultdict(int)
+
+    @contextmanager
+    def stage(self, name, rows):
+        start = time.perf_counter()
+        yield
+        self.seconds[name] += time.perf_counter() - start
+        self.rows[name] += rows
+
+    def results(self):
+        return {
+            name: {
+                "seconds": round(seconds, 6),
+                "rows": self.rows[name],
+                "rows_per_second": round(self.rows[name] / seconds, 1) if seconds else None,
+            }
+            for name, seconds in self.seconds.items()
+        }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def process_chunks(corpus, timer, lexicon, workdir, workers=1):
+    """Primeira passada, parte a parte; cada parte vai para um Parquet temporário.
+
+    Devolve as estatísticas de normalização e o caminho do Parquet com os
+    metadados, as letras limpas e as contagens brutas (``RAW_COLUMNS``,
+    ``sentiment`` e ``filter``) de todas as partes.
+    """
+    cleaner = Cleaner()
+    stats = ScoreStats()
+    staged = workdir / "partes.parquet"
+    writer = None
+    for chunk in corpus.chunks():
+        songs = sum(len(artist["songs"]) for artist in chunk)
+        with timer.stage("generate_json", songs):
+            payloads = [json.dumps(artist, ensure_ascii=False).encode("utf-8") for artist in chunk]
+
+        with timer.stage("json_parse", songs):
+            artists = [json.loads(payload) for payload in payloads]
+            frame = pd.concat([genius_frame(artist).assign(genre=artist["genre"]) for artist in artists],
+                              ignore_index=True)
+            frame["Album"] = frame["Album"].fillna("Single")
+
+        with timer.stage("cleaning", songs):
+            cleaned = list(cleaner.stream(zip(frame["artist"], frame["lyrics"])))
+            frame["lyrics"] = [text for text, _ in cleaned]
+            frame["Word Count"] = [count for _, count in cleaned]
+
+        with timer.stage("scoring", songs):
+            raw = lexicon.score(frame["lyrics"], workers)
+
+        with timer.stage("normalization_stats", songs):
+            stats.update(raw)
+
+        with timer.stage("stage_chunk", songs):
+            frame["lyrics"] = frame["lyrics"].astype(str)
+            frame[RAW_COLUMNS] = raw[SCORE_COLUMNS].to_numpy()
+            frame[["sentiment", "filter"]] = raw[["sentiment", "filter"]].to_numpy()
+            writer = _write_part(writer, staged, pa.Table.from_pandas(frame, preserve_index=False))
+    if writer is not None:
+        writer.close()
+    return stats, staged
+
+
+def _write_part(writer, path, table):
+    """Acrescenta ``table`` ao Parquet em ``path``, abrindo o arquivo na primeira parte.
+
+    As categorias de cada parte podem caber em índices de tamanhos diferentes;
+    as partes seguintes são convertidas para o esquema da primeira.
+    """
+    if writer is None:
+        writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+    elif not table.schema.equals(writer.schema):
+        table = table.cast(writer.schema)
+    writer.write_table(table)
+    return writer
+
+
+def row_groups(path, columns=None):
+    """Grupos de linhas do Parquet, um por vez (um por parte gravada).
+
+    ``iter_batches`` mantém memória do pyarrow alocada até o fim do arquivo,
+    o que com ``10m`` passa da memória da máquina.
+    """
+    parquet = pq.ParquetFile(path)
+    for index in range(parquet.num_row_groups):
+        yield parquet.read_row_group(index, columns=columns)
+
+
+def write_dataset(timer, stats, staged, target):
+    """Segunda passada: normaliza cada parte e grava o dataset final, na mesma ordem."""
+    writer = None
+    for group in row_groups(staged):
+        part = group.to_pandas()
+        with timer.stage("normalization", len(part)):
+            normalized = stats.normalize(part[RAW_COLUMNS].set_axis(SCORE_COLUMNS, axis=1))
+            part[SCORE_COLUMNS] = normalized[SCORE_COLUMNS].to_numpy()
+        with timer.stage("dataset_write", len(part)):
+            writer = _write_part(writer, target, pa.Table.from_pandas(to_columnar(part), preserve_index=False))
+    if writer is not None:
+        writer.close()
+
+
+def page_aggregations(timer, songs, cube, index, terms):
+    """Consultas feitas pelas páginas para os cinco primeiros artistas.
+
+    Os cinco primeiros álbuns da lista (a seleção padrão da barra lateral)
+    quase nunca são desses artistas no corpus sintético, então a seleção usa
+    todos os álbuns e gêneros deles.
+    """
+    years = (int(songs["release_year"].min()), int(songs["release_year"].max()))
+    artists = sorted(songs["artist"].dropna().astype(str).unique())[:5]
+    chosen = songs[songs["artist"].isin(artists)]
+    state = (years, artists, sorted(chosen["Album"].astype(str).unique()), sorted(chosen["genre"].astype(str).unique()))
+    everything = (years,) + tuple(sorted(songs[col].dropna().astype(str).unique()) for col in ("artist", "Album", "genre"))
+    n = len(songs)
+
+    with timer.stage("filter_songs_all", n):
+        songs.iloc[index.rows(index.select(*everything))]
+    with timer.stage("filter_songs", n):
+        filtered = songs.iloc[index.rows(index.select(*state))]
+    with timer.stage("filter_cube", len(cube.cells)):
+        cells = cube.select(*state)
+
+    with timer.stage("page_home", n):
+        cube.nunique("artist", mask=cells), cube.count(mask=cells), cube.nunique("Album", mask=cells)
+        cube.count("genre", cells), cube.nunique("genre", "artist", cells)
+        cube.nunique("Album", "artist", cells), cube.nunique("Album", "release_year", cells)
+
+    with timer.stage("page_inferencia", n):
+        cube.mean("score", mask=cells), cube.min("score", mask=cells)
+        cube.mode("sentiment", cells), cube.mode("artist", cells)
+        cube.mean("score", "artist", cells), cube.count("sentiment", cells)
+        cube.mean("score", "release_year", cells), cube.mean("score", "genre", cells)
+        cube.count(["sentiment", "genre"], cells)
+        histogram(filtered["score"], bins=30)
+
+    with timer.stage("page_industria", n):
+        cube.nunique("release_year", mask=cells), cube.distinct_lyrics(cells)
+        cube.total("Word Count", cells), cube.nunique("genre", mask=cells)
+        cube.count("artist", cells), cube.count("release_year", cells), cube.count("Album", cells)
+        cube.mean("Word Count", "release_year", cells)
+        cube.nunique("genre", "release_year", cells), cube.nunique("genre", "Album", cells)
+        histogram(filtered["Word Count"], bins=30)
+        box_summary(filtered, "artist", "Word Count")
+        if terms is not None:
+            terms.top_terms(filtered.index, n=20)
+
+
+def run(size, seed=0, chunk_size=50_000, workdir=None, workers=1):
+    corpus = SyntheticCorpus(size, seed=seed, chunk_size=chunk_size)
+    timer = Timer()
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        tmp = Path(tmp)
+        with timer.stage("lexicon_load", 1):
+            lexicon = load_lexicon()
+        stats, staged = process_chunks(corpus, timer, lexicon, tmp, workers)
+
+        dataset = tmp / "songs.parquet"
+        write_dataset(timer, stats, staged, dataset)
+        staged.unlink()
+
+        with timer.stage("dataset_read", size):
+            songs = read_dataset(dataset)
+        # O cubo só usa as letras para contar as distintas: o hash de cada uma basta,
+        # calculado parte a parte para não carregar todas as letras de uma vez
+        songs["lyrics"] = np.concatenate([
+            pd.util.hash_array(group.column(0).to_numpy())
+            for group in row_groups(dataset, columns=["lyrics"])
+        ])
+        with timer.stage("cube_build", size):
+            cube = EmotionCube.build(songs)
+        songs = songs.drop(columns="lyrics")
+        terms = None
+        if size <= TERMS_LIMIT:
+            lyrics = pq.read_table(dataset, columns=["lyrics"]).column(0).to_pylist()
+            with timer.stage("term_index_build", size):
+                terms = TermIndex.build(lyrics)
+            del lyrics
+        with timer.stage("filter_index_build", size):
+            index = SongFilter.build(songs)
+        page_aggregations(timer, songs, cube, index, terms)
+
+    return {
+        "size": size,
+        "seed": seed,
+        "chunk_size": chunk_size,
+        "workers": workers,
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyarrow": pa.__version__,
+        "machine": platform.machine(),
+        "stages": timer.results(),
+    }
+
+
+def compare(before, after):
+    """Linhas com o tempo de cada etapa nos dois resultados e a razão entre eles."""
+    before, after = before["stages"], after["stages"]
+    lines = []
+    for name in list(before) + [name for name in after if name not in before]:
+        old = before.get(name, {}).get("seconds")
+        new = after.get(name, {}).get("seconds")
+        ratio = new / old if old and new is not None else None
+        flag = "  <- mais lento" if ratio is not None and ratio > REGRESSION_RATIO else ""
+        lines.append(f"{name:<22} {old if old is not None else '-':>12} {new if new is not None else '-':>12} "
+                     f"{f'{ratio:.2f}x' if ratio is not None else '-':>8}{flag}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede cada etapa do pipeline com um corpus sintético.")
+    parser.add_argument("size", nargs="?", default="1k", help="1k, 100k, 1m, 10m ou o número de músicas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="músicas processadas por parte")
+    parser.add_argument("--workers", type=int, default=1, help="processos na pontuação (0 = um por núcleo)")
+    parser.add_argument("--workdir", type=Path, help="pasta para os arquivos temporários")
+    parser.add_argument("--output", type=Path, help="arquivo JSON do resultado")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("ANTES", "DEPOIS"),
+                        help="compara dois resultados em vez de medir")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        before, after = (json.loads(path.read_text(encoding="utf-8")) for path in args.compare)
+        print(f"{'etapa':<22} {'antes (s)':>12} {'depois (s)':>12} {'razão':>8}")
+        print("\n".join(compare(before, after)))
+        return
+
+    result = run(parse_size(args.size), args.seed, args.chunk_size, args.workdir, args.workers or None)
+    output = args.output or RESULTS_DIR / f"suite-{args.size}-{(result['commit'] or 'local')[:8]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    for name, stage in result["stages"].items():
+        print(f"{name:<22} {stage['seconds']:>10.3f}s  {stage['rows_per_second'] or 0:>14,.0f} músicas/s")
+    print(f"Resultado gravado em {output}")
+
+
+if __name__ == "__main__":
+    main()
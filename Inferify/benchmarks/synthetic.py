@@ -0,0 +1,168 @@
+"""Corpus sintético no formato dos ``Lyrics_<Artista>.json`` da Genius.
+
+Gera artistas, álbuns e letras com proporções parecidas com as do
+``songs_info.csv`` (cerca de 30 músicas e 4 álbuns por artista, gêneros com a
+mesma distribuição, anos recentes). As letras sorteiam palavras do ``NRC.tsv``
+com frequência de Zipf, misturadas a stopwords, palavras curtas e marcações de
+seção (``[Chorus]``), para que limpeza e pontuação tenham o mesmo trabalho que
+com letras reais. Metade das palavras do léxico segue um ranking próprio de
+cada artista, então artistas diferentes têm emoções dominantes diferentes.
+
+Cada artista é gerado a partir da própria semente, então o corpus sai em partes
+(``SyntheticCorpus.chunks``) e nunca precisa caber inteiro na memória.
+
+Uso (dentro da pasta ``Inferify``): ``python -m benchmarks.synthetic 1k pasta_saida``
+"""
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from inferify.cleaning import STOPWORDS
+from inferify.dataset import APP_DIR
+from inferify.scoring import NRC_TSV
+
+# Tamanhos nomeados usados pela suíte
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+SONGS_PER_ARTIST = 30
+ALBUMS_PER_ARTIST = 4
+# Palavras por letra antes da limpeza (o ``Word Count`` médio depois dela fica perto de 175)
+MEAN_TOKENS = 275
+# Parte das palavras do léxico sorteadas pelo ranking próprio do artista
+ARTIST_SHARE = 0.5
+WORDS_PER_LINE = 8
+LINES_PER_SECTION = 4
+SECTIONS = ["Verse 1", "Pre-Chorus", "Chorus", "Verse 2", "Chorus", "Bridge", "Chorus", "Outro"]
+# Parte das palavras de uma letra que são stopwords ou palavras curtas
+FUNCTION_SHARE = 0.45
+SHORT_WORDS = ["oh", "yeah", "na", "la", "ooh", "hey", "baby", "uh", "ya", "mm", "i'm", "don't", "can't", "you're"]
+YEARS = (1990, 2025)
+DEFAULT_GENRES = {"Pop": 254, "R&B": 152, "Rock": 73, "Eletrônica": 65, "K-Pop": 57, "Folk": 45}
+
+
+def parse_size(text):
+    """``"1k"``, ``"100k"``, ``"1m"``, ``"10m"`` ou um número de músicas."""
+    text = str(text).lower()
+    if text in SIZES:
+        return SIZES[text]
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+def load_vocabulary(path=NRC_TSV, seed=0):
+    """Palavras e probabilidades de sorteio: léxico do NRC em Zipf mais palavras funcionais."""
+    lexical = pd.read_csv(path, sep="\t", names=["word", "emotion", "association"], usecols=["word"])["word"]
+    lexical = lexical.dropna().astype(str).unique()
+    np.random.default_rng(seed).shuffle(lexical)
+    weights = 1.0 / np.arange(1, len(lexical) + 1) ** 1.1
+    function = np.array(sorted(STOPWORDS) + SHORT_WORDS, dtype=object)
+    function_weights = 1.0 / np.arange(1, len(function) + 1) ** 0.8
+    words = np.concatenate([lexical.astype(object), function])
+    probabilities = np.concatenate([
+        (1 - FUNCTION_SHARE) * weights / weights.sum(),
+        FUNCTION_SHARE * function_weights / function_weights.sum(),
+    ])
+    return words, probabilities
+
+
+def load_genres(path=APP_DIR / "songs_info.csv"):
+    """Gêneros e pesos do dataset real, ou uma lista fixa se ele não existir."""
+    if Path(path).exists():
+        counts = pd.read_csv(path, usecols=["genre"])["genre"].str.strip().value_counts()
+        return counts.index.to_numpy(dtype=object), (counts / counts.sum()).to_numpy()
+    counts = pd.Series(DEFAULT_GENRES)
+    return counts.index.to_numpy(dtype=object), (counts / counts.sum()).to_numpy()
+
+
+class SyntheticCorpus:
+    """``size`` músicas sintéticas, geradas artista por artista."""
+
+    def __init__(self, size, seed=0, chunk_size=50_000):
+        self.size = size
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.words, self.probabilities = load_vocabulary(seed=seed)
+        self.lexical = len(self.words) - len(STOPWORDS) - len(SHORT_WORDS)
+        self._cumulative = np.cumsum(self.probabilities)
+        self.genres, self.genre_weights = load_genres()
+        artists = -(-size // SONGS_PER_ARTIST)
+        self.songs_per_artist = np.full(artists, SONGS_PER_ARTIST)
+        self.songs_per_artist[-1] = size - SONGS_PER_ARTIST * (artists - 1)
+
+    def __len__(self):
+        return self.size
+
+    def _lyrics(self, rng, count):
+        lengths = np.maximum(rng.lognormal(np.log(MEAN_TOKENS) - 0.08, 0.4, count).astype(np.int64), 20)
+        # Sorteio pela distribuição acumulada, mais rápido que ``rng.choice`` com ``p``
+        ids = np.searchsorted(self._cumulative, rng.random(lengths.sum()) * self._cumulative[-1])
+        ids = np.minimum(ids, len(self.words) - 1)
+        # Ranking do artista: as posições do léxico são deslocadas por um valor fixo
+        own = (ids < self.lexical) & (rng.random(len(ids)) < ARTIST_SHARE)
+        ids[own] = (ids[own] + rng.integers(self.lexical)) % self.lexical
+        tokens = self.words[ids]
+        lyrics, start = [], 0
+        for length, embed in zip(lengths, rng.integers(1, 999, count)):
+            song = tokens[start:start + length]
+            start += length
+            lines = [" ".join(song[i:i + WORDS_PER_LINE]).capitalize() for i in range(0, length, WORDS_PER_LINE)]
+            blocks = [
+                f"[{SECTIONS[(i // LINES_PER_SECTION) % len(SECTIONS)]}]\n" + "\n".join(lines[i:i + LINES_PER_SECTION])
+                for i in range(0, len(lines), LINES_PER_SECTION)
+            ]
+            lyrics.append("\n\n".join(blocks) + f"{embed}Embed")
+        return lyrics
+
+    def artist(self, index):
+        """Um artista no formato do JSON da Genius, com o gênero à parte em ``genre``."""
+        rng = np.random.default_rng([self.seed, index])
+        count = int(self.songs_per_artist[index])
+        name = f"Artista {index:07d}"
+        albums = [f"Álbum {index}-{i}" for i in range(1 + rng.integers(ALBUMS_PER_ARTIST * 2 - 1))] + [None]
+        years = np.minimum(YEARS[1] - rng.exponential(7.0, count).astype(int), YEARS[1]).clip(YEARS[0])
+        songs = [
+            {
+                "title": f"Song {index}-{i}",
+                "lyrics": lyrics,
+                "release_date": f"{year}-{month:02d}-{day:02d}",
+                "album": {"name": albums[album]} if albums[album] else None,
+            }
+            for i, (lyrics, year, month, day, album) in enumerate(zip(
+                self._lyrics(rng, count), years, rng.integers(1, 13, count), rng.integers(1, 29, count),
+                rng.integers(0, len(albums), count),
+            ))
+        ]
+        genre = self.genres[rng.choice(len(self.genres), p=self.genre_weights)]
+        return {"name": name, "genre": genre, "songs": songs}
+
+    def chunks(self):
+        """Listas de artistas com até ``chunk_size`` músicas cada."""
+        chunk, songs = [], 0
+        for index, count in enumerate(self.songs_per_artist):
+            if chunk and songs + count > self.chunk_size:
+                yield chunk
+                chunk, songs = [], 0
+            chunk.append(self.artist(index))
+            songs += count
+        if chunk:
+            yield chunk
+
+
+def write_corpus(corpus, target):
+    """Grava um ``Lyrics_<Artista>.json`` por artista em ``target/Arquivos Gerados``."""
+    folder = Path(target) / "Arquivos Gerados"
+    folder.mkdir(parents=True, exist_ok=True)
+    for chunk in corpus.chunks():
+        for artist in chunk:
+            path = folder / f"Lyrics_{artist['name'].replace(' ', '')}.json"
+            path.write_text(json.dumps(artist, ensure_ascii=False), encoding="utf-8")
+    return folder
+
+
+if __name__ == "__main__":
+    size = parse_size(sys.argv[1] if len(sys.argv) > 1 else "1k")
+    target = sys.argv[2] if len(sys.argv) > 2 else "sintetico"
+    print(f"Corpus gravado em {write_corpus(SyntheticCorpus(size), target)}")
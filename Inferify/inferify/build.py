@@ -0,0 +1,210 @@
+"""Gera o ``songs_info.csv`` a partir dos arquivos de todos os artistas.
+
+Substitui a montagem manual: encontra todos os ``Arquivos Gerados/Lyrics_*.json``
+do repositório, limpa as letras e infere as emoções de todo o elenco em uma
+única passada, e grava o dataset usado pelo painel e o banco SQLite
+(``inferify.warehouse``).
+
+O ``songs_info.csv`` atual é usado como curadoria: para artistas que já estão
+nele, só as músicas escolhidas são mantidas e o gênero e o álbum vêm de lá;
+artistas sem JSON (ex.: Little Mix e One Direction) são mantidos como estão,
+apenas repontuados. Artistas novos entram com todas as músicas que têm ano de
+lançamento.
+
+Remixes, versões ao vivo, acústicas e traduções de uma mesma música são
+detectados por MinHash + LSH nas letras e pelo título (``inferify.dedup``):
+fica uma versão de cada grupo, de preferência a da curadoria, e as demais são
+registradas em ``dados/duplicatas.csv``. ``--keep-duplicates`` mantém todas.
+
+Depois de ajustar o ``NRC.tsv`` ou as ``ARTIST_STOPWORDS``, ``--incremental``
+recalcula só as músicas que contêm as palavras alteradas (ver
+``inferify.rescoring``).
+
+Uso (dentro da pasta ``Inferify``): ``python -m inferify.build [--all | --incremental] [--keep-duplicates] [--output caminho]``
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from inferify.cleaning import ARTIST_STOPWORDS, Cleaner
+from inferify.dataset import APP_DIR, RAW_COLUMNS, SONGS_DTYPES, VADER_COLUMNS, build_dataset, read_songs_csv
+from inferify.dedup import DUPLICATES_CSV, drop_duplicates, save_duplicates
+from inferify.nrc_binary import load_lexicon
+from inferify.rescoring import Rescorer
+from inferify.scoring import REPO_DIR
+from inferify.vader import polarity_columns
+from inferify.warehouse import ensure_warehouse
+
+SONGS_INFO = APP_DIR / "songs_info.csv"
+OUTPUT_COLUMNS = list(SONGS_DTYPES) + RAW_COLUMNS
+
+# Nomes da Genius que diferem dos usados no painel (e um erro de digitação antigo)
+ARTIST_ALIASES = {
+    "Leigh-Anne": "Leigh Anne",
+    "Louis Tomlinsom": "Louis Tomlinson",
+}
+
+# Álbum usado quando a Genius não informa nenhum, como na curadoria manual
+DEFAULT_ALBUM = "Single"
+DEFAULT_GENRE = "Pop"
+
+
+def discover(root=REPO_DIR):
+    """Todos os JSONs salvos pelo ``artist.save_lyrics()`` no repositório."""
+    return sorted(Path(root).glob("**/Arquivos Gerados/Lyrics_*.json"))
+
+
+def read_genius_json(path):
+    """Lê um ``Lyrics_<Artista>.json`` com as colunas usadas no dataset."""
+    with open(path, encoding="utf-8") as arquivo:
+        return genius_frame(json.load(arquivo))
+
+
+def genius_frame(data):
+    """Colunas do dataset a partir do conteúdo de um ``Lyrics_<Artista>.json``."""
+    songs = pd.DataFrame(data["songs"])
+    album = songs["album"] if "album" in songs else pd.Series(None, index=songs.index)
+    return pd.DataFrame({
+        "artist": ARTIST_ALIASES.get(data["name"], data["name"]),
+        "title": songs["title"].str.strip(),
+        "lyrics": songs["lyrics"].fillna(""),
+        "Album": album.map(lambda x: x.get("name") if isinstance(x, dict) else None),
+        "release_year": pd.to_datetime(songs["release_date"], errors="coerce").dt.year,
+    })
+
+
+def prepare_corpus(paths, curated=None, all_songs=False):
+    """Seleciona as músicas, completa os metadados e limpa as letras.
+
+    ``curated`` é o dataset atual (ou ``None``); com ``all_songs=True`` a seleção
+    de músicas da curadoria é ignorada, mas os metadados continuam sendo usados.
+    As palavras indesejadas de cada artista ainda não são removidas aqui.
+    """
+    raw = pd.concat([read_genius_json(path) for path in paths], ignore_index=True)
+    raw = raw[(raw["lyrics"] != "") & raw["release_year"].notna()]
+
+    if curated is None:
+        curated = pd.DataFrame(columns=list(SONGS_DTYPES))
+    curated = curated.assign(artist=curated["artist"].replace(ARTIST_ALIASES))
+    curated_artists = set(curated["artist"])
+
+    if not all_songs:
+        # Artistas já curados mantêm só as músicas escolhidas
+        keys = pd.MultiIndex.from_frame(curated[["artist", "title"]])
+        chosen = pd.MultiIndex.from_frame(raw[["artist", "title"]]).isin(keys)
+        raw = raw[chosen | ~raw["artist"].isin(curated_artists)]
+
+    # Metadados da curadoria têm prioridade; depois o JSON; depois os padrões
+    meta = curated.drop_duplicates(["artist", "title"]).set_index(["artist", "title"])[["genre", "Album"]]
+    songs = raw.join(meta, on=["artist", "title"], rsuffix="_curated")
+    artist_genre = curated.groupby("artist")["genre"].agg(lambda s: s.mode().iat[0])
+    songs["genre"] = songs["genre"].fillna(songs["artist"].map(artist_genre)).fillna(DEFAULT_GENRE)
+    songs["Album"] = songs["Album_curated"].fillna(songs["Album"]).fillna(DEFAULT_ALBUM)
+
+    cleaned = list(Cleaner().stream(zip(songs["artist"], songs["lyrics"])))
+    songs["lyrics"] = [text for text, _ in cleaned]
+    songs["Word Count"] = [count for _, count in cleaned]
+
+    # Artistas sem JSON continuam com as letras já limpas do dataset atual
+    carried = curated[~curated["artist"].isin(set(songs["artist"]))]
+    songs = pd.concat([songs, carried], ignore_index=True) if len(carried) else songs.reset_index(drop=True)
+    songs["release_year"] = songs["release_year"].astype("int64")
+    return songs
+
+
+def build_corpus(paths, curated=None, all_songs=False, lexicon=None, artist_stopwords=ARTIST_STOPWORDS,
+                 per_artist=False, workers=1, keep_duplicates=False):
+    """Monta o DataFrame no formato do ``songs_info.csv``, com as contagens brutas.
+
+    Retorna ``(songs, rescorer, duplicates)``; o ``Rescorer`` guarda as
+    contagens brutas e as estatísticas do corpus para atualizações
+    incrementais, e ``duplicates`` é a tabela das versões removidas (``None``
+    com ``keep_duplicates=True``).
+    """
+    songs = prepare_corpus(paths, curated, all_songs)
+    duplicates = None
+    if not keep_duplicates:
+        # Entre versões da mesma música, a escolhida na curadoria é a mantida
+        priority = None
+        if curated is not None:
+            keys = pd.MultiIndex.from_frame(curated[["artist", "title"]].assign(
+                artist=curated["artist"].replace(ARTIST_ALIASES)))
+            priority = pd.MultiIndex.from_frame(songs[["artist", "title"]]).isin(keys)
+        songs, duplicates = drop_duplicates(songs, priority=priority)
+    # Uma única passada de inferência para o corpus inteiro
+    rescorer = Rescorer(songs, lexicon or load_lexicon(), artist_stopwords, workers=workers)
+    return rescorer.apply(songs, per_artist)[OUTPUT_COLUMNS], rescorer, duplicates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o dataset do painel a partir dos JSONs da Genius.")
+    parser.add_argument("--root", type=Path, default=REPO_DIR, help="pasta onde procurar os JSONs")
+    parser.add_argument("--curated", type=Path, default=SONGS_INFO, help="dataset usado como curadoria")
+    parser.add_argument("--output", type=Path, default=SONGS_INFO, help="CSV de saída")
+    parser.add_argument("--all", action="store_true", help="mantém todas as músicas, não só as curadas")
+    parser.add_argument("--incremental", action="store_true",
+                        help="repontua só as músicas afetadas por mudanças no léxico ou nas indesejadas")
+    parser.add_argument("--add", type=Path, nargs="+", metavar="JSON",
+                        help="inclui os Lyrics_*.json de artistas novos sem reprocessar o resto (implica --incremental)")
+    parser.add_argument("--per-artist", action="store_true",
+                        help="normaliza dentro de cada artista, como os notebooks, em vez de pelo corpus")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processos na pontuação (0 = um por núcleo, ou INFERIFY_WORKERS)")
+    parser.add_argument("--no-vader", action="store_true", help="não calcula as colunas de polaridade VADER")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="mantém remixes, versões ao vivo e traduções da mesma música")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or None
+    start = time.perf_counter()
+    duplicates = None
+    if args.incremental or args.add:
+        # Só as músicas novas ou com palavras afetadas pelas mudanças são contadas
+        rescorer = Rescorer.load()
+        rescorer.workers = workers
+        songs = read_songs_csv(args.output)
+        rows = rescorer.update(load_lexicon(), ARTIST_STOPWORDS)
+        summary = f"{len(rows)} de {len(songs)} músicas repontuadas"
+        if args.add:
+            new = prepare_corpus(args.add, all_songs=True)
+            new = new[~pd.MultiIndex.from_frame(new[["artist", "title"]]).isin(
+                pd.MultiIndex.from_frame(rescorer.keys))]
+            if not args.keep_duplicates:
+                # Versões de músicas que já estão no dataset também ficam de fora
+                new, duplicates = drop_duplicates(new, reference=songs)
+            rescorer.add(new)
+            songs = pd.concat([songs, new], ignore_index=True)
+            summary += f", {len(new)} músicas novas"
+        songs = rescorer.apply(songs, args.per_artist)[OUTPUT_COLUMNS]
+    else:
+        paths = discover(args.root)
+        curated = read_songs_csv(args.curated) if args.curated.exists() else None
+        songs, rescorer, duplicates = build_corpus(paths, curated, all_songs=args.all, per_artist=args.per_artist,
+                                                    workers=workers, keep_duplicates=args.keep_duplicates)
+        summary = f"{len(paths)} arquivos, {len(songs)} músicas, {songs['artist'].nunique()} artistas"
+
+    if not args.no_vader:
+        # Só as letras que não estão no cache de polaridade são pontuadas
+        try:
+            songs[VADER_COLUMNS] = polarity_columns(songs["lyrics"], workers).to_numpy()
+        except (ImportError, LookupError) as erro:
+            print(f"Polaridade VADER não calculada: {erro}")
+
+    songs.to_csv(args.output, index=False)
+    default_output = args.output.resolve() == SONGS_INFO.resolve()
+    if duplicates is not None:
+        target = DUPLICATES_CSV if default_output else args.output.with_name(f"{args.output.stem}_duplicatas.csv")
+        save_duplicates(duplicates, target, append=bool(args.add))
+        summary += f", {len(duplicates)} duplicatas"
+    if default_output:
+        # O banco SQLite dos notebooks acompanha o dataset colunar
+        ensure_warehouse(build_dataset(args.output))
+        rescorer.save()
+    print(f"{summary} em {time.perf_counter() - start:.2f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Limpeza das letras, como nos notebooks ``Lyrics.ipynb`` e ``Analytics_Lyric.ipynb``.
+
+Os notebooks fazem uma passada por etapa: remoção de stopwords, remoção de
+pontuação, remoção de palavras com até 3 letras, minúsculas, contagem de
+palavras, remoção de marcações como ``chorus`` e ``verse`` e, na análise, das
+palavras indesejadas de cada artista. Aqui tudo é feito em uma única passada
+sobre o texto, com conjuntos e expressões regulares compilados uma vez, e o
+resultado é o mesmo.
+"""
+import hashlib
+import re
+from itertools import filterfalse
+
+# Lista de stopwords em inglês do NLTK (``stopwords.words('english')``), como
+# conjunto para não depender do corpus do NLTK instalado
+STOPWORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours
+yourself yourselves he him his himself she she's her hers herself it it's its
+itself they them their theirs themselves what which who whom this that that'll
+these those am is are was were be been being have has had having do does did
+doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down in
+out on off over under again further then once here there when where why how all
+any both each few more most other some such no nor not only own same so than too
+very s t can will just don don't should should've now d ll m o re ve y ain aren
+aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn hasn't haven
+haven't isn isn't ma mightn mightn't mustn mustn't needn needn't shan shan't
+shouldn shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+""".split())
+
+# Marcações da Genius que não fazem parte da letra
+UNWANTED_WORDS = ["embed", "intro", "verse", "chorus", "outro", "instrumental"]
+
+# Lista ``indesejadas`` de cada ``Analytics_Lyric.ipynb`` (e dos notebooks da
+# pasta ``Artistas``): nomes e interjeições que o léxico não deve contar
+ARTIST_STOPWORDS = {
+    "5 Seconds of Summer": ["na", "yeah"],
+    "Ally Brooke": ["ally", "brooke", "na", "yeah"],
+    "BLACKPINK": ["na", "yeah"],
+    "BTS": ["na", "yeah"],
+    "Beyoncé": ["na", "yeah"],
+    "JADE": ["yeah", "na", "shit"],
+    "Jesy Nelson": ["jesy", "nelson", "that", "this", "na", "yeah", "nicki", "minaj"],
+    "KATSEYE": ["ally", "brooke", "na", "yeah"],
+    "Leigh Anne": ["that", "this", "na", "yeah", "leigh", "anne", "ayra"],
+    "Little Mix": ["jade", "anne", "leigh", "jesy", "perrie", "na", "yeah", "that", "this", "when", "what"],
+    "Perrie": ["yeah", "na", "that", "this"],
+    "Tove Lo": ["na", "yeah"],
+    "ZAYN": ["na", "yeah", "that", "this", "what", "when", "zayn", "there"],
+    "Zara Larsson": ["na", "yeah"],
+}
+
+# Depois de remover as stopwords, as palavras que sobram são as sequências de
+# 4 ou mais letras (o mesmo que separar por pontuação e descartar as curtas)
+_WORDS = re.compile("[a-zA-Z]{4,}")
+_is_stopword = STOPWORDS.__contains__
+
+
+def _drop_pattern(words):
+    # Aplicado depois das minúsculas, então não precisa de IGNORECASE
+    return re.compile(r"\b(?:" + "|".join(re.escape(word.lower()) for word in words) + r")\b")
+
+
+_UNWANTED = _drop_pattern(UNWANTED_WORDS)
+
+
+class Cleaner:
+    """Limpeza completa das letras em uma passada.
+
+    ``artist_stopwords`` mapeia o nome do artista para palavras extras a
+    remover depois das marcações (a lista ``indesejadas`` dos notebooks).
+    """
+
+    def __init__(self, artist_stopwords=None):
+        self.artist_stopwords = {artist: list(words) for artist, words in (artist_stopwords or {}).items()}
+        self._patterns = {
+            artist: _drop_pattern(UNWANTED_WORDS + words) for artist, words in self.artist_stopwords.items()
+        }
+
+    def clean(self, text, artist=None):
+        """Retorna ``(letra, contagem de palavras)``.
+
+        A contagem é feita antes da remoção das marcações, como no notebook.
+        """
+        kept = " ".join(filterfalse(_is_stopword, (text or "").split(" ")))
+        words = " ".join(_WORDS.findall(kept)).lower()
+        return self.strip(words, artist), words.count(" ") + 1
+
+    def strip(self, text, artist=None):
+        """Remove as marcações e as palavras extras do artista de um texto já limpo.
+
+        Os espaços que sobram no lugar das palavras removidas são juntados, como
+        no ``split``/``join`` das ``indesejadas`` do notebook.
+        """
+        return " ".join(self._patterns.get(artist, _UNWANTED).sub("", text).split())
+
+    def stream(self, songs):
+        """Limpa pares ``(artista, letra)`` sob demanda, um de cada vez."""
+        for artist, text in songs:
+            yield self.clean(text, artist)
+
+
+_DEFAULT_CLEANER = Cleaner()
+
+
+def cleaning_fingerprint():
+    """Hash das listas fixas da limpeza (stopwords e marcações)."""
+    return hashlib.sha256("\n".join(sorted(STOPWORDS) + [""] + UNWANTED_WORDS).encode("utf-8")).hexdigest()
+
+
+def clean_lyrics(text):
+    """Limpeza sem palavras extras por artista; retorna ``(letra, contagem de palavras)``."""
+    return _DEFAULT_CLEANER.clean(text)
@@ -0,0 +1,202 @@
+"""Cubo de agregados das músicas para os gráficos do painel.
+
+As músicas são agrupadas uma única vez por artista × álbum × ano × gênero ×
+sentimento. Cada célula guarda a quantidade de músicas, somas, somas dos
+quadrados, mínimo e máximo do ``score`` e das emoções, o total de palavras e um
+resumo (KMV) das letras distintas. Os gráficos passam a somar células
+filtradas em vez de agrupar as músicas, então o custo depende do número de
+combinações, não do número de músicas.
+
+Uso: ``python -m inferify.cube [songs.parquet] [saida.parquet]``
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from inferify.dataset import DATASET_DIR, EMOTION_COLUMNS, SONGS_PARQUET, read_dataset
+
+CUBE_PARQUET = DATASET_DIR / "cubo.parquet"
+# Muda quando o cálculo das células muda; cubos de outra versão são refeitos
+FORMAT_VERSION = 2
+
+DIMENSIONS = ["artist", "Album", "release_year", "genre", "sentiment"]
+MEASURES = ["score", "Word Count"] + EMOTION_COLUMNS
+
+# Quantidade de hashes guardados por célula no resumo de letras distintas
+SKETCH_SIZE = 1024
+_HASH_SPACE = float(2 ** 64)
+
+
+def _kmv(hashes, size=SKETCH_SIZE):
+    """Os ``size`` menores hashes distintos (resumo K-minimum values)."""
+    return np.unique(hashes)[:size]
+
+
+def _kmv_estimate(hashes, size=SKETCH_SIZE):
+    hashes = _kmv(hashes, size)
+    if len(hashes) < size:
+        return len(hashes)
+    return int(round((size - 1) / (float(hashes[-1]) / _HASH_SPACE)))
+
+
+class EmotionCube:
+    """Células agregadas; ``cells`` tem as dimensões e as medidas de cada célula."""
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @classmethod
+    def build(cls, songs):
+        """Agrega o DataFrame de músicas (com a coluna ``lyrics``)."""
+        songs = songs.reset_index(drop=True)
+        # Dimensões vazias (ex.: gênero de um artista fora do ``artistas_info.csv``) formam células
+        # próprias; sem ``dropna=False`` essas músicas teriam ``ngroup() == -1`` e deslocariam as medidas
+        groups = songs.groupby(DIMENSIONS, observed=True, sort=False, dropna=False)
+        cell = groups.ngroup().to_numpy()
+        size = groups.ngroups
+
+        # Uma medida por vez, para não copiar todas as colunas em float64 de uma vez
+        measures = {"songs": groups.size().to_numpy()}
+        for col in MEASURES:
+            values = songs[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            weights = np.nan_to_num(values)
+            measures[f"{col}_sum"] = np.bincount(cell, weights=weights, minlength=size)
+            measures[f"{col}_sq"] = np.bincount(cell, weights=weights ** 2, minlength=size)
+            extremes = pd.Series(values).groupby(cell).agg(["min", "max"])
+            measures[f"{col}_min"] = extremes["min"].to_numpy()
+            measures[f"{col}_max"] = extremes["max"].to_numpy()
+
+        # Resumo das letras distintas: menores hashes de cada célula
+        hashes = pd.util.hash_pandas_object(songs["lyrics"].fillna(""), index=False).to_numpy()
+        pairs = pd.DataFrame({"cell": cell, "hash": hashes}).drop_duplicates().sort_values(["cell", "hash"])
+        pairs = pairs[pairs.groupby("cell").cumcount() < SKETCH_SIZE]
+        # Gravados como int64 (o Parquet não tem listas de uint64 a partir do pandas)
+        pairs["hash"] = pairs["hash"].to_numpy().view(np.int64)
+        sketches = pairs.groupby("cell")["hash"].agg(list)
+
+        cells = groups.size().reset_index()[DIMENSIONS]
+        cells = cells.assign(**measures)
+        cells["lyrics_sketch"] = sketches.reindex(range(len(cells))).to_list()
+        return cls(cells)
+
+    def save(self, path=CUBE_PARQUET):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        table = pa.Table.from_pandas(self.cells, preserve_index=False)
+        table = table.replace_schema_metadata({**table.schema.metadata, b"inferify_cube": str(FORMAT_VERSION).encode()})
+        pq.write_table(table, tmp_path, compression="zstd")
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path=CUBE_PARQUET):
+        cells = pd.read_parquet(path, engine="pyarrow")
+        for col in ["artist", "Album", "genre", "sentiment"]:
+            cells[col] = cells[col].astype("category")
+        return cls(cells)
+
+    def select(self, years=None, artists=None, albums=None, genres=None):
+        """Máscara das células que passam nos filtros da barra lateral."""
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        if years is not None:
+            mask &= cells["release_year"].between(years[0], years[1]).to_numpy()
+        for col, values in (("artist", artists), ("Album", albums), ("genre", genres)):
+            if values is not None:
+                mask &= cells[col].isin(values).to_numpy()
+        return mask
+
+    def _group(self, by, mask):
+        cells = self.cells if mask is None else self.cells[mask]
+        return cells, cells.groupby(by, observed=True, sort=True)
+
+    def count(self, by=None, mask=None):
+        """Quantidade de músicas (geral ou por grupo)."""
+        if by is None:
+            cells = self.cells if mask is None else self.cells[mask]
+            return int(cells["songs"].sum())
+        _, groups = self._group(by, mask)
+        return groups["songs"].sum()
+
+    def total(self, column, mask=None):
+        cells = self.cells if mask is None else self.cells[mask]
+        return cells[f"{column}_sum"].sum()
+
+    def mean(self, column, by=None, mask=None):
+        """Média de ``column`` (geral ou por grupo)."""
+        if by is None:
+            cells = self.cells if mask is None else self.cells[mask]
+            return cells[f"{column}_sum"].sum() / cells["songs"].sum()
+        _, groups = self._group(by, mask)
+        sums = groups[[f"{column}_sum", "songs"]].sum()
+        return sums[f"{column}_sum"] / sums["songs"]
+
+    def std(self, column, by=None, mask=None):
+        """Desvio padrão amostral de ``column``, a partir das somas dos quadrados."""
+        cells = self.cells if mask is None else self.cells[mask]
+        columns = [f"{column}_sum", f"{column}_sq", "songs"]
+        sums = cells[columns].sum() if by is None else cells.groupby(by, observed=True)[columns].sum()
+        # Com menos de duas músicas o desvio não é definido: NaN em vez de dividir por zero
+        n = sums["songs"]
+        n = n.where(n > 1) if by is not None else (n if n > 1 else np.nan)
+        variance = (sums[f"{column}_sq"] - sums[f"{column}_sum"] ** 2 / n) / (n - 1)
+        return np.sqrt(np.maximum(variance, 0))
+
+    def min(self, column, mask=None):
+        cells = self.cells if mask is None else self.cells[mask]
+        return cells[f"{column}_min"].min()
+
+    def max(self, column, mask=None):
+        cells = self.cells if mask is None else self.cells[mask]
+        return cells[f"{column}_max"].max()
+
+    def nunique(self, column, by=None, mask=None):
+        """Valores distintos de uma dimensão (geral ou por grupo)."""
+        cells = self.cells if mask is None else self.cells[mask]
+        if by is None:
+            return cells[column].nunique()
+        return cells.groupby(by, observed=True)[column].nunique()
+
+    def mode(self, column, mask=None):
+        """Valor mais frequente de uma dimensão; empates vão para o menor, como ``Series.mode``."""
+        counts = self.count(column, mask)
+        if counts.empty:
+            return ""
+        return counts.idxmax()
+
+    def distinct_lyrics(self, mask=None):
+        """Estimativa de letras distintas (exata até ``SKETCH_SIZE``)."""
+        cells = self.cells if mask is None else self.cells[mask]
+        sketches = [np.asarray(sketch, dtype=np.int64).view(np.uint64) for sketch in cells["lyrics_sketch"]]
+        if not sketches:
+            return 0
+        return _kmv_estimate(np.concatenate(sketches))
+
+
+def build_cube(source=SONGS_PARQUET, target=CUBE_PARQUET):
+    """Gera o cubo a partir do dataset colunar."""
+    return EmotionCube.build(read_dataset(source, lyrics=True)).save(target)
+
+
+def _saved_version(path):
+    return (pq.read_schema(path).metadata or {}).get(b"inferify_cube", b"").decode()
+
+
+def ensure_cube(source=SONGS_PARQUET, target=CUBE_PARQUET):
+    """Gera o cubo se ele não existir, for mais antigo que o dataset ou de outra versão."""
+    source, target = Path(source), Path(target)
+    if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+        if _saved_version(target) == str(FORMAT_VERSION):
+            return target
+    return build_cube(source, target)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else SONGS_PARQUET
+    target = sys.argv[2] if len(sys.argv) > 2 else CUBE_PARQUET
+    print(f"Cubo gerado em {build_cube(source, target)}")
@@ -0,0 +1,240 @@
+"""Carregamento compartilhado dos dados do Inferify.
+
+Os CSVs que acompanham o app são a fonte padrão, então o painel funciona sem
+internet. Se ``INFERIFY_REMOTE_BASE`` estiver definida (ex.: a pasta ``raw`` do
+GitHub), o arquivo remoto é baixado uma vez e depois só revalidado com
+``If-None-Match``/``If-Modified-Since``. O resultado já tipado fica no cache do
+Streamlit por ``INFERIFY_CACHE_TTL`` segundos, evitando reler os arquivos a cada
+interação com os filtros. As músicas são servidas pelo dataset colunar gerado em
+``inferify.dataset``, sem a coluna de letras a menos que ela seja pedida.
+"""
+import json
+import os
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import streamlit as st
+
+from inferify.cube import EmotionCube, ensure_cube
+from inferify.dataset import APP_DIR, CACHE_DIR, ensure_dataset, read_dataset, read_lyrics
+from inferify.filters import MemberFilter, SongFilter
+from inferify.lru import LRUCache
+from inferify.neighbors import EmotionNeighbors, ensure_neighbor_index
+from inferify.search import SearchIndex, ensure_search_index
+from inferify.terms import TermIndex, ensure_term_index
+from inferify.thumbnails import ThumbnailStore
+from inferify.wordclouds import WordCloudService
+
+# Fonte remota opcional e tempo de vida do cache em memória
+REMOTE_BASE = os.environ.get("INFERIFY_REMOTE_BASE", "")
+CACHE_TTL = int(os.environ.get("INFERIFY_CACHE_TTL", 3600))
+# Limite do cache de resultados por estado dos filtros (DataFrames, métricas e gráficos)
+RESULT_CACHE_MB = int(os.environ.get("INFERIFY_RESULT_CACHE_MB", 256))
+REMOTE_TIMEOUT = 5
+
+# Tipos de cada coluna, aplicados na leitura para evitar conversões nas páginas
+POPULARITY_DTYPES = {
+    "nome": "string",
+    "popularidade": "int64",
+    "seguidores": "int64",
+    "imagem_principal": "string",
+    "tipo": "string",
+    "pais": "string",
+}
+ARTISTS_DTYPES = {
+    "nome": "string",
+    "sexo": "string",
+    "banda": "string",
+}
+
+
+def _fetch_remote(filename):
+    """Revalida a cópia local do arquivo remoto e retorna o caminho dela.
+
+    Retorna ``None`` quando não há fonte remota configurada ou quando a
+    requisição falha sem que exista uma cópia anterior.
+    """
+    if not REMOTE_BASE:
+        return None
+
+    copy_path = CACHE_DIR / filename
+    meta_path = CACHE_DIR / f"{filename}.meta.json"
+    meta = json.loads(meta_path.read_text()) if meta_path.exists() and copy_path.exists() else {}
+
+    request = urllib.request.Request(f"{REMOTE_BASE.rstrip('/')}/{filename}")
+    if meta.get("etag"):
+        request.add_header("If-None-Match", meta["etag"])
+    if meta.get("last_modified"):
+        request.add_header("If-Modified-Since", meta["last_modified"])
+
+    try:
+        with urllib.request.urlopen(request, timeout=REMOTE_TIMEOUT) as response:
+            content = response.read()
+            headers = response.headers
+    except (urllib.error.URLError, TimeoutError, OSError):
+        # 304 (não modificado) ou falha de rede: a cópia anterior, se existir, continua valendo
+        return copy_path if meta else None
+
+    # Grava primeiro em arquivo temporário para não deixar cópia pela metade
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = copy_path.with_suffix(copy_path.suffix + ".tmp")
+    tmp_path.write_bytes(content)
+    tmp_path.replace(copy_path)
+    meta_path.write_text(json.dumps({
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }))
+    return copy_path
+
+
+def resolve_source(filename):
+    """Retorna o caminho a ser lido: cópia remota revalidada ou arquivo local."""
+    remote_path = _fetch_remote(filename)
+    return remote_path if remote_path is not None else APP_DIR / filename
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _read_csv(filename, dtypes):
+    df = pd.read_csv(resolve_source(filename), dtype=dtypes)
+    # Padroniza os textos uma única vez, em vez de repetir em cada página
+    for col, dtype in dtypes.items():
+        if dtype == "string" and col in df.columns:
+            df[col] = df[col].str.strip()
+    return df
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def dataset_version():
+    """Caminho do dataset colunar e assinatura do arquivo (``mtime`` e tamanho).
+
+    Resolve a fonte e refaz o Parquet se preciso uma vez por ``CACHE_TTL``. Os
+    carregadores das músicas e dos índices alinhados a elas são guardados por
+    esta versão, e o cache de resultados também: depois de uma nova geração do
+    dataset, máscaras e posições de linha antigas nunca são aplicadas aos dados
+    novos, mesmo que cada cache expire num momento diferente.
+    """
+    path = ensure_dataset(resolve_source("songs_info.csv"))
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _read_songs(lyrics, version):
+    return read_dataset(version[0], lyrics=lyrics)
+
+
+def load_songs(lyrics=False, version=None):
+    """Músicas com metadados e emoções inferidas, a partir do dataset colunar.
+
+    A coluna ``lyrics`` só é lida quando ``lyrics=True``.
+    """
+    return _read_songs(lyrics, version or dataset_version())
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _read_lyrics(version):
+    return read_lyrics(version[0])
+
+
+def load_lyrics(version=None):
+    """Somente as letras, alinhadas pelo índice ao DataFrame de ``load_songs``."""
+    return _read_lyrics(version or dataset_version())
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False, max_entries=256)
+def _read_lyrics_at(rows, version):
+    return read_lyrics(version[0], rows=list(rows))
+
+
+def load_lyrics_at(rows, version=None):
+    """Letras só das músicas nas posições ``rows`` (uma tupla), sem ler a coluna inteira."""
+    return _read_lyrics_at(rows, version or dataset_version())
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _term_index(version):
+    return TermIndex.load(ensure_term_index(version[0]))
+
+
+def load_term_index(version=None):
+    """Índice de frequência de termos, com linhas alinhadas a ``load_songs``."""
+    return _term_index(version or dataset_version())
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _cube(version):
+    return EmotionCube.load(ensure_cube(version[0]))
+
+
+def load_cube(version=None):
+    """Cubo de agregados (artista × álbum × ano × gênero × sentimento) para os gráficos."""
+    return _cube(version or dataset_version())
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _search_index(version):
+    return SearchIndex.open(ensure_search_index(version[0]))
+
+
+def load_search_index(version=None):
+    """Índice de busca nas letras, mapeado na memória, com músicas alinhadas a ``load_songs``."""
+    return _search_index(version or dataset_version())
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _neighbors(version):
+    return EmotionNeighbors.load(ensure_neighbor_index(version[0]))
+
+
+def load_neighbors(version=None):
+    """Índice de vizinhos por perfil emocional, com linhas alinhadas a ``load_songs``."""
+    return _neighbors(version or dataset_version())
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _song_filter(version):
+    return SongFilter.build(load_songs(version=version))
+
+
+def load_song_filter(version=None):
+    """Bitmaps dos filtros da barra lateral, com linhas alinhadas a ``load_songs``."""
+    return _song_filter(version or dataset_version())
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def load_member_filter():
+    """Bitmaps de ``nome`` e ``banda``, com linhas alinhadas a ``load_artists``."""
+    return MemberFilter.build(load_artists())
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def load_result_cache():
+    """Cache LRU compartilhado por páginas e sessões, com chaves que incluem ``dataset_version``."""
+    return LRUCache(RESULT_CACHE_MB * 1024 * 1024)
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def load_thumbnails():
+    """Miniaturas locais das fotos dos artistas (``inferify.thumbnails``)."""
+    return ThumbnailStore()
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def _wordclouds(version):
+    return WordCloudService(load_term_index(version), load_songs(version=version))
+
+
+def load_wordclouds(version=None):
+    """Tabelas de frequência e nuvens de palavras (``inferify.wordclouds``), alinhadas a ``load_songs``."""
+    return _wordclouds(version or dataset_version())
+
+
+def load_popularity():
+    """Popularidade e seguidores dos artistas no Spotify (``artistas_popularidade.csv``)."""
+    return _read_csv("artistas_popularidade.csv", POPULARITY_DTYPES)
+
+
+def load_artists():
+    """Relação entre integrantes e bandas (``artistas_info.csv``)."""
+    return _read_csv("artistas_info.csv", ARTISTS_DTYPES)
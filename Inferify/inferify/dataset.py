@@ -0,0 +1,187 @@
+"""Geração do dataset colunar de músicas a partir do ``songs_info.csv``.
+
+O CSV é convertido para Parquet com colunas categóricas, emoções em float32 e
+textos já padronizados. Como o Parquet guarda cada coluna separadamente, as
+letras (quase todo o volume do arquivo) só são lidas pelas páginas que pedem a
+coluna ``lyrics``. O arquivo é gravado em grupos de ``ROW_GROUP_SIZE`` linhas,
+então as letras de algumas músicas (ex.: os resultados da busca) são lidas só
+dos grupos que as contêm.
+
+O Parquet guarda nos metadados de onde veio: caminho, tamanho, ``mtime`` e
+SHA-256 do CSV. ``ensure_dataset`` o refaz quando a fonte é outra (ex.: a
+cópia remota no lugar do CSV local) ou quando o conteúdo mudou, mesmo que o
+CSV restaurado seja mais antigo que o Parquet.
+
+Uso: ``python -m inferify.dataset [songs_info.csv] [saida.parquet]``
+"""
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+APP_DIR = Path(__file__).resolve().parent.parent
+DATASET_DIR = APP_DIR / "dados"
+CACHE_DIR = APP_DIR / ".cache"
+SONGS_PARQUET = DATASET_DIR / "songs.parquet"
+# Linhas por grupo do Parquet: menor unidade lida quando só algumas letras são pedidas
+ROW_GROUP_SIZE = 10_000
+
+# Emoções do léxico NRC, na ordem das colunas do songs_info.csv
+EMOTION_COLUMNS = ["joy", "sadness", "surprise", "trust", "anger", "disgust", "anticipation", "fear"]
+
+# Colunas de baixa cardinalidade guardadas como categorias
+CATEGORICAL_COLUMNS = ["artist", "Album", "genre", "sentiment", "filter"]
+
+# Tipos usados na leitura do CSV
+SONGS_DTYPES = {
+    "artist": "string",
+    "title": "string",
+    "genre": "string",
+    "lyrics": "string",
+    "Album": "string",
+    "release_year": "int64",
+    "Word Count": "int64",
+    "score": "float64",
+    "sentiment": "string",
+    "filter": "string",
+    **{col: "float64" for col in EMOTION_COLUMNS},
+}
+
+# Todas as colunas do dataset, exceto as letras
+SONGS_COLUMNS = [col for col in SONGS_DTYPES if col != "lyrics"]
+
+# Contagens brutas (antes da normalização), presentes nos datasets gerados pelo
+# ``inferify.build``; o ``songs_info.csv`` curado original não as tem
+RAW_COLUMNS = ["score_raw"] + [f"{col}_raw" for col in EMOTION_COLUMNS]
+
+# Polaridade VADER de cada letra (``inferify.vader``), também só nos datasets do build
+VADER_COLUMNS = ["neg", "neu", "pos", "compound"]
+
+
+def read_songs_csv(path):
+    """Lê o CSV de músicas aplicando os tipos e removendo espaços dos textos."""
+    df = pd.read_csv(path, dtype=SONGS_DTYPES)
+    for col, dtype in SONGS_DTYPES.items():
+        if dtype == "string" and col in df.columns:
+            df[col] = df[col].str.strip()
+    return df
+
+
+def to_columnar(df):
+    """Converte o DataFrame de músicas para os tipos compactos do dataset."""
+    df = df.copy()
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype("category")
+    df["title"] = df["title"].astype(object)
+    df["lyrics"] = df["lyrics"].fillna("").astype(object)
+    df["release_year"] = df["release_year"].astype("int16")
+    df["Word Count"] = df["Word Count"].astype("int32")
+    df["score"] = df["score"].astype("float32")
+    df[EMOTION_COLUMNS] = df[EMOTION_COLUMNS].astype("float32")
+    raw_columns = [col for col in RAW_COLUMNS if col in df.columns]
+    df[raw_columns] = df[raw_columns].astype("int32")
+    vader_columns = [col for col in VADER_COLUMNS if col in df.columns]
+    df[vader_columns] = df[vader_columns].astype("float32")
+    # As letras ficam por último, em um bloco de coluna próprio
+    return df[SONGS_COLUMNS + raw_columns + vader_columns + ["lyrics"]].reset_index(drop=True)
+
+
+def _digest(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as arquivo:
+        for block in iter(lambda: arquivo.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def source_fingerprint(source, digest=True):
+    """Caminho, tamanho e ``mtime`` do CSV; com ``digest=True``, também o SHA-256."""
+    source = Path(source).resolve()
+    stat = source.stat()
+    fingerprint = {"path": str(source), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if digest:
+        fingerprint["sha256"] = _digest(source)
+    return fingerprint
+
+
+def saved_fingerprint(path):
+    """Fonte registrada nos metadados do Parquet, ou ``{}`` se não houver."""
+    metadata = pq.read_schema(path).metadata or {}
+    return json.loads(metadata.get(b"inferify_source", b"{}"))
+
+
+def build_dataset(source, target=SONGS_PARQUET):
+    """Gera o Parquet de músicas a partir do CSV ``source``."""
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fingerprint = source_fingerprint(source)
+    table = pa.Table.from_pandas(to_columnar(read_songs_csv(source)), preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata,
+                                           b"inferify_source": json.dumps(fingerprint).encode()})
+    tmp_path = target.with_suffix(".tmp")
+    pq.write_table(table, tmp_path, compression="zstd", row_group_size=ROW_GROUP_SIZE)
+    tmp_path.replace(target)
+    return target
+
+
+def ensure_dataset(source, target=SONGS_PARQUET):
+    """Gera o Parquet se ele não existir ou tiver vindo de outro CSV ou de outro conteúdo.
+
+    Caminho, tamanho e ``mtime`` iguais bastam; se só o ``mtime`` mudou, o
+    SHA-256 decide, então um CSV apenas tocado não refaz o dataset.
+    """
+    source, target = Path(source), Path(target)
+    if target.exists():
+        saved, current = saved_fingerprint(target), source_fingerprint(source, digest=False)
+        if saved.get("path") == current["path"] and saved.get("size") == current["size"]:
+            if saved.get("mtime_ns") == current["mtime_ns"] or saved.get("sha256") == _digest(source):
+                return target
+    return build_dataset(source, target)
+
+
+def read_dataset(path=SONGS_PARQUET, lyrics=False, raw=False):
+    """Lê o dataset colunar; as letras só são carregadas com ``lyrics=True``.
+
+    Com ``raw=True`` inclui as contagens brutas, se o dataset as tiver. As
+    colunas de polaridade VADER vêm sempre que existirem.
+    """
+    names = pq.read_schema(path).names
+    columns = list(SONGS_COLUMNS)
+    if raw:
+        columns += [col for col in RAW_COLUMNS if col in names]
+    columns += [col for col in VADER_COLUMNS if col in names]
+    if lyrics:
+        columns.append("lyrics")
+    return pd.read_parquet(path, columns=columns, engine="pyarrow")
+
+
+def read_lyrics(path=SONGS_PARQUET, rows=None):
+    """Lê apenas a coluna de letras do dataset colunar.
+
+    Com ``rows`` (posições das músicas), lê só os grupos do Parquet que contêm
+    essas músicas e devolve as letras delas, indexadas pela posição.
+    """
+    if rows is None:
+        return pd.read_parquet(path, columns=["lyrics"], engine="pyarrow")["lyrics"]
+    rows = np.asarray(rows, dtype=np.int64)
+    parquet = pq.ParquetFile(path)
+    sizes = np.array([parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)])
+    starts = np.r_[0, np.cumsum(sizes)]
+    group = np.searchsorted(starts, rows, side="right") - 1
+    groups = np.unique(group)
+    table = parquet.read_row_groups(groups.tolist(), columns=["lyrics"])
+    # Posição de cada música na tabela formada só pelos grupos lidos
+    offsets = np.r_[0, np.cumsum(sizes[groups])]
+    local = rows - starts[group] + offsets[np.searchsorted(groups, group)]
+    return pd.Series(table.column("lyrics").take(local).to_pylist(), index=rows, name="lyrics", dtype=object)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else APP_DIR / "songs_info.csv"
+    target = sys.argv[2] if len(sys.argv) > 2 else SONGS_PARQUET
+    print(f"Dataset gerado em {build_dataset(source, target)}")
@@ -0,0 +1,234 @@
+"""Detecção de músicas quase duplicadas na ingestão (MinHash + LSH).
+
+O ``search_artist(..., max_songs=70)`` da Genius traz remixes, versões ao
+vivo, acústicas e traduções como músicas separadas, que inflariam contagens,
+frequências de palavras e médias de emoção. Aqui cada letra limpa vira um
+conjunto de *shingles* (sequências de ``SHINGLE_SIZE`` palavras) e uma
+assinatura MinHash de ``NUM_PERM`` valores: a fração de valores iguais entre
+duas assinaturas estima a similaridade de Jaccard entre os conjuntos.
+
+Para não comparar todos os pares, as assinaturas são divididas em ``BANDS``
+faixas (*LSH banding*): só músicas que coincidem em uma faixa inteira viram
+candidatas, e cada candidata é confirmada pela similaridade estimada
+(``THRESHOLD``). O custo cresce com o número de músicas, não com o de pares.
+Traduções e versões com letra muito diferente são ligadas pelo título: do mesmo
+artista, com o mesmo título sem a marcação de versão (``(Remix)``, ``- Live``...),
+desde que ao menos uma das duas tenha a marcação e as letras ainda compartilhem
+um mínimo de trechos (``TITLE_THRESHOLD``). Músicas diferentes com o mesmo
+título (duas faixas ``Intro``, por exemplo) não são ligadas.
+
+Cada grupo de duplicatas mantém uma música canônica (a já existente no
+dataset, senão a sem marcação de versão, a mais antiga e a primeira lida) e as
+demais vão para a tabela ``dados/duplicatas.csv``.
+
+Uso (dentro da pasta ``Inferify``): ``python -m inferify.dedup [songs_info.csv] [saida.csv]``
+"""
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from inferify.dataset import APP_DIR, DATASET_DIR, read_songs_csv
+
+DUPLICATES_CSV = DATASET_DIR / "duplicatas.csv"
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+BANDS = 32
+# Similaridade de Jaccard estimada mínima para duas letras serem a mesma música
+THRESHOLD = 0.6
+# Similaridade mínima das versões ligadas pelo título; músicas diferentes do mesmo
+# artista ficam abaixo de 0,03 e traduções com refrão original, perto de 0,08
+TITLE_THRESHOLD = 0.05
+SEED = 1
+# Músicas por parte no cálculo das assinaturas
+CHUNK_SIZE = 20_000
+DUPLICATES_COLUMNS = ["artist", "title", "Album", "release_year",
+                      "canonical_artist", "canonical_title", "similarity", "reason"]
+
+_VERSION_WORDS = (r"remix|mix|live|ao vivo|en vivo|acoustic|acústic[oa]|version|versão|versión|edit|demo|"
+                  r"instrumental|karaoke|remaster(?:ed)?|sped up|slowed|translations?|traduç[ãa]o|traducci[óo]n|"
+                  r"übersetzung|traduction")
+# Marcação de versão entre parênteses/colchetes ou depois de um travessão
+VERSION_PATTERN = re.compile(
+    rf"\s*[\(\[][^\)\]]*\b(?:{_VERSION_WORDS})\b[^\)\]]*[\)\]]|\s+[-–—]\s+[^-–—]*\b(?:{_VERSION_WORDS})\b.*$",
+    re.IGNORECASE,
+)
+
+
+def base_title(title):
+    """Título sem a marcação de versão, em minúsculas."""
+    return " ".join(VERSION_PATTERN.sub("", str(title)).lower().split())
+
+
+class MinHasher:
+    """Assinaturas MinHash das letras e os pares candidatos do LSH."""
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, shingle_size=SHINGLE_SIZE, seed=SEED):
+        if num_perm % bands:
+            raise ValueError("num_perm precisa ser múltiplo de bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Hash multiplicativo (a·x + b) >> 32, com ``a`` ímpar, para cada permutação
+        self.a = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+    def _shingles(self, texts):
+        """Hash de 64 bits de cada shingle e o início dos shingles de cada letra."""
+        words = pd.Series(texts, dtype=object).fillna("").str.lower().str.split()
+        lengths = words.str.len().to_numpy()
+        tokens = words.explode().dropna().to_numpy(dtype=object)
+        hashes = pd.util.hash_array(tokens, categorize=True) if len(tokens) else np.zeros(0, dtype=np.uint64)
+        ends = np.cumsum(lengths)
+        counts = np.maximum(lengths - self.shingle_size + 1, 0)
+        starts = np.repeat(ends - lengths, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+        shingles = np.zeros(len(starts), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for offset in range(self.shingle_size):
+                shingles = shingles * np.uint64(0x100000001B3) + hashes[starts + offset]
+        return shingles, counts
+
+    def signatures(self, texts):
+        """Matriz ``len(texts) × num_perm`` (``uint32``); letras com menos de
+        ``shingle_size`` palavras ficam com o valor máximo em tudo e não têm duplicatas."""
+        texts = list(texts)
+        result = np.full((len(texts), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        for start in range(0, len(texts), CHUNK_SIZE):
+            shingles, counts = self._shingles(texts[start:start + CHUNK_SIZE])
+            rows = np.flatnonzero(counts) + start
+            if not len(rows):
+                continue
+            offsets = np.cumsum(counts[counts > 0]) - counts[counts > 0]
+            with np.errstate(over="ignore"):
+                for i in range(self.num_perm):
+                    hashed = (shingles * self.a[i] + self.b[i]) >> np.uint64(32)
+                    result[rows, i] = np.minimum.reduceat(hashed, offsets)
+        return result
+
+    def candidates(self, signatures):
+        """Pares ``(i, j)`` que coincidem em alguma faixa, com ``i`` a primeira música do balde."""
+        valid = np.flatnonzero(signatures[:, 0] != np.iinfo(np.uint32).max)
+        rows = self.num_perm // self.bands
+        left, right = [], []
+        for band in range(self.bands):
+            block = signatures[valid, band * rows:(band + 1) * rows].astype(np.uint64)
+            keys = np.zeros(len(valid), dtype=np.uint64)
+            with np.errstate(over="ignore"):
+                for column in block.T:
+                    keys = keys * np.uint64(0x100000001B3) + column
+            order = np.argsort(keys, kind="stable")
+            keys = keys[order]
+            # Cada música do balde é comparada com a primeira dele
+            first = np.r_[True, keys[1:] != keys[:-1]]
+            leader = order[np.flatnonzero(first)[np.cumsum(first) - 1]]
+            pairs = ~first
+            left.append(valid[leader[pairs]])
+            right.append(valid[order[pairs]])
+        left, right = np.concatenate(left), np.concatenate(right)
+        pairs = np.unique(np.stack([left, right], axis=1), axis=0) if len(left) else np.zeros((0, 2), dtype=np.int64)
+        return pairs[:, 0], pairs[:, 1]
+
+
+def similarity(signatures, left, right):
+    """Jaccard estimado entre as letras de cada par."""
+    if not len(left):
+        return np.zeros(0)
+    return (signatures[left] == signatures[right]).mean(axis=1)
+
+
+def find_duplicates(songs, priority=None, threshold=THRESHOLD, hasher=None):
+    """Grupo de cada música e se ela é a canônica.
+
+    ``songs`` precisa das colunas ``artist``, ``title``, ``lyrics`` e
+    ``release_year``; ``priority`` marca as músicas que devem ser mantidas
+    quando houver escolha (ex.: as que já estão no dataset). Devolve um
+    DataFrame alinhado a ``songs`` com ``cluster``, ``canonical`` (posição da
+    música mantida), ``similarity`` (Jaccard estimado com ela) e ``reason``.
+    """
+    hasher = hasher or MinHasher()
+    n = len(songs)
+    signatures = hasher.signatures(songs["lyrics"])
+    left, right = hasher.candidates(signatures)
+    confirmed = similarity(signatures, left, right) >= threshold
+    left, right = left[confirmed], right[confirmed]
+
+    # Mesmo artista e mesmo título sem a marcação de versão, com marcação em ao menos uma
+    marked = songs["title"].astype(str).str.contains(VERSION_PATTERN).to_numpy()
+    titles = pd.DataFrame({"artist": songs["artist"].astype(str).to_numpy(),
+                           "base": songs["title"].map(base_title).to_numpy()})
+    group = pd.DataFrame({"group": titles.groupby(["artist", "base"], sort=False).ngroup().to_numpy(),
+                          "row": np.arange(n)})
+    pairs = group[marked].merge(group, on="group", suffixes=("_version", ""))
+    pairs = pairs[pairs["row_version"] != pairs["row"]]
+    versions, originals = pairs["row_version"].to_numpy(), pairs["row"].to_numpy()
+    related = similarity(signatures, versions, originals) >= TITLE_THRESHOLD
+    left, right = np.r_[left, versions[related]], np.r_[right, originals[related]]
+
+    graph = coo_matrix((np.ones(len(left), dtype=np.int8), (left, right)), shape=(n, n))
+    _, cluster = connected_components(graph, directed=False)
+
+    # Canônica: prioritária, sem marcação de versão, mais antiga, primeira lida
+    keep = np.zeros(n, dtype=bool) if priority is None else np.asarray(priority, dtype=bool)
+    year = pd.to_numeric(songs["release_year"], errors="coerce").fillna(np.inf).to_numpy()
+    ranking = np.lexsort((np.arange(n), year, marked, ~keep, cluster))
+    first = np.r_[True, cluster[ranking][1:] != cluster[ranking][:-1]]
+    canonical = np.empty(n, dtype=np.int64)
+    canonical[ranking] = ranking[np.flatnonzero(first)[np.cumsum(first) - 1]]
+
+    score = similarity(signatures, np.arange(n), canonical)
+    score[signatures[:, 0] == np.iinfo(np.uint32).max] = np.nan
+    reason = np.where(score >= threshold, "letra", "título")
+    return pd.DataFrame({"cluster": cluster, "canonical": canonical, "similarity": score, "reason": reason},
+                        index=songs.index)
+
+
+def drop_duplicates(songs, reference=None, priority=None, threshold=THRESHOLD):
+    """``(mantidas, duplicatas)``: as músicas canônicas e a tabela das removidas.
+
+    ``reference`` são músicas que já estão no dataset: nunca são removidas, mas
+    as de ``songs`` que as repetem são.
+    """
+    if reference is not None:
+        everything = pd.concat([reference, songs], ignore_index=True)
+        existing = np.arange(len(everything)) < len(reference)
+        if priority is not None:
+            existing[len(reference):] = priority
+        found = find_duplicates(everything, existing, threshold).iloc[len(reference):]
+        positions = found["canonical"].to_numpy()
+        duplicate = positions != np.arange(len(reference), len(everything))
+        canonical = everything.iloc[positions[duplicate]]
+    else:
+        found = find_duplicates(songs, priority, threshold)
+        duplicate = found["canonical"].to_numpy() != np.arange(len(songs))
+        canonical = songs.iloc[found["canonical"].to_numpy()[duplicate]]
+    table = songs[duplicate][["artist", "title", "Album", "release_year"]].assign(
+        canonical_artist=canonical["artist"].to_numpy(),
+        canonical_title=canonical["title"].to_numpy(),
+        similarity=found["similarity"].to_numpy()[duplicate].round(3),
+        reason=found["reason"].to_numpy()[duplicate],
+    )
+    return songs[~duplicate].reset_index(drop=True), table.reset_index(drop=True)[DUPLICATES_COLUMNS]
+
+
+def save_duplicates(table, target=DUPLICATES_CSV, append=False):
+    """Grava a tabela de duplicatas; com ``append=True``, acrescenta às já registradas."""
+    target = Path(target)
+    if append and target.exists():
+        table = pd.concat([pd.read_csv(target), table], ignore_index=True)
+        table = table.drop_duplicates(["artist", "title"], keep="last")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(target, index=False)
+    return target
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else APP_DIR / "songs_info.csv"
+    target = sys.argv[2] if len(sys.argv) > 2 else DUPLICATES_CSV
+    songs = read_songs_csv(source)
+    kept, table = drop_duplicates(songs)
+    print(f"{len(table)} duplicatas em {len(songs)} músicas -> {save_duplicates(table, target)}")
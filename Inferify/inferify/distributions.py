@@ -0,0 +1,78 @@
+"""Resumos de distribuição calculados no servidor para os gráficos.
+
+``px.histogram`` e ``px.box`` recebem todas as linhas e mandam todas elas no
+JSON da figura, então o tamanho da página cresce com o número de músicas. Aqui
+o histograma vira contagens por faixa (``np.histogram``) e o box plot vira os
+cinco números de cada grupo; as figuras levam só esses resumos.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+
+def histogram(values, bins=30):
+    """Contagem por faixa de ``values``, com início, fim e centro de cada faixa."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return pd.DataFrame({"start": [], "end": [], "center": [], "count": []})
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({
+        "start": edges[:-1],
+        "end": edges[1:],
+        "center": (edges[:-1] + edges[1:]) / 2,
+        "count": counts,
+    })
+
+
+def box_summary(frame, by, column):
+    """Quartis e limites dos bigodes de ``column`` em cada grupo de ``by``.
+
+    Os quartis usam a interpolação linear do Plotly (a mesma do ``np.quantile``)
+    e os bigodes vão até o valor mais extremo dentro de 1,5 × IQR dos quartis,
+    como no ``px.box``. Os pontos fora dos bigodes não são enviados.
+    """
+    if frame.empty:
+        return pd.DataFrame(columns=[by, "q1", "median", "q3", "lowerfence", "upperfence", "count"])
+    groups = frame.groupby(by, observed=True, sort=False)[column]
+    summary = groups.quantile([0.25, 0.5, 0.75]).unstack()
+    summary.columns = ["q1", "median", "q3"]
+    iqr = summary["q3"] - summary["q1"]
+    low = frame[by].map(summary["q1"] - 1.5 * iqr).astype("float64")
+    high = frame[by].map(summary["q3"] + 1.5 * iqr).astype("float64")
+    inside = frame[column].between(low, high)
+    whiskers = frame[inside].groupby(by, observed=True, sort=False)[column].agg(["min", "max"])
+    summary["lowerfence"] = whiskers["min"]
+    summary["upperfence"] = whiskers["max"]
+    summary["count"] = groups.size()
+    return summary.reset_index()
+
+
+def histogram_figure(values, bins=30, label=None, **layout):
+    """Histograma de ``values`` como barras com as contagens por faixa."""
+    bars = histogram(values, bins)
+    fig = px.bar(bars, x="center", y="count", labels={"center": label or "value", "count": "count"})
+    fig.update_traces(
+        width=float(bars["end"].iloc[0] - bars["start"].iloc[0]) if len(bars) else None,
+        customdata=bars[["start", "end"]].to_numpy(),
+        hovertemplate=f"{label or 'value'}=%{{customdata[0]:.3g}} – %{{customdata[1]:.3g}}<br>count=%{{y}}<extra></extra>",
+    )
+    fig.update_layout(bargap=0, **layout)
+    return fig
+
+
+def box_figure(frame, by, column):
+    """Box plot de ``column`` por ``by`` a partir dos cinco números de cada grupo."""
+    summary = box_summary(frame, by, column)
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure([
+        go.Box(
+            name=str(row[by]), x=[row[by]], q1=[row["q1"]], median=[row["median"]], q3=[row["q3"]],
+            lowerfence=[row["lowerfence"]], upperfence=[row["upperfence"]],
+            marker_color=colors[i % len(colors)], boxpoints=False,
+        )
+        for i, row in enumerate(summary.to_dict("records"))
+    ])
+    fig.update_layout(xaxis_title=by, yaxis_title=column, legend_title_text=by, boxmode="overlay")
+    return fig
@@ -0,0 +1,172 @@
+"""Filtros da barra lateral resolvidos por bitmaps.
+
+Cada coluna filtrável guarda, para cada valor frequente (presente em pelo menos
+1/256 das linhas, então no máximo 256 por coluna), um bitmap com um bit por
+linha em palavras de 64 bits. Os valores raros ficam como listas de posições, e o
+código de cada linha é guardado para seleções com muitos valores raros. Os
+anos são os valores ordenados da coluna, então um intervalo vira uma busca
+binária.
+
+Uma seleção é o OU dos valores escolhidos em cada coluna seguido do E entre as
+colunas. Quando mais da metade dos valores está selecionada, o OU é feito sobre
+os não selecionados e invertido. Assim o custo depende do tamanho do bitmap
+(``linhas / 64`` palavras), não de comparar textos linha a linha.
+"""
+import numpy as np
+import pandas as pd
+
+_WORD = 64
+
+# Um valor ganha bitmap próprio quando aparece em pelo menos 1/DENSE_FRACTION das linhas
+DENSE_FRACTION = 256
+
+
+class _Column:
+    """Valores ordenados de uma coluna e as linhas de cada um.
+
+    ``order`` tem as posições das linhas agrupadas por valor (``bounds`` marca o
+    início de cada grupo) e ``codes`` o código de cada linha somado de 1 (0 para
+    valores ausentes). Os valores frequentes também têm uma linha em ``dense``,
+    indicada por ``dense_rows`` (-1 para os raros).
+    """
+
+    def __init__(self, values, codes, order, bounds, dense_rows, dense, present):
+        self.values = values
+        self.index = pd.Index(values)
+        self.codes = codes
+        self.order = order
+        self.bounds = bounds
+        self.dense_rows = dense_rows
+        self.dense = dense
+        self.present = present
+
+
+class BitmapIndex:
+    """Bitmaps por valor das colunas de um DataFrame, com linhas na ordem dele."""
+
+    def __init__(self, size, columns):
+        self.size = size
+        self.words = -(-size // _WORD)
+        self.columns = columns
+        self._full = self._pack(np.ones(size, dtype=bool))
+
+    @classmethod
+    def build(cls, frame, columns):
+        index = cls(len(frame), {})
+        for col in columns:
+            index.columns[col] = index._build_column(frame[col])
+        return index
+
+    def _build_column(self, series):
+        codes, values = pd.factorize(series, sort=True)
+        values = np.asarray(values)
+        order = np.argsort(codes, kind="stable").astype(np.int32)
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1)).astype(np.int64)
+        order = order[bounds[0]:]
+        bounds -= bounds[0]
+        frequent = np.flatnonzero(np.diff(bounds) * DENSE_FRACTION >= self.size)
+        dense_rows = np.full(len(values), -1, dtype=np.int64)
+        dense_rows[frequent] = np.arange(len(frequent))
+        dense = np.zeros((len(frequent), self.words), dtype=np.uint64)
+        for row, code in enumerate(frequent):
+            dense[row] = self._from_positions(order[bounds[code]:bounds[code + 1]])
+        return _Column(values, (codes + 1).astype(np.int32), order, bounds, dense_rows, dense,
+                       self._from_positions(order))
+
+    def _pack(self, mask):
+        packed = np.zeros(self.words * 8, dtype=np.uint8)
+        bits = np.packbits(mask, bitorder="little")
+        packed[:len(bits)] = bits
+        return packed.view(np.uint64)
+
+    def _from_positions(self, positions):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[positions] = True
+        return self._pack(mask)
+
+    def full(self):
+        """Bitmap com todas as linhas."""
+        return self._full.copy()
+
+    def _union(self, column, codes):
+        rows = column.dense_rows[codes]
+        dense = rows[rows >= 0]
+        bits = np.bitwise_or.reduce(column.dense[dense], axis=0) if len(dense) else np.zeros(self.words, np.uint64)
+        rare = codes[rows < 0]
+        if not len(rare):
+            return bits
+        starts, sizes = column.bounds[rare], column.bounds[rare + 1] - column.bounds[rare]
+        total = sizes.sum()
+        if total * 8 > self.size:
+            # Muitas posições: mais barato consultar o código de cada linha
+            chosen = np.zeros(len(column.values) + 1, dtype=bool)
+            chosen[rare + 1] = True
+            return bits | self._pack(chosen[column.codes])
+        # Concatena as faixas de ``order`` dos valores raros sem laço em Python
+        offsets = np.repeat(starts - (np.cumsum(sizes) - sizes), sizes)
+        return bits | self._from_positions(column.order[offsets + np.arange(total)])
+
+    def _codes(self, column, codes):
+        """OU dos valores ``codes``, invertendo a seleção quando ela é a maior parte."""
+        chosen = np.zeros(len(column.values), dtype=bool)
+        chosen[codes] = True
+        if chosen.sum() * 2 <= len(chosen):
+            return self._union(column, np.flatnonzero(chosen))
+        return column.present & ~self._union(column, np.flatnonzero(~chosen))
+
+    def match(self, col, values):
+        """Linhas cujo valor de ``col`` está em ``values`` (como ``isin``)."""
+        column = self.columns[col]
+        codes = column.index.get_indexer(pd.Index(list(values), dtype=object))
+        return self._codes(column, codes[codes >= 0])
+
+    def between(self, col, low, high):
+        """Linhas com ``low <= col <= high``, pelos valores ordenados da coluna."""
+        column = self.columns[col]
+        start = np.searchsorted(column.values, low, side="left")
+        stop = np.searchsorted(column.values, high, side="right")
+        return self._codes(column, np.arange(start, stop))
+
+    def mask(self, bits):
+        """Bitmap convertido em máscara booleana do tamanho do DataFrame."""
+        return np.unpackbits(bits.view(np.uint8), count=self.size, bitorder="little").view(bool)
+
+    def rows(self, bits):
+        """Posições das linhas marcadas, em ordem crescente."""
+        return np.flatnonzero(self.mask(bits))
+
+    def count(self, bits):
+        return int(np.unpackbits(bits.view(np.uint8)).sum())
+
+
+class SongFilter(BitmapIndex):
+    """Índice das músicas com os mesmos filtros das páginas."""
+
+    COLUMNS = ["release_year", "artist", "Album", "genre"]
+
+    @classmethod
+    def build(cls, songs, columns=COLUMNS):
+        return super().build(songs, columns)
+
+    def select(self, years=None, artists=None, albums=None, genres=None):
+        """Bitmap das músicas que passam nos filtros da barra lateral."""
+        bits = self.full() if years is None else self.between("release_year", years[0], years[1])
+        for col, values in (("artist", artists), ("Album", albums), ("genre", genres)):
+            if values is not None:
+                bits &= self.match(col, values)
+        return bits
+
+
+class MemberFilter(BitmapIndex):
+    """Índice do ``artistas_info.csv`` para achar integrantes e bandas."""
+
+    COLUMNS = ["nome", "banda"]
+
+    @classmethod
+    def build(cls, artists, columns=COLUMNS):
+        return super().build(artists, columns)
+
+    def members(self, artists):
+        """Linhas cujo ``nome`` ou ``banda`` está em ``artists``."""
+        artists = list(artists)
+        return self.match("nome", artists) | self.match("banda", artists)
@@ -0,0 +1,266 @@
+"""Coleta concorrente de letras na API da Genius.
+
+Substitui as chamadas seriais ``genius.search_artist(nome, max_songs=N)`` dos
+notebooks ``Lyrics.ipynb``. Vários artistas e músicas são buscados ao mesmo
+tempo em um pool de threads, respeitando um limite de requisições por segundo,
+com novas tentativas e espera exponencial em erros 429/5xx. As respostas das
+músicas e as páginas das letras ficam em um cache em disco endereçado pelo hash
+da requisição, então uma nova execução só vai à rede para as músicas que ainda
+não foram baixadas. A busca e as listas de músicas dos artistas são sempre
+pedidas de novo, para que músicas lançadas depois apareçam.
+
+O resultado é gravado no mesmo formato do ``artist.save_lyrics()``
+(``Lyrics_<Artista>.json``), que é o que o ``inferify.build`` lê.
+
+Uso (dentro da pasta ``Inferify``)::
+
+    GENIUS_ACCESS_TOKEN=... python -m inferify.genius "Zayn:70" "Normani:35" --output-dir saida
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+
+from inferify.dataset import CACHE_DIR
+
+API_URL = "https://api.genius.com"
+GENIUS_CACHE_DIR = CACHE_DIR / "genius"
+
+# Erros que valem uma nova tentativa
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def retry_delay(headers, default):
+    """Segundos do ``Retry-After`` numérico, ou ``default`` (ausente ou no formato de data HTTP)."""
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """Balde de fichas: no máximo ``rate`` requisições por segundo entre as threads."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """Respostas em disco, uma por arquivo, nomeadas pelo SHA-256 da URL."""
+
+    def __init__(self, directory=GENIUS_CACHE_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, url):
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / digest
+
+    def get(self, url):
+        path = self._path(url)
+        return path.read_bytes() if path.exists() else None
+
+    def put(self, url, content):
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(content)
+        tmp_path.replace(path)
+
+
+class _LyricsParser(HTMLParser):
+    """Extrai o texto dos blocos ``data-lyrics-container`` da página da música."""
+
+    def __init__(self):
+        super().__init__()
+        self.depth = 0
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.depth:
+            if tag == "br":
+                self.parts.append("\n")
+            elif tag == "div":
+                self.depth += 1
+        elif tag == "div" and ("data-lyrics-container", "true") in attrs:
+            if self.parts:
+                self.parts.append("\n")
+            self.depth = 1
+
+    def handle_endtag(self, tag):
+        if self.depth and tag == "div":
+            self.depth -= 1
+
+    def handle_data(self, data):
+        if self.depth:
+            self.parts.append(data)
+
+
+def parse_lyrics(html):
+    parser = _LyricsParser()
+    parser.feed(html)
+    return "".join(parser.parts).strip()
+
+
+class GeniusClient:
+    """Cliente da API da Genius com cache, limite de taxa e novas tentativas.
+
+    ``api_url`` pode apontar para um servidor local (ver
+    ``inferify.genius_replay``) para testes sem acesso à rede.
+    """
+
+    def __init__(self, token=None, api_url=API_URL, cache=None, rate=5.0, max_workers=8,
+                 max_retries=4, backoff=0.5, timeout=15):
+        self.token = token or os.environ.get("GENIUS_ACCESS_TOKEN", "")
+        self.api_url = api_url.rstrip("/")
+        self.cache = cache or ResponseCache()
+        self.limiter = RateLimiter(rate)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.network_requests = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, url, cached=True):
+        """Corpo da resposta de ``url``, do cache quando possível."""
+        content = self.cache.get(url) if cached else None
+        if content is not None:
+            return content
+
+        request = urllib.request.Request(url, headers={"User-Agent": "inferify"})
+        if self.token and url.startswith(self.api_url):
+            request.add_header("Authorization", f"Bearer {self.token}")
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            with self._counter_lock:
+                self.network_requests += 1
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    content = response.read()
+                break
+            except urllib.error.HTTPError as erro:
+                if erro.code not in RETRY_STATUS or attempt == self.max_retries:
+                    raise
+                delay = retry_delay(erro.headers, self.backoff * 2 ** attempt)
+            except (urllib.error.URLError, TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+            time.sleep(delay * (1 + random.random() / 2))
+
+        if cached:
+            self.cache.put(url, content)
+        return content
+
+    def api(self, path, cached=True, **params):
+        query = f"?{urllib.parse.urlencode(params)}" if params else ""
+        return json.loads(self.get(f"{self.api_url}{path}{query}", cached))["response"]
+
+    def find_artist(self, name):
+        """Primeiro artista principal encontrado na busca por ``name``."""
+        hits = self.api("/search", cached=False, q=name)["hits"]
+        if not hits:
+            raise LookupError(f"Artista não encontrado na Genius: {name}")
+        for hit in hits:
+            artist = hit["result"]["primary_artist"]
+            if artist["name"].lower() == name.lower():
+                return artist["id"]
+        return hits[0]["result"]["primary_artist"]["id"]
+
+    def artist_song_ids(self, artist_id, max_songs):
+        ids, page = [], 1
+        while page and len(ids) < max_songs:
+            response = self.api(f"/artists/{artist_id}/songs", cached=False, per_page=50, page=page,
+                                sort="popularity")
+            ids.extend(song["id"] for song in response["songs"]
+                       if song["primary_artist"]["id"] == artist_id)
+            page = response.get("next_page")
+        return ids[:max_songs]
+
+    def song(self, song_id):
+        """Dados completos da música, com a letra extraída da página."""
+        song = self.api(f"/songs/{song_id}")["song"]
+        song["lyrics"] = parse_lyrics(self.get(song["url"]).decode("utf-8"))
+        return song
+
+    def fetch_artists(self, requests):
+        """Busca vários artistas de uma vez.
+
+        ``requests`` é uma lista de ``(nome, max_songs)``. Retorna um dicionário
+        ``nome -> dados do artista`` no formato do ``save_lyrics()``.
+        """
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            artist_ids = list(pool.map(lambda req: self.find_artist(req[0]), requests))
+            artists = list(pool.map(lambda artist_id: self.api(f"/artists/{artist_id}", cached=False)["artist"],
+                                    artist_ids))
+            song_ids = list(pool.map(lambda args: self.artist_song_ids(*args),
+                                     [(artist_id, max_songs) for artist_id, (_, max_songs) in zip(artist_ids, requests)]))
+            # Todas as músicas de todos os artistas disputam o mesmo pool
+            songs = iter(list(pool.map(self.song, [song_id for ids in song_ids for song_id in ids])))
+
+        result = {}
+        for (name, _), artist, ids in zip(requests, artists, song_ids):
+            artist_songs = [next(songs) for _ in ids]
+            for song in artist_songs:
+                song["artist"] = artist["name"]
+            result[name] = {**artist, "songs": artist_songs}
+        return result
+
+
+def save_lyrics(artist, output_dir="."):
+    """Grava ``Lyrics_<Artista>.json`` como o ``artist.save_lyrics()``."""
+    filename = "Lyrics_" + "".join(artist["name"].split()) + ".json"
+    path = Path(output_dir) / filename
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as arquivo:
+        json.dump(artist, arquivo, indent=1, sort_keys=True)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Baixa letras de vários artistas da Genius em paralelo.")
+    parser.add_argument("artists", nargs="+", help='artistas no formato "Nome:max_songs"')
+    parser.add_argument("--output-dir", type=Path, default=Path("."))
+    parser.add_argument("--api-url", default=API_URL, help="URL da API (ex.: servidor local de testes)")
+    parser.add_argument("--cache-dir", type=Path, default=GENIUS_CACHE_DIR)
+    parser.add_argument("--rate", type=float, default=5.0, help="requisições por segundo")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    requests = [(name, int(max_songs or 50)) for name, _, max_songs in (a.partition(":") for a in args.artists)]
+    client = GeniusClient(api_url=args.api_url, cache=ResponseCache(args.cache_dir),
+                          rate=args.rate, max_workers=args.workers)
+    start = time.perf_counter()
+    for artist in client.fetch_artists(requests).values():
+        print(f"{artist['name']}: {len(artist['songs'])} músicas -> {save_lyrics(artist, args.output_dir)}")
+    print(f"{client.network_requests} requisições de rede em {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
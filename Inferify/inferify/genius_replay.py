@@ -0,0 +1,136 @@
+"""Servidor local que imita a API da Genius a partir dos JSONs já baixados.
+
+Serve os ``Arquivos Gerados/Lyrics_*.json`` do repositório pelos mesmos
+endpoints usados pelo ``inferify.genius`` (``/search``, ``/artists/<id>``,
+``/artists/<id>/songs``, ``/songs/<id>`` e a página HTML da letra), para testar a
+coleta sem token e sem rede. ``--fail-every N`` responde 429 a cada N
+requisições, para exercitar as novas tentativas.
+
+Uso (dentro da pasta ``Inferify``)::
+
+    python -m inferify.genius_replay --port 8765
+    python -m inferify.genius "Normani:35" --api-url http://127.0.0.1:8765 --output-dir /tmp/saida
+"""
+import argparse
+import html
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from inferify.build import discover
+from inferify.scoring import REPO_DIR
+
+
+class GeniusReplay:
+    """Índice em memória dos artistas e músicas dos JSONs salvos."""
+
+    def __init__(self, paths):
+        self.artists = {}
+        self.songs = {}
+        for path in paths:
+            with open(path, encoding="utf-8") as arquivo:
+                data = json.load(arquivo)
+            songs = data.pop("songs")
+            self.artists[data["id"]] = (data, [song["id"] for song in songs])
+            for song in songs:
+                self.songs.setdefault(song["id"], song)
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def search(self, query):
+        query = query.lower()
+        return {"hits": [
+            {"type": "song", "result": {"primary_artist": {"id": artist["id"], "name": artist["name"]}}}
+            for artist, _ in self.artists.values() if query in artist["name"].lower()
+        ]}
+
+    def artist_songs(self, artist_id, page, per_page):
+        _, ids = self.artists[artist_id]
+        start = (page - 1) * per_page
+        songs = [
+            {"id": song_id, "primary_artist": {"id": self.songs[song_id]["primary_artist"]["id"]}}
+            for song_id in ids[start:start + per_page]
+        ]
+        return {"songs": songs, "next_page": page + 1 if start + per_page < len(ids) else None}
+
+    def song(self, song_id, base_url):
+        song = {k: v for k, v in self.songs[song_id].items() if k not in ("lyrics", "artist")}
+        song["url"] = f"{base_url}/lyrics/{song_id}"
+        return {"song": song}
+
+    def lyrics_page(self, song_id):
+        lines = html.escape(self.songs[song_id].get("lyrics") or "").split("\n")
+        return f'<html><body><div data-lyrics-container="true">{"<br/>".join(lines)}</div></body></html>'
+
+
+def make_handler(replay, fail_every=0):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with replay.lock:
+                replay.requests += 1
+                count = replay.requests
+            if fail_every and count % fail_every == 0:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+
+            url = urllib.parse.urlsplit(self.path)
+            params = dict(urllib.parse.parse_qsl(url.query))
+            parts = url.path.strip("/").split("/")
+            base_url = f"http://{self.headers['Host']}"
+            try:
+                if parts == ["search"]:
+                    body = replay.search(params.get("q", ""))
+                elif len(parts) == 2 and parts[0] == "artists":
+                    body = {"artist": replay.artists[int(parts[1])][0]}
+                elif len(parts) == 3 and parts[0] == "artists" and parts[2] == "songs":
+                    body = replay.artist_songs(int(parts[1]), int(params.get("page", 1)),
+                                               int(params.get("per_page", 20)))
+                elif len(parts) == 2 and parts[0] == "songs":
+                    body = replay.song(int(parts[1]), base_url)
+                elif len(parts) == 2 and parts[0] == "lyrics":
+                    return self._send(replay.lyrics_page(int(parts[1])).encode("utf-8"), "text/html")
+                else:
+                    return self.send_error(404)
+            except (KeyError, ValueError):
+                return self.send_error(404)
+            self._send(json.dumps({"meta": {"status": 200}, "response": body}).encode("utf-8"), "application/json")
+
+        def _send(self, content, content_type):
+            self.send_response(200)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(port=8765, root=REPO_DIR, fail_every=0):
+    """Cria o servidor (sem iniciá-lo); use ``serve_forever()`` ou uma thread."""
+    replay = GeniusReplay(discover(root))
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(replay, fail_every))
+    server.replay = replay
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API da Genius.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--root", default=REPO_DIR, help="pasta onde procurar os JSONs")
+    parser.add_argument("--fail-every", type=int, default=0, help="responde 429 a cada N requisições")
+    args = parser.parse_args(argv)
+
+    server = serve(args.port, args.root, args.fail_every)
+    print(f"{len(server.replay.artists)} artistas, {len(server.replay.songs)} músicas em "
+          f"http://127.0.0.1:{server.server_address[1]}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Histórico da popularidade dos artistas, acumulado a cada coleta.
+
+O ``artistas_popularidade.csv`` guarda só a última coleta. Aqui cada coleta
+(``append_snapshot``) é acrescentada a um histórico colunar em Parquet,
+particionado por mês (``AAAA-MM.parquet``): o nome do artista é codificado por
+dicionário, a popularidade fica em um byte e os seguidores são guardados como a
+diferença para a coleta anterior do mesmo artista no mês, que costuma ser
+pequena e comprime bem. Linhas já gravadas nunca mudam; uma nova coleta no mesmo
+mês regrava o arquivo do mês com as linhas novas no fim de cada artista, e uma
+coleta repetida no mesmo dia é ignorada.
+
+``read_history`` abre só as partições do intervalo pedido e desfaz as
+diferenças com uma soma acumulada por artista. Coletas diárias de alguns
+milhares de artistas ocupam poucos MB por ano.
+
+Uso (dentro da pasta ``Inferify``)::
+
+    python -m inferify.history artistas_popularidade.csv --date 2025-06-01
+"""
+import argparse
+import bisect
+import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pandas.api.types import union_categoricals
+
+from inferify.dataset import APP_DIR
+
+# O histórico é dado primário (não pode ser refeito a partir dos CSVs), então
+# fica fora de ``dados/``, que é só de artefatos gerados
+HISTORY_DIR = APP_DIR / "historico_popularidade"
+
+# Linhas por grupo do Parquet: grupos pequenos deixam a leitura de poucos artistas pular o resto
+ROW_GROUP_SIZE = 8192
+
+SCHEMA = pa.schema([
+    ("data", pa.date32()),
+    ("nome", pa.dictionary(pa.int32(), pa.string())),
+    ("popularidade", pa.uint8()),
+    # Diferença para a coleta anterior do artista no mês; a primeira do mês é o total
+    ("seguidores_delta", pa.int64()),
+])
+
+
+def _partition(directory, month):
+    return Path(directory) / f"{month}.parquet"
+
+
+def _encode(frame):
+    """Ordena por artista e data e troca os seguidores pela diferença entre coletas."""
+    frame = frame.sort_values(["nome", "data"], kind="stable").reset_index(drop=True)
+    followers = frame["seguidores"].to_numpy(np.int64)
+    delta = np.diff(followers, prepend=0)
+    nomes = frame["nome"].to_numpy()
+    first = np.r_[np.ones(min(len(frame), 1), dtype=bool), nomes[1:] != nomes[:-1]]
+    delta[first] = followers[first]
+    return pa.table({
+        "data": pa.array(pd.to_datetime(frame["data"]).to_numpy("datetime64[D]")),
+        "nome": pa.array(frame["nome"].astype(str)).dictionary_encode(),
+        "popularidade": pa.array(frame["popularidade"].to_numpy(np.uint8)),
+        "seguidores_delta": pa.array(delta),
+    }, schema=SCHEMA)
+
+
+def _decode(table):
+    """Tabela de uma partição de volta para seguidores absolutos."""
+    frame = table.to_pandas(date_as_object=False)
+    # As linhas estão ordenadas por artista: soma acumulada geral menos a do início de cada artista
+    codes = frame["nome"].cat.codes.to_numpy()
+    delta = frame.pop("seguidores_delta").to_numpy()
+    total = np.cumsum(delta)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=np.int64)
+    lengths = np.diff(np.r_[starts, len(codes)])
+    frame["seguidores"] = total - np.repeat(total[starts] - delta[starts], lengths)
+    return frame
+
+
+def _write(table, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    pq.write_table(table, tmp_path, compression="zstd", use_dictionary=["nome"], row_group_size=ROW_GROUP_SIZE,
+                   column_encoding={"seguidores_delta": "DELTA_BINARY_PACKED", "data": "DELTA_BINARY_PACKED"})
+    tmp_path.replace(path)
+
+
+def _read_partition(path, artists=None):
+    """Partição inteira ou só as linhas de ``artists``.
+
+    As linhas estão ordenadas por artista, então o mínimo e o máximo de ``nome``
+    em cada grupo de linhas dizem quais grupos podem ter os artistas pedidos; os
+    outros nem são lidos.
+    """
+    if artists is None:
+        return pq.read_table(path)
+    wanted = sorted(set(artists))
+    parquet = pq.ParquetFile(path)
+    column = parquet.schema_arrow.get_field_index("nome")
+    groups = []
+    for index in range(parquet.metadata.num_row_groups):
+        stats = parquet.metadata.row_group(index).column(column).statistics
+        if stats is None or not stats.has_min_max:
+            groups.append(index)
+            continue
+        position = bisect.bisect_left(wanted, stats.min)
+        if position < len(wanted) and wanted[position] <= stats.max:
+            groups.append(index)
+    table = parquet.read_row_groups(groups) if groups else parquet.schema_arrow.empty_table()
+    table = table.filter(pc.is_in(table.column("nome"), value_set=pa.array(wanted, pa.string())))
+    # Refaz o dicionário só com os artistas lidos, em vez de carregar os nomes de todos
+    nomes = pc.dictionary_encode(table.column("nome").cast(pa.string()))
+    return table.set_column(column, "nome", nomes)
+
+
+def append_snapshot(frame, date=None, directory=HISTORY_DIR):
+    """Acrescenta uma coleta (colunas ``nome``, ``popularidade``, ``seguidores``) ao histórico.
+
+    Devolve o número de linhas novas; artistas que já têm coleta em ``date`` são ignorados.
+    """
+    date = pd.Timestamp(date or datetime.date.today()).normalize()
+    snapshot = frame[["nome", "popularidade", "seguidores"]].dropna(subset=["nome"]).drop_duplicates("nome")
+    if snapshot.empty:
+        return 0
+    snapshot = snapshot.assign(data=date)
+    path = _partition(directory, f"{date:%Y-%m}")
+    if path.exists():
+        previous = _decode(pq.read_table(path))
+        done = set(previous.loc[previous["data"] == date, "nome"].astype(str))
+        snapshot = snapshot[~snapshot["nome"].isin(done)]
+        if snapshot.empty:
+            return 0
+        previous["nome"] = previous["nome"].astype(str)
+        snapshot = pd.concat([previous, snapshot], ignore_index=True)
+        added = len(snapshot) - len(previous)
+    else:
+        added = len(snapshot)
+    _write(_encode(snapshot), path)
+    return added
+
+
+def months(directory=HISTORY_DIR):
+    """Meses com coletas, em ordem (``"AAAA-MM"``)."""
+    return sorted(path.stem for path in Path(directory).glob("*.parquet"))
+
+
+def read_history(start=None, end=None, artists=None, directory=HISTORY_DIR):
+    """Coletas entre ``start`` e ``end`` (inclusive), opcionalmente só de ``artists``.
+
+    Só as partições dos meses do intervalo são abertas. Devolve as colunas
+    ``data``, ``nome`` (categórica), ``popularidade`` e ``seguidores``; as
+    coletas de cada artista ficam em ordem de data.
+    """
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+    frames = []
+    for month in months(directory):
+        if (start is not None and month < f"{start:%Y-%m}") or (end is not None and month > f"{end:%Y-%m}"):
+            continue
+        table = _read_partition(_partition(directory, month), artists)
+        # O filtro por data vem depois das diferenças desfeitas, que dependem das linhas anteriores
+        frame = _decode(table)
+        if start is not None:
+            frame = frame[frame["data"] >= start]
+        if end is not None:
+            frame = frame[frame["data"] <= end]
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame({"data": pd.Series(dtype="datetime64[ns]"), "nome": pd.Series(dtype="category"),
+                             "popularidade": pd.Series(dtype="int64"), "seguidores": pd.Series(dtype="int64")})
+    # Cada mês tem o próprio dicionário de nomes; a união mantém ``nome`` categórico
+    nomes = union_categoricals([frame["nome"] for frame in frames], ignore_order=True)
+    history = pd.concat([frame.drop(columns="nome") for frame in frames], ignore_index=True)
+    history.insert(1, "nome", nomes)
+    history["data"] = history["data"].astype("datetime64[ns]")
+    history["popularidade"] = history["popularidade"].astype("int64")
+    return history
+
+
+def growth(history, freq="MS"):
+    """Crescimento percentual dos seguidores de cada artista por período (``freq``)."""
+    last = history.set_index("data").groupby("nome", observed=True)["seguidores"].resample(freq).last().dropna()
+    rate = last.groupby(level="nome", observed=True).pct_change() * 100
+    return rate.dropna().rename("crescimento").reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Acrescenta uma coleta de popularidade ao histórico.")
+    parser.add_argument("csv", type=Path, nargs="?", default=APP_DIR / "artistas_popularidade.csv")
+    parser.add_argument("--date", help="data da coleta (padrão: hoje)")
+    parser.add_argument("--history-dir", type=Path, default=HISTORY_DIR)
+    args = parser.parse_args(argv)
+
+    added = append_snapshot(pd.read_csv(args.csv), args.date, args.history_dir)
+    print(f"{added} coletas acrescentadas em {args.history_dir}")
+
+
+if __name__ == "__main__":
+    main()
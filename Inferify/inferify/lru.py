@@ -0,0 +1,107 @@
+"""Cache LRU limitado pelo tamanho dos resultados guardados.
+
+Cada entrada tem o tamanho estimado em bytes (``sizeof``); quando o total passa
+de ``max_bytes``, as entradas usadas há mais tempo são descartadas. Acertos,
+faltas e descartes são contados para acompanhar o aproveitamento do cache. O
+acesso é protegido por trava, então uma instância pode ser compartilhada entre
+as sessões do painel.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def sizeof(value):
+    """Tamanho aproximado de ``value`` em bytes."""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if hasattr(value, "to_plotly_json"):
+        # Figuras Plotly: tamanho do JSON enviado ao navegador
+        return len(value.to_json(validate=False))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Resultados por chave, descartando os menos usados acima de ``max_bytes``."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+    def put(self, key, value, size=None):
+        size = sizeof(value) if size is None else size
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            # Um resultado maior que o cache inteiro não é guardado
+            if size > self.max_bytes:
+                return value
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Valor guardado em ``key`` ou o resultado de ``compute()``, que é guardado.
+
+        O cálculo roda fora da trava: duas sessões pedindo a mesma chave ao mesmo
+        tempo podem calcular duas vezes, mas nenhuma espera pela outra.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,181 @@
+"""Músicas com perfil emocional parecido, por índice espacial.
+
+Cada música tem um vetor com as oito emoções do NRC. Os vetores são
+normalizados (norma 1) e guardados numa ``cKDTree`` do SciPy: para vetores
+unitários a distância euclidiana é ``sqrt(2 - 2 × cosseno)``, então os vizinhos
+mais próximos na árvore são os de maior similaridade de cosseno, ou seja, a
+mesma mistura de emoções, independente da quantidade de palavras. Uma consulta
+visita só alguns nós da árvore em vez de comparar a música com todas as outras,
+e várias músicas podem ser consultadas de uma vez.
+
+Músicas sem nenhuma palavra do léxico (vetor zerado) não têm perfil: ficam
+longe da esfera na árvore e nunca aparecem como vizinhas.
+
+Quando a busca é restrita a poucas músicas (``allowed``, por exemplo os filtros
+da barra lateral), a árvore traria muitos vizinhos fora da seleção; nesse caso
+a similaridade é calculada direto contra as músicas permitidas, em blocos de
+matriz ``float32``.
+
+A árvore é montada uma vez e gravada em ``dados/vizinhos.pkl``, junto com a
+versão do SciPy que a gerou; ``ensure_neighbor_index`` a refaz quando o
+dataset muda.
+
+Uso: ``python -m inferify.neighbors [songs.parquet] [saida.pkl]``
+"""
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy
+from scipy.spatial import cKDTree
+
+from inferify.dataset import DATASET_DIR, EMOTION_COLUMNS, SONGS_PARQUET, read_dataset
+
+NEIGHBORS_INDEX = DATASET_DIR / "vizinhos.pkl"
+# Muda quando o formato muda; arquivos de outra versão são refeitos
+FORMAT_VERSION = 1
+LEAF_SIZE = 32
+# Abaixo desta fração de músicas permitidas, compara direto em vez de usar a árvore
+BRUTE_FORCE_FRACTION = 1 / 64
+# Posição na árvore das músicas sem perfil: a mais de 2 de qualquer vetor unitário
+NO_PROFILE = 4.0
+# Elementos da matriz de similaridade calculados por bloco
+BLOCK_SIZE = 1 << 22
+
+
+def profile_vectors(songs, columns=EMOTION_COLUMNS):
+    """Vetores de emoção com norma 1, em ``float32``; músicas sem emoção ficam zeradas."""
+    vectors = songs[columns].to_numpy(dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class EmotionNeighbors:
+    """Vetores de perfil emocional e a árvore de busca sobre eles."""
+
+    def __init__(self, vectors, tree=None):
+        self.vectors = vectors
+        self.profiled = vectors.any(axis=1)
+        if tree is None:
+            points = np.where(self.profiled[:, None], vectors, np.float32(NO_PROFILE))
+            tree = cKDTree(points, leafsize=LEAF_SIZE, balanced_tree=False, compact_nodes=False)
+        self.tree = tree
+
+    @classmethod
+    def build(cls, songs, columns=EMOTION_COLUMNS):
+        return cls(profile_vectors(songs, columns))
+
+    def save(self, path=NEIGHBORS_INDEX):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as arquivo:
+            pickle.dump({"version": FORMAT_VERSION, "scipy": scipy.__version__,
+                         "vectors": self.vectors, "tree": self.tree}, arquivo, protocol=5)
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path=NEIGHBORS_INDEX):
+        with open(path, "rb") as arquivo:
+            saved = pickle.load(arquivo)
+        return cls(saved["vectors"], saved["tree"])
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def query(self, rows, k=10, allowed=None):
+        """Os ``k`` vizinhos mais parecidos de cada música em ``rows``, sem ela mesma.
+
+        ``allowed`` é uma máscara booleana das músicas que podem ser devolvidas.
+        Músicas sem perfil não têm vizinhos. Devolve ``(vizinhos, similaridades)``, matrizes ``len(rows) × k`` em
+        ordem decrescente de similaridade; faltando vizinhos, o restante é -1 e NaN.
+        """
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        allowed = self.profiled if allowed is None else allowed & self.profiled
+        if allowed.sum() < len(self) * BRUTE_FORCE_FRACTION:
+            neighbors = self._brute_force(rows, k, np.flatnonzero(allowed))
+        else:
+            neighbors = self._tree_query(rows, k, allowed)
+        neighbors[~self.profiled[rows]] = -1
+        similarity = np.full(neighbors.shape, np.nan, dtype=np.float32)
+        found = neighbors >= 0
+        similarity[found] = np.einsum("ij,ij->i", self.vectors[neighbors[found]],
+                                      self.vectors[np.broadcast_to(rows[:, None], neighbors.shape)[found]])
+        return neighbors, similarity
+
+    def _tree_query(self, rows, k, allowed):
+        # Busca mais vizinhos até sobrarem ``k`` válidos (fora a própria música e os não permitidos)
+        fetch = k + 1
+        while True:
+            fetch = min(fetch, len(self))
+            _, found = self.tree.query(self.vectors[rows], k=fetch)
+            found = found.reshape(len(rows), fetch)
+            valid = (found < len(self)) & (found != rows[:, None])
+            valid &= allowed[np.minimum(found, len(self) - 1)]
+            if fetch == len(self) or (valid.sum(axis=1) >= k).all():
+                break
+            fetch *= 4
+        return self._first_valid(found, valid, k)
+
+    def _brute_force(self, rows, k, candidates):
+        vectors = self.vectors[candidates]
+        neighbors = np.full((len(rows), k), -1, dtype=np.int64)
+        step = max(1, BLOCK_SIZE // max(len(candidates), 1))
+        for start in range(0, len(rows), step):
+            block = rows[start:start + step]
+            similarity = self.vectors[block] @ vectors.T
+            similarity[candidates[None, :] == block[:, None]] = -np.inf
+            top = min(k, len(candidates))
+            if top == 0:
+                continue
+            best = np.argpartition(-similarity, top - 1, axis=1)[:, :top]
+            order = np.argsort(-np.take_along_axis(similarity, best, axis=1), axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            valid = np.take_along_axis(similarity, best, axis=1) > -np.inf
+            neighbors[start:start + step, :top] = np.where(valid, candidates[best], -1)
+        return neighbors
+
+    @staticmethod
+    def _first_valid(found, valid, k):
+        # Os ``k`` primeiros válidos de cada linha, mantendo a ordem de distância
+        order = np.argsort(~valid, axis=1, kind="stable")[:, :k]
+        neighbors = np.where(np.take_along_axis(valid, order, axis=1),
+                             np.take_along_axis(found, order, axis=1), -1)
+        if neighbors.shape[1] < k:
+            neighbors = np.pad(neighbors, ((0, 0), (0, k - neighbors.shape[1])), constant_values=-1)
+        return neighbors.astype(np.int64)
+
+    def similar(self, row, k=10, allowed=None):
+        """Vizinhos de uma música: DataFrame com ``row`` e ``similarity``."""
+        neighbors, similarity = self.query([row], k, allowed)
+        found = neighbors[0] >= 0
+        return pd.DataFrame({"row": neighbors[0][found], "similarity": similarity[0][found]})
+
+
+def build_neighbor_index(source=SONGS_PARQUET, target=NEIGHBORS_INDEX):
+    """Gera o índice de vizinhos a partir do dataset colunar."""
+    return EmotionNeighbors.build(read_dataset(source)).save(target)
+
+
+def _saved_versions(path):
+    with open(path, "rb") as arquivo:
+        saved = pickle.load(arquivo)
+    return saved.get("version"), saved.get("scipy")
+
+
+def ensure_neighbor_index(source=SONGS_PARQUET, target=NEIGHBORS_INDEX):
+    """Gera o índice se ele não existir, for mais antigo que o dataset ou de outra versão."""
+    source, target = Path(source), Path(target)
+    if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+        if _saved_versions(target) == (FORMAT_VERSION, scipy.__version__):
+            return target
+    return build_neighbor_index(source, target)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else SONGS_PARQUET
+    target = sys.argv[2] if len(sys.argv) > 2 else NEIGHBORS_INDEX
+    print(f"Índice de vizinhos gerado em {build_neighbor_index(source, target)}")
@@ -0,0 +1,148 @@
+"""Normalização das emoções com estatísticas de todo o corpus.
+
+Os notebooks normalizam o ``score`` (em [-1, 1]) e as emoções (em [0, 1]) pelo
+mínimo e máximo do próprio artista, o que deixa os valores de artistas
+diferentes incomparáveis. Aqui as estatísticas são do corpus inteiro e
+incrementais: ``ScoreStats.update`` recebe só as músicas novas e mantém, para
+cada coluna, contagem, mínimo, máximo e um resumo de quantis. Normalizar é uma
+única operação vetorizada sobre os valores brutos guardados.
+"""
+import numpy as np
+import pandas as pd
+
+from inferify.dataset import EMOTION_COLUMNS
+
+# Intervalo de cada coluna normalizada, como nos notebooks
+RANGES = {"score": (-1.0, 1.0), **{col: (0.0, 1.0) for col in EMOTION_COLUMNS}}
+
+# Quantis usados como limites na normalização robusta
+ROBUST_QUANTILES = (0.01, 0.99)
+
+
+class QuantileSketch:
+    """Resumo de quantis em streaming: valores ordenados com pesos.
+
+    Valores repetidos são somados no mesmo ponto, então contagens inteiras (como
+    as das emoções) ficam exatas. Quando há mais de ``capacity`` pontos, pontos
+    vizinhos são fundidos pela média ponderada e o resumo vira aproximado.
+    """
+
+    def __init__(self, capacity=1024, values=None, weights=None):
+        self.capacity = capacity
+        self.values = np.asarray(values if values is not None else [], dtype=np.float64)
+        self.weights = np.asarray(weights if weights is not None else [], dtype=np.float64)
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values, weights=None):
+        values = np.asarray(values, dtype=np.float64)
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=np.float64)
+        values = np.concatenate([self.values, values])
+        weights = np.concatenate([self.weights, weights])
+        self.values, inverse = np.unique(values, return_inverse=True)
+        self.weights = np.bincount(inverse, weights=weights, minlength=len(self.values))
+        if len(self.values) > self.capacity:
+            self._compress()
+        return self
+
+    def merge(self, other):
+        return self.update(other.values, other.weights)
+
+    def _compress(self):
+        # Agrupa em ``capacity`` faixas de mesmo peso acumulado
+        before = np.cumsum(self.weights) - self.weights
+        groups = np.minimum((before / self.count * self.capacity).astype(np.int64), self.capacity - 1)
+        weights = np.bincount(groups, weights=self.weights)
+        sums = np.bincount(groups, weights=self.values * self.weights)
+        keep = weights > 0
+        self.values, self.weights = sums[keep] / weights[keep], weights[keep]
+
+    def quantile(self, q):
+        """Quantil(is) ``q`` em [0, 1], com a mesma interpolação linear do ``np.quantile``."""
+        if not len(self.values):
+            return np.full(np.shape(q), np.nan)
+        ends = np.cumsum(self.weights)
+        rank = np.asarray(q, dtype=np.float64) * (self.count - 1)
+        low, high = np.floor(rank), np.ceil(rank)
+        last = len(self.values) - 1
+        low_value = self.values[np.minimum(np.searchsorted(ends, low, side="right"), last)]
+        high_value = self.values[np.minimum(np.searchsorted(ends, high, side="right"), last)]
+        return low_value + (rank - low) * (high_value - low_value)
+
+    def to_dict(self):
+        return {"capacity": self.capacity, "values": self.values.tolist(), "weights": self.weights.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["capacity"], data["values"], data["weights"])
+
+
+class ScoreStats:
+    """Mínimo, máximo e quantis de cada coluna bruta em todo o corpus."""
+
+    def __init__(self, columns=tuple(RANGES)):
+        self.columns = list(columns)
+        self.count = 0
+        self.min = {col: np.inf for col in self.columns}
+        self.max = {col: -np.inf for col in self.columns}
+        self.sketches = {col: QuantileSketch() for col in self.columns}
+
+    @classmethod
+    def from_frame(cls, raw, columns=tuple(RANGES)):
+        return cls(columns).update(raw)
+
+    def update(self, raw):
+        """Inclui as linhas de ``raw`` (só as novas) nas estatísticas."""
+        if not len(raw):
+            return self
+        self.count += len(raw)
+        for col in self.columns:
+            values = raw[col].to_numpy(dtype=np.float64)
+            self.min[col] = min(self.min[col], float(values.min()))
+            self.max[col] = max(self.max[col], float(values.max()))
+            self.sketches[col].update(values)
+        return self
+
+    def quantile(self, col, q):
+        return self.sketches[col].quantile(q)
+
+    def normalize(self, raw, robust=False):
+        """Normaliza as colunas de ``raw`` pelos limites do corpus.
+
+        Com ``robust=True`` os limites são os quantis ``ROBUST_QUANTILES`` em vez
+        de mínimo e máximo, e os valores fora deles são cortados.
+        """
+        result = pd.DataFrame(index=raw.index)
+        for col in self.columns:
+            low, high = RANGES[col]
+            if robust:
+                min_value, max_value = self.quantile(col, ROBUST_QUANTILES)
+            else:
+                min_value, max_value = self.min[col], self.max[col]
+            span = max_value - min_value
+            if span > 0:
+                values = raw[col].to_numpy(dtype=np.float64)
+                result[col] = low + (high - low) * np.clip((values - min_value) / span, 0.0, 1.0)
+            else:
+                result[col] = 0.0
+        return result
+
+    def to_dict(self):
+        return {
+            "columns": self.columns,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "sketches": {col: sketch.to_dict() for col, sketch in self.sketches.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data["columns"])
+        stats.count = data["count"]
+        stats.min = {col: float(value) for col, value in data["min"].items()}
+        stats.max = {col: float(value) for col, value in data["max"].items()}
+        stats.sketches = {col: QuantileSketch.from_dict(sketch) for col, sketch in data["sketches"].items()}
+        return stats
@@ -0,0 +1,174 @@
+"""Léxico NRC compilado em binário e aberto por ``mmap``.
+
+O ``NRC.tsv`` tem uma linha por palavra × sentimento (cerca de 140 mil) e
+precisa ser relido e reagrupado a cada execução. ``compile_lexicon`` grava em
+``dados/nrc.bin`` só as palavras com alguma associação, em ordem, e uma máscara
+``uint16`` por palavra com um bit por sentimento (os dez do NRC, na ordem do
+arquivo). Formato, em little-endian::
+
+    b"NRCBIN\\0\\0"  versão (u16)  sentimentos (u16)  palavras (u32)  bytes das palavras (u32)
+    SHA-256 do TSV de origem (32 bytes)
+    nome de cada sentimento (16 bytes, completado com zeros)
+    início de cada palavra (u32 × palavras + 1)   máscaras (u16 × palavras)
+    palavras em UTF-8, concatenadas
+
+``CompiledLexicon.open`` mapeia o arquivo na memória e lê as tabelas com
+``np.frombuffer``, sem cópia: ``mask(word)`` é uma busca binária direto nos
+bytes mapeados. ``to_lexicon`` monta o ``Lexicon`` usado na pontuação com
+operações vetorizadas sobre as máscaras, sem reler o TSV.
+
+Uso: ``python -m inferify.nrc_binary [NRC.tsv] [saida.bin]``
+"""
+import hashlib
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from inferify.dataset import DATASET_DIR, EMOTION_COLUMNS
+from inferify.scoring import _NO_RANK, NRC_TSV, Lexicon
+
+LEXICON_BIN = DATASET_DIR / "nrc.bin"
+MAGIC = b"NRCBIN\0\0"
+# Muda quando o formato muda; arquivos de outra versão são recompilados
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sHHII32s")
+_NAME_SIZE = 16
+
+
+def _digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).digest()
+
+
+def _aligned(offset, size=4):
+    return -(-offset // size) * size
+
+
+def compile_lexicon(source=NRC_TSV, target=LEXICON_BIN):
+    """Compila o ``NRC.tsv`` no binário descrito no módulo."""
+    nrc = pd.read_csv(source, sep="\t", names=["word", "sentiment", "association"], keep_default_na=False)
+    sentiments = list(pd.unique(nrc["sentiment"]))
+    if len(sentiments) > 16:
+        raise ValueError(f"O NRC tem {len(sentiments)} sentimentos; a máscara comporta 16")
+    nrc = nrc[nrc["association"] == 1]
+    bits = np.left_shift(1, pd.Index(sentiments).get_indexer(nrc["sentiment"])).astype(np.uint16)
+    masks = pd.Series(bits).groupby(nrc["word"].to_numpy()).agg(np.bitwise_or.reduce)
+    # Ordem dos bytes em UTF-8, a mesma usada na busca binária
+    words = sorted(masks.index, key=lambda word: word.encode("utf-8"))
+    masks = masks.loc[words].to_numpy(np.uint16)
+    encoded = [word.encode("utf-8") for word in words]
+    offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+    np.cumsum([len(word) for word in encoded], out=offsets[1:])
+    blob = b"".join(encoded)
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(sentiments), len(words), len(blob), _digest(source))
+    names = b"".join(name.encode("ascii").ljust(_NAME_SIZE, b"\0") for name in sentiments)
+    tables = header + names
+    tables += b"\0" * (_aligned(len(tables)) - len(tables))
+    tables += offsets.astype("<u4").tobytes() + masks.astype("<u2").tobytes()
+
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_suffix(".tmp")
+    tmp_path.write_bytes(tables + blob)
+    tmp_path.replace(target)
+    return target
+
+
+def _header(path):
+    with open(path, "rb") as arquivo:
+        return _HEADER.unpack(arquivo.read(_HEADER.size))
+
+
+def ensure_compiled_lexicon(source=NRC_TSV, target=LEXICON_BIN):
+    """Compila o léxico se o binário não existir, for de outra versão ou de outro TSV."""
+    source, target = Path(source), Path(target)
+    if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+        magic, version, _, _, _, digest = _header(target)
+        if magic == MAGIC and version == FORMAT_VERSION and digest == _digest(source):
+            return target
+    return compile_lexicon(source, target)
+
+
+class CompiledLexicon:
+    """Tabelas do ``nrc.bin`` mapeadas na memória."""
+
+    def __init__(self, buffer):
+        magic, version, sentiment_count, word_count, blob_size, self.source_digest = _HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Léxico compilado inválido ou da versão {version} (esperada {FORMAT_VERSION})")
+        self.buffer = buffer
+        names = bytes(buffer[_HEADER.size:_HEADER.size + sentiment_count * _NAME_SIZE])
+        self.sentiments = [names[i:i + _NAME_SIZE].rstrip(b"\0").decode("ascii")
+                           for i in range(0, len(names), _NAME_SIZE)]
+        start = _aligned(_HEADER.size + sentiment_count * _NAME_SIZE)
+        self.offsets = np.frombuffer(buffer, dtype="<u4", count=word_count + 1, offset=start)
+        start += 4 * (word_count + 1)
+        self.masks = np.frombuffer(buffer, dtype="<u2", count=word_count, offset=start)
+        start += 2 * word_count
+        self.blob = memoryview(buffer)[start:start + blob_size]
+
+    @classmethod
+    def open(cls, path=LEXICON_BIN):
+        with open(path, "rb") as arquivo:
+            return cls(mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self):
+        return len(self.masks)
+
+    def _key(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]])
+
+    def word(self, i):
+        return self._key(i).decode("utf-8")
+
+    def mask(self, word):
+        """Máscara de sentimentos de ``word`` (0 se ela não estiver no léxico)."""
+        key = word.encode("utf-8")
+        low, high = 0, len(self.masks)
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.masks) and self._key(low) == key:
+            return int(self.masks[low])
+        return 0
+
+    def sentiments_of(self, word):
+        """Sentimentos associados a ``word``, na ordem do NRC."""
+        mask = self.mask(word)
+        return [name for bit, name in enumerate(self.sentiments) if mask >> bit & 1]
+
+    def to_lexicon(self, emotions=EMOTION_COLUMNS):
+        """``Lexicon`` igual ao ``Lexicon.from_tsv(emotions=emotions)`` do mesmo TSV."""
+        bits = np.array([self.sentiments.index(emotion) for emotion in emotions])
+        present = (self.masks[:, None] >> bits) & 1
+        keep = np.flatnonzero(present.any(axis=1))
+        present = present[keep].astype(np.int16)
+        # Ordem de cada emoção na palavra: quantas das escolhidas vêm antes dela no arquivo
+        order = np.argsort(bits, kind="stable")
+        before = np.empty_like(present)
+        before[:, order] = np.cumsum(present[:, order], axis=1) - present[:, order]
+        ranks = np.where(present > 0, before, _NO_RANK).astype(np.int16)
+
+        blob, offsets = bytes(self.blob), self.offsets.tolist()
+        words = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in keep]
+        return Lexicon.with_contractions(words, present, ranks, emotions)
+
+
+def load_lexicon(source=NRC_TSV, emotions=EMOTION_COLUMNS):
+    """``Lexicon`` a partir do binário compilado, compilando-o antes se preciso."""
+    return CompiledLexicon.open(ensure_compiled_lexicon(source)).to_lexicon(emotions)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else NRC_TSV
+    target = sys.argv[2] if len(sys.argv) > 2 else LEXICON_BIN
+    compiled = CompiledLexicon.open(compile_lexicon(source, target))
+    print(f"{len(compiled)} palavras, {len(compiled.sentiments)} sentimentos -> {target} "
+          f"({Path(target).stat().st_size / 1024:.0f} KB)")
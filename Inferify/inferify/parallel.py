@@ -0,0 +1,64 @@
+"""Execução em partes num pool de processos, para as etapas de pontuação.
+
+``map_chunks`` divide uma lista em partes contíguas, aplica ``function(state,
+parte)`` em cada uma num ``ProcessPoolExecutor`` e devolve os resultados na
+ordem das partes. O ``state`` (léxico, analisador) é somente leitura e vai para
+cada processo uma única vez, pelo inicializador do pool: com ``fork`` ele é
+herdado da memória do processo principal sem ser serializado e, nos sistemas
+sem ``fork``, é serializado uma vez por processo, nunca por tarefa.
+
+Com ``workers=1`` tudo roda no próprio processo, pelo mesmo caminho de partes;
+como cada parte é independente, o resultado é o mesmo nos dois modos.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Partes por processo: mais de uma equilibra partes com letras mais longas
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_SIZE = 256
+
+_state = None
+
+
+def default_workers():
+    """``INFERIFY_WORKERS`` ou o número de núcleos disponíveis."""
+    if os.environ.get("INFERIFY_WORKERS"):
+        return max(1, int(os.environ["INFERIFY_WORKERS"]))
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def split(items, workers, chunk_size=None):
+    """Partes contíguas de ``items``, com ``chunk_size`` itens cada."""
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK_SIZE, -(-len(items) // (workers * CHUNKS_PER_WORKER)))
+    return [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+
+
+def _initialize(state):
+    global _state
+    _state = state
+
+
+def _run(task):
+    function, chunk = task
+    return function(_state, chunk)
+
+
+def map_chunks(function, items, state=None, workers=None, chunk_size=None):
+    """``[function(state, parte) for parte in partes]``, em paralelo quando ``workers > 1``.
+
+    ``function`` precisa ser uma função de módulo (para ir aos processos pelo
+    nome) e ``items`` uma sequência fatiável.
+    """
+    workers = default_workers() if workers is None else max(1, workers)
+    chunks = split(items, workers, chunk_size)
+    if workers == 1 or len(chunks) <= 1:
+        return [function(state, chunk) for chunk in chunks]
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(min(workers, len(chunks)), mp_context=context,
+                             initializer=_initialize, initargs=(state,)) as pool:
+        return list(pool.map(_run, [(function, chunk) for chunk in chunks]))
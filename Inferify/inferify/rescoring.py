@@ -0,0 +1,221 @@
+"""Repontuação incremental quando o léxico ou as palavras indesejadas mudam.
+
+O estado da última pontuação fica salvo em ``dados/``: a letra limpa de cada
+música (antes das palavras indesejadas do artista), as contagens brutas de cada
+emoção, um índice invertido palavra → músicas e o hash de cada lista usada
+(léxico NRC, stopwords fixas e ``indesejadas`` de cada artista).
+
+Quando uma lista muda, só as músicas que contêm as palavras incluídas ou
+removidas são recontadas; as demais mantêm as contagens salvas. Mudar as
+stopwords fixas ou as marcações da limpeza exige reprocessar as letras brutas,
+ou seja, um ``python -m inferify.build`` completo.
+"""
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from inferify.cleaning import Cleaner, cleaning_fingerprint
+from inferify.dataset import DATASET_DIR, RAW_COLUMNS
+from inferify.normalization import ScoreStats
+from inferify.scoring import Lexicon, normalize
+from inferify.terms import TermIndex
+
+STATE_PARQUET = DATASET_DIR / "pontuacao.parquet"
+STATE_NPZ = DATASET_DIR / "pontuacao.npz"
+
+
+def words_fingerprint(words):
+    return hashlib.sha256("\n".join(sorted(set(words))).encode("utf-8")).hexdigest()
+
+
+class Rescorer:
+    """Contagens brutas de emoções de um corpus, atualizáveis por partes.
+
+    ``songs`` precisa das colunas ``artist``, ``title`` e ``lyrics`` (já limpas,
+    sem as palavras indesejadas aplicadas).
+    """
+
+    def __init__(self, songs, lexicon, artist_stopwords=None, index=None, counts=None, dominant=None, stats=None,
+                 workers=1):
+        self.keys = songs[["artist", "title"]].astype(str).reset_index(drop=True)
+        self.artists = self.keys["artist"].to_numpy()
+        self.texts = songs["lyrics"].fillna("").astype(str).tolist()
+        self.lexicon = lexicon
+        self.artist_stopwords = {artist: list(words) for artist, words in (artist_stopwords or {}).items()}
+        self.cleaner = Cleaner(self.artist_stopwords)
+        self.index = index if index is not None else TermIndex.build(self.texts)
+        # Processos usados nas contagens (ver ``Lexicon.count_emotions``)
+        self.workers = workers
+        if counts is None:
+            counts, dominant = lexicon.count_emotions(self.lyrics(), workers)
+        self.counts = counts
+        self.dominant = dominant
+        self.stats = stats if stats is not None else ScoreStats.from_frame(self.scores())
+
+    def __len__(self):
+        return len(self.texts)
+
+    def versions(self):
+        """Hash de cada lista usada nas contagens atuais."""
+        return {
+            "lexicon": self.lexicon.fingerprint(),
+            "cleaning": cleaning_fingerprint(),
+            "artist_stopwords": {artist: words_fingerprint(words) for artist, words in self.artist_stopwords.items()},
+        }
+
+    def lyrics(self, rows=None):
+        """Letras finais (sem as palavras indesejadas de cada artista)."""
+        rows = range(len(self)) if rows is None else rows
+        return [self.cleaner.strip(self.texts[i], self.artists[i]) for i in rows]
+
+    def affected_rows(self, lexicon=None, artist_stopwords=None):
+        """Músicas cujas contagens mudam com o novo léxico ou as novas listas."""
+        affected = np.zeros(len(self), dtype=bool)
+        if lexicon is not None and lexicon.fingerprint() != self.lexicon.fingerprint():
+            if lexicon.emotions != self.lexicon.emotions:
+                affected[:] = True
+            else:
+                affected[self.index.rows_with(self.lexicon.changed_words(lexicon))] = True
+        if artist_stopwords is not None:
+            for artist in set(self.artist_stopwords) | set(artist_stopwords):
+                old = set(self.artist_stopwords.get(artist, []))
+                new = set(artist_stopwords.get(artist, []))
+                if old != new:
+                    rows = self.index.rows_with(old ^ new)
+                    affected[rows[self.artists[rows] == artist]] = True
+        return np.flatnonzero(affected)
+
+    def update(self, lexicon=None, artist_stopwords=None):
+        """Aplica o novo léxico e/ou listas e recalcula só as músicas afetadas.
+
+        Retorna as posições das músicas recalculadas.
+        """
+        rows = self.affected_rows(lexicon, artist_stopwords)
+        if lexicon is not None:
+            if lexicon.emotions != self.lexicon.emotions:
+                self.counts = np.zeros((len(self), len(lexicon.emotions)), dtype=np.int32)
+            self.lexicon = lexicon
+        if artist_stopwords is not None:
+            self.artist_stopwords = {artist: list(words) for artist, words in artist_stopwords.items()}
+            self.cleaner = Cleaner(self.artist_stopwords)
+        if len(rows):
+            self.counts[rows], self.dominant[rows] = self.lexicon.count_emotions(self.lyrics(rows), self.workers)
+            # Valores antigos podem ter sido o mínimo ou o máximo: recalcula a partir dos brutos
+            self.stats = ScoreStats.from_frame(self.scores())
+        return rows
+
+    def add(self, songs):
+        """Inclui músicas novas, contando e indexando só elas.
+
+        Retorna as posições das músicas incluídas.
+        """
+        start = len(self)
+        keys = songs[["artist", "title"]].astype(str).reset_index(drop=True)
+        texts = songs["lyrics"].fillna("").astype(str).tolist()
+        self.keys = pd.concat([self.keys, keys], ignore_index=True)
+        self.artists = self.keys["artist"].to_numpy()
+        self.texts += texts
+
+        # Índice das músicas novas, com o vocabulário estendido pelas palavras novas
+        index = TermIndex.build(texts)
+        vocabulary = pd.Index(self.index.vocabulary)
+        positions = vocabulary.get_indexer(index.vocabulary)
+        new_words = positions < 0
+        positions[new_words] = len(vocabulary) + np.arange(new_words.sum())
+        matrix = index.matrix.copy()
+        matrix.indices = positions[matrix.indices].astype(matrix.indices.dtype)
+        width = len(vocabulary) + new_words.sum()
+        old = self.index.matrix
+        self.index = TermIndex(
+            sp.vstack([
+                sp.csr_matrix((old.data, old.indices, old.indptr), shape=(old.shape[0], width)),
+                sp.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], width)),
+            ]),
+            np.concatenate([self.index.vocabulary, index.vocabulary[new_words]]),
+        )
+
+        rows = np.arange(start, len(self))
+        counts, dominant = self.lexicon.count_emotions(self.lyrics(rows), self.workers)
+        self.counts = np.vstack([self.counts, counts])
+        self.dominant = np.concatenate([self.dominant, dominant])
+        self.stats.update(self.lexicon.frame(counts, dominant))
+        return rows
+
+    def scores(self):
+        """``score``, ``sentiment``, ``filter`` e contagens brutas de todas as músicas."""
+        return self.lexicon.frame(self.counts, self.dominant)
+
+    def apply(self, songs, per_artist=False):
+        """Atualiza letras, emoções brutas e normalizadas de ``songs``.
+
+        A normalização usa as estatísticas do corpus inteiro; com
+        ``per_artist=True`` ela é feita dentro de cada artista, como nos notebooks.
+        ``songs`` deve estar na mesma ordem usada para montar o estado.
+        """
+        if not self.matches(songs):
+            raise ValueError("As músicas não correspondem ao estado salvo; rode o build completo.")
+        songs = songs.reset_index(drop=True).copy()
+        songs["lyrics"] = self.lyrics()
+        raw = self.scores()
+        if per_artist:
+            normalized = normalize(raw.assign(artist=songs["artist"].to_numpy()), by="artist")
+        else:
+            normalized = raw.assign(**self.stats.normalize(raw))
+        for col in ["score", "sentiment", "filter"] + self.lexicon.emotions:
+            songs[col] = normalized[col].to_numpy()
+        for col, raw_col in zip(["score"] + self.lexicon.emotions, RAW_COLUMNS):
+            songs[raw_col] = raw[col].to_numpy()
+        return songs
+
+    def matches(self, songs):
+        keys = songs[["artist", "title"]].astype(str).reset_index(drop=True)
+        return keys.equals(self.keys)
+
+    def save(self, table=STATE_PARQUET, arrays=STATE_NPZ):
+        table, arrays = Path(table), Path(arrays)
+        table.parent.mkdir(parents=True, exist_ok=True)
+        frame = self.keys.assign(lyrics=self.texts, dominant=self.dominant)
+        frame[self.lexicon.emotions] = self.counts
+        tmp_path = table.with_suffix(".tmp")
+        frame.to_parquet(tmp_path, engine="pyarrow", index=False, compression="zstd")
+        tmp_path.replace(table)
+
+        matrix = self.index.matrix
+        tmp_path = arrays.with_suffix(".tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            data=matrix.data,
+            indices=matrix.indices,
+            indptr=matrix.indptr,
+            shape=np.asarray(matrix.shape),
+            vocabulary=self.index.vocabulary.astype(str),
+            lexicon_words=np.asarray(self.lexicon.index, dtype=str),
+            lexicon_counts=self.lexicon.counts,
+            lexicon_ranks=self.lexicon.ranks,
+            meta=np.asarray(json.dumps({
+                "emotions": self.lexicon.emotions,
+                "artist_stopwords": self.artist_stopwords,
+                "versions": self.versions(),
+                "stats": self.stats.to_dict(),
+            })),
+        )
+        tmp_path.replace(arrays)
+        return table, arrays
+
+    @classmethod
+    def load(cls, table=STATE_PARQUET, arrays=STATE_NPZ):
+        frame = pd.read_parquet(table, engine="pyarrow")
+        with np.load(arrays) as arquivo:
+            meta = json.loads(str(arquivo["meta"]))
+            index = TermIndex.load(arrays)
+            lexicon = Lexicon(arquivo["lexicon_words"], arquivo["lexicon_counts"], arquivo["lexicon_ranks"],
+                              meta["emotions"])
+        if meta["versions"]["cleaning"] != cleaning_fingerprint():
+            raise ValueError("As stopwords ou marcações da limpeza mudaram; rode o build completo.")
+        counts = frame[meta["emotions"]].to_numpy(dtype=np.int32)
+        return cls(frame, lexicon, meta["artist_stopwords"], index=index, counts=counts,
+                   dominant=frame["dominant"].to_numpy(dtype=np.int64), stats=ScoreStats.from_dict(meta["stats"]))
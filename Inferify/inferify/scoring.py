@@ -0,0 +1,221 @@
+"""Inferência de emoções em lote com o léxico NRC.
+
+Versão vetorizada do ``analyze_text`` dos notebooks ``Analytics_Lyric.ipynb``.
+O léxico é compilado uma vez em uma matriz palavra × 8 emoções e o corpus
+inteiro é pontuado pelo produto da matriz esparsa documento × termo com essa
+matriz. O resultado tem as mesmas colunas ``score``, ``sentiment``, ``filter``
+e uma coluna por emoção, com as mesmas regras do notebook.
+"""
+import hashlib
+import re
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from inferify.dataset import EMOTION_COLUMNS
+from inferify.parallel import map_chunks
+
+REPO_DIR = Path(__file__).resolve().parent.parent.parent
+NRC_TSV = REPO_DIR / "NRC.tsv"
+
+# Emoções positivas e negativas para o score, como nos notebooks
+POSITIVE = {"joy", "trust", "anticipation", "surprise"}
+NEGATIVE = {"anger", "fear", "disgust", "sadness"}
+
+# Nas letras já limpas (só letras e espaços) os tokens do word_tokenize são as
+# próprias palavras, exceto pelas contrações que ele separa em duas
+_TOKEN = re.compile(r"[a-z]+")
+CONTRACTIONS = {
+    "cannot": ("can", "not"),
+    "gimme": ("gim", "me"),
+    "gonna": ("gon", "na"),
+    "gotta": ("got", "ta"),
+    "lemme": ("lem", "me"),
+    "wanna": ("wan", "na"),
+}
+
+# Marca de "emoção ausente" na matriz de ordem e espaço reservado por token
+_NO_RANK = np.iinfo(np.int16).max
+_RANK_SPAN = 64
+
+
+def tokenize(text):
+    """Tokens em minúsculas, equivalentes ao ``word_tokenize`` nas letras limpas."""
+    return _TOKEN.findall(text.lower())
+
+
+class Lexicon:
+    """Léxico NRC compilado: palavra → contagem por emoção.
+
+    ``counts[i, j]`` é quantas vezes a palavra ``i`` soma na emoção
+    ``emotions[j]``; ``ranks[i, j]`` guarda a ordem em que essa emoção aparece
+    para a palavra, usada para desempatar a emoção dominante como o ``max``
+    sobre o dicionário do notebook.
+    """
+
+    def __init__(self, words, counts, ranks, emotions=EMOTION_COLUMNS):
+        self.index = pd.Index(words)
+        self.counts = counts
+        self.ranks = ranks
+        self.emotions = list(emotions)
+        self._positive = np.array([e in POSITIVE for e in self.emotions])
+        self._negative = np.array([e in NEGATIVE for e in self.emotions])
+
+    def __len__(self):
+        return len(self.index)
+
+    def fingerprint(self):
+        """Hash do léxico compilado, para saber se as pontuações estão em dia."""
+        digest = hashlib.sha256("\n".join(self.emotions).encode("utf-8"))
+        digest.update("\n".join(self.index).encode("utf-8"))
+        digest.update(np.ascontiguousarray(self.counts, dtype=np.int16).tobytes())
+        digest.update(np.ascontiguousarray(self.ranks, dtype=np.int16).tobytes())
+        return digest.hexdigest()
+
+    def _rows(self, words):
+        positions = self.index.get_indexer(words)
+        found = (positions >= 0)[:, None]
+        counts = np.where(found, self.counts[positions], 0)
+        ranks = np.where(found, self.ranks[positions], _NO_RANK)
+        return counts, ranks
+
+    def changed_words(self, other):
+        """Palavras incluídas, removidas ou com emoções diferentes em ``other``."""
+        words = self.index.union(other.index, sort=False)
+        counts, ranks = self._rows(words)
+        other_counts, other_ranks = other._rows(words)
+        changed = (counts != other_counts).any(axis=1) | (ranks != other_ranks).any(axis=1)
+        return list(words[changed])
+
+    @classmethod
+    def from_tsv(cls, path=NRC_TSV, emotions=EMOTION_COLUMNS):
+        """Compila o ``NRC.tsv`` (formato longo palavra/emoção/associação)."""
+        nrc = pd.read_csv(path, sep="\t", names=["word", "sentiment", "association"], keep_default_na=False)
+        nrc = nrc[(nrc["association"] == 1) & nrc["sentiment"].isin(emotions)]
+
+        words = pd.Index(nrc["word"].unique())
+        rows = words.get_indexer(nrc["word"])
+        cols = pd.Index(emotions).get_indexer(nrc["sentiment"])
+        counts = np.zeros((len(words), len(emotions)), dtype=np.int16)
+        ranks = np.full((len(words), len(emotions)), _NO_RANK, dtype=np.int16)
+        counts[rows, cols] = 1
+        # Ordem das emoções dentro da palavra, na ordem do arquivo
+        ranks[rows, cols] = nrc.groupby("word", sort=False).cumcount().to_numpy()
+        return cls.with_contractions(list(words), counts, ranks, emotions)
+
+    @classmethod
+    def with_contractions(cls, words, counts, ranks, emotions=EMOTION_COLUMNS):
+        """Léxico com as contrações de ``CONTRACTIONS`` somando as duas partes, nessa ordem."""
+        words = list(words)
+        position = {word: i for i, word in enumerate(words)}
+        extra_counts, extra_ranks = [], []
+        for contraction, parts in CONTRACTIONS.items():
+            found = [(k, position[part]) for k, part in enumerate(parts) if part in position]
+            if not found:
+                continue
+            row_counts = sum(counts[i] for _, i in found).astype(np.int16)
+            row_ranks = np.min([
+                np.where(ranks[i] == _NO_RANK, _NO_RANK, ranks[i] + k * len(emotions)) for k, i in found
+            ], axis=0).astype(np.int16)
+            if contraction in position:
+                counts[position[contraction]] = row_counts
+                ranks[position[contraction]] = row_ranks
+            else:
+                words.append(contraction)
+                extra_counts.append(row_counts)
+                extra_ranks.append(row_ranks)
+        if extra_counts:
+            counts = np.vstack([counts, extra_counts])
+            ranks = np.vstack([ranks, extra_ranks])
+        return cls(words, counts, ranks, emotions)
+
+    def count_emotions(self, texts, workers=1):
+        """Contagem de cada emoção por texto e índice da emoção dominante.
+
+        Retorna ``(counts, dominant)``; ``dominant`` é ``-1`` quando o texto não
+        tem nenhuma palavra do léxico. Com ``workers > 1`` (ou ``None``, um por
+        núcleo) o corpus é dividido em partes pontuadas num pool de processos.
+        """
+        if workers != 1:
+            parts = map_chunks(_count_chunk, list(texts), self, workers)
+            if not parts:
+                return np.zeros((0, len(self.emotions)), dtype=np.int32), np.zeros(0, dtype=np.int64)
+            return np.vstack([counts for counts, _ in parts]), np.concatenate([dominant for _, dominant in parts])
+        tokens = [tokenize(text) for text in texts]
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+        ids = self.index.get_indexer(list(chain.from_iterable(tokens)))
+        docs = np.repeat(np.arange(len(tokens)), lengths)
+
+        # Só os tokens presentes no léxico entram na matriz documento × termo
+        hit = ids >= 0
+        positions = np.flatnonzero(hit)
+        docs, ids = docs[hit], ids[hit]
+        doc_term = sp.csr_matrix(
+            (np.ones(len(ids), dtype=np.int32), (docs, ids)),
+            shape=(len(tokens), len(self)),
+        )
+        counts = np.asarray(doc_term @ self.counts, dtype=np.int32)
+
+        best = counts.max(axis=1, keepdims=True)
+        tied = (counts == best) & (best > 0)
+        dominant = np.where(best[:, 0] > 0, counts.argmax(axis=1), -1)
+
+        # Empate: vence a emoção que apareceu primeiro no texto
+        multi = np.flatnonzero(tied.sum(axis=1) > 1)
+        if len(multi):
+            sel = np.isin(docs, multi)
+            ranks = self.ranks[ids[sel]].astype(np.int64)
+            keys = np.where(ranks == _NO_RANK, np.iinfo(np.int64).max, positions[sel, None] * _RANK_SPAN + ranks)
+            first = np.full(counts.shape, np.iinfo(np.int64).max, dtype=np.int64)
+            np.minimum.at(first, docs[sel], keys)
+            first = np.where(tied, first, np.iinfo(np.int64).max)
+            dominant[multi] = first[multi].argmin(axis=1)
+        return counts, dominant
+
+    def score(self, texts, workers=1):
+        """Pontua um corpus inteiro de uma vez.
+
+        Retorna um DataFrame com ``score`` (positivas menos negativas),
+        ``sentiment`` (emoção dominante ou ``neutral``), ``filter`` (``intenso``
+        se ``|score| > 2``) e a contagem de cada emoção.
+        """
+        return self.frame(*self.count_emotions(texts, workers))
+
+    def frame(self, counts, dominant):
+        """Monta o DataFrame do ``score`` a partir de contagens já calculadas."""
+        score = counts[:, self._positive].sum(axis=1) - counts[:, self._negative].sum(axis=1)
+        labels = np.array(self.emotions + ["neutral"], dtype=object)
+        result = pd.DataFrame({
+            "score": score,
+            "sentiment": labels[dominant],
+            "filter": np.where(np.abs(score) > 2, "intenso", "neutro"),
+        })
+        return pd.concat([result, pd.DataFrame(counts, columns=self.emotions)], axis=1)
+
+
+def _count_chunk(lexicon, texts):
+    return lexicon.count_emotions(texts)
+
+
+def normalize(scores, by=None):
+    """Normaliza como o notebook: ``score`` em [-1, 1] e emoções em [0, 1].
+
+    A normalização é min-max dentro do próprio DataFrame, ou dentro de cada
+    grupo da coluna ``by`` (ex.: por artista, como cada notebook fazia). Se
+    todos os valores forem iguais o resultado é 0.
+    """
+    scores = scores.copy()
+    ranges = {"score": (-1.0, 1.0), **{col: (0.0, 1.0) for col in EMOTION_COLUMNS if col in scores}}
+    for col, (low, high) in ranges.items():
+        values = scores[col].astype("float64")
+        if by is None:
+            min_value, max_value = values.min(), values.max()
+        else:
+            groups = values.groupby(scores[by], observed=True, sort=False)
+            min_value, max_value = groups.transform("min"), groups.transform("max")
+        span = max_value - min_value
+        scores[col] = np.where(span != 0, low + (high - low) * (values - min_value) / np.where(span != 0, span, 1), 0.0)
+    return scores
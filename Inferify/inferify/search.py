@@ -0,0 +1,449 @@
+"""Busca nas letras por índice invertido compacto, aberto por ``mmap``.
+
+Para cada termo das letras limpas, o índice guarda a lista de músicas onde ele
+aparece, a frequência em cada uma e as posições das ocorrências. As músicas e
+as posições são gravadas como diferenças em relação à anterior (a primeira
+posição de cada música é absoluta e a primeira música de cada termo fica na
+tabela de termos), em arrays de 1, 2 ou 4 bytes conforme o
+maior valor da lista: a lista de um termo comum vira quase toda ``uint8``. A
+leitura é um ``np.frombuffer`` sobre o arquivo mapeado seguido de um
+``cumsum``, sem laço em Python e sem carregar o arquivo inteiro.
+
+Consultas (``parse_query``):
+
+- ``love baby``: músicas com todos os termos;
+- ``"broken heart"``: frase, os termos em posições seguidas;
+- ``danc*``: prefixo, qualquer termo que comece por ``danc``.
+
+O ranking é BM25. Palavras da consulta que a limpeza das letras descarta
+(stopwords, palavras curtas) e que não estão no índice são ignoradas, então
+``"i love you"`` busca ``love``. A máscara ``mask``
+de ``SearchIndex.search`` restringe a busca às músicas dos filtros da barra
+lateral antes de pontuar.
+
+Formato de ``dados/busca.idx``, em little-endian::
+
+    b"INFBUSCA"  versão (u16)  reservado (u16)  músicas (u32)  termos (u32)
+    bytes dos termos (u64)  total de palavras (u64)
+    início de cada termo (u32 × termos + 1)   palavras por música (u32 × músicas)
+    tabela de termos (``TERM_DTYPE`` × termos)
+    termos em UTF-8, concatenados em ordem
+    músicas, frequências e posições de cada termo
+
+O índice é montado em partes de ``CHUNK_SIZE`` músicas, gravadas em arquivos
+temporários e juntadas termo a termo, então a memória do build não cresce com
+o corpus inteiro.
+
+Uso: ``python -m inferify.search [songs.parquet] [saida.idx]``
+"""
+import mmap
+import re
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from inferify.cleaning import clean_lyrics
+from inferify.dataset import DATASET_DIR, SONGS_PARQUET
+from inferify.terms import tokenize
+
+SEARCH_INDEX = DATASET_DIR / "busca.idx"
+MAGIC = b"INFBUSCA"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sHHIIQQ")
+CHUNK_SIZE = 50_000
+
+# Onde começa e com quantos bytes foi gravado cada array de um termo
+TERM_DTYPE = np.dtype([
+    ("df", "<u4"), ("cf", "<u4"), ("first", "<u4"),
+    ("doc_width", "u1"), ("tf_width", "u1"), ("pos_width", "u1"), ("_pad", "V1"),
+    ("docs", "<u8"), ("tfs", "<u8"), ("positions", "<u8"),
+])
+_DTYPES = {1: np.dtype("u1"), 2: np.dtype("<u2"), 4: np.dtype("<u4")}
+
+# Parâmetros usuais do BM25
+K1 = 1.2
+B = 0.75
+# Termos considerados num prefixo (os mais frequentes)
+MAX_EXPANSIONS = 64
+
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def _aligned(offset, size=8):
+    return -(-offset // size) * size
+
+
+def _width(values):
+    peak = int(values.max()) if len(values) else 0
+    return 1 if peak < 1 << 8 else 2 if peak < 1 << 16 else 4
+
+
+def _common(a, b, size=None):
+    """Posições em ``a`` e em ``b`` dos valores presentes nas duas listas (ordenadas, sem repetição).
+
+    Sem a ordenação do ``np.intersect1d``: se os valores estão em ``range(size)``
+    e as listas são densas, marca ``b`` num array desse tamanho; senão, faz a
+    busca binária da lista menor na maior.
+    """
+    if len(a) > len(b):
+        theirs, mine = _common(b, a, size)
+        return mine, theirs
+    if not len(a):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    if size is not None and len(a) * 16 > size:
+        where = np.full(size, -1, dtype=np.int64)
+        where[b] = np.arange(len(b))
+        found = where[a]
+        mine = np.flatnonzero(found >= 0)
+        return mine, found[mine]
+    found = np.minimum(np.searchsorted(b, a), len(b) - 1)
+    mine = np.flatnonzero(b[found] == a)
+    return mine, found[mine]
+
+
+def _tokens(texts, vocabulary):
+    """Ids dos termos, música (na parte) e posição de cada palavra de ``texts``."""
+    ids, lengths = [], []
+    for text in texts:
+        words = tokenize(text or "")
+        ids.extend(vocabulary.setdefault(word, len(vocabulary)) for word in words)
+        lengths.append(len(words))
+    lengths = np.asarray(lengths, dtype=np.int64)
+    docs = np.repeat(np.arange(len(lengths)), lengths)
+    positions = np.arange(len(docs)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.asarray(ids, dtype=np.int32), docs, positions, lengths
+
+
+def write_index(chunks, target=SEARCH_INDEX):
+    """Grava o índice das letras em ``chunks`` (listas de letras, na ordem das músicas)."""
+    vocabulary, parts, lengths, start = {}, [], [], 0
+    with tempfile.TemporaryDirectory() as workdir:
+        for number, texts in enumerate(chunks):
+            ids, docs, positions, chunk_lengths = _tokens(texts, vocabulary)
+            # Ordem estável: por termo, e dentro do termo por música e posição
+            order = np.argsort(ids, kind="stable")
+            part = Path(workdir) / f"parte{number}"
+            np.save(f"{part}_ids.npy", ids[order])
+            np.save(f"{part}_docs.npy", (docs[order] + start).astype(np.uint32))
+            np.save(f"{part}_positions.npy", positions[order].astype(np.uint32))
+            parts.append(part)
+            lengths.append(chunk_lengths.astype(np.uint32))
+            start += len(chunk_lengths)
+        lengths = np.concatenate(lengths) if lengths else np.zeros(0, dtype=np.uint32)
+        return _merge(parts, vocabulary, lengths, Path(target))
+
+
+def _merge(parts, vocabulary, lengths, target):
+    # Termos em ordem dos bytes em UTF-8, a mesma usada na busca binária
+    words = sorted(vocabulary, key=lambda word: word.encode("utf-8"))
+    encoded = [word.encode("utf-8") for word in words]
+    offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+    np.cumsum([len(word) for word in encoded], out=offsets[1:])
+    blob = b"".join(encoded)
+
+    term_table = _aligned(_HEADER.size + offsets.nbytes + lengths.nbytes)
+    data_start = _aligned(term_table + TERM_DTYPE.itemsize * len(words) + len(blob))
+    terms = np.zeros(len(words), dtype=TERM_DTYPE)
+
+    runs = []
+    for part in parts:
+        ids = np.load(f"{part}_ids.npy", mmap_mode="r")
+        bounds = np.searchsorted(ids, np.arange(len(vocabulary) + 1))
+        runs.append((bounds, np.load(f"{part}_docs.npy", mmap_mode="r"),
+                     np.load(f"{part}_positions.npy", mmap_mode="r")))
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_suffix(".tmp")
+    with open(tmp_path, "wb") as arquivo:
+        arquivo.write(b"\0" * data_start)
+        position = data_start
+
+        def write(values, width):
+            nonlocal position
+            padding = _aligned(position, width) - position
+            arquivo.write(b"\0" * padding)
+            offset = position + padding
+            arquivo.write(values.astype(_DTYPES[width]).tobytes())
+            position = offset + len(values) * width
+            return offset
+
+        for entry, word in zip(terms, words):
+            term = vocabulary[word]
+            docs = np.concatenate([run_docs[bounds[term]:bounds[term + 1]] for bounds, run_docs, _ in runs])
+            positions = np.concatenate([run_pos[bounds[term]:bounds[term + 1]] for bounds, _, run_pos in runs])
+            docs, positions = docs.astype(np.int64), positions.astype(np.int64)
+            starts = np.flatnonzero(np.diff(docs, prepend=-1))
+            tfs = np.diff(starts, append=len(docs))
+            doc_deltas = np.diff(docs[starts], prepend=docs[0])
+            pos_deltas = np.diff(positions, prepend=0)
+            pos_deltas[starts] = positions[starts]
+            widths = _width(doc_deltas), _width(tfs), _width(pos_deltas)
+            entry["df"], entry["cf"], entry["first"] = len(starts), len(docs), docs[0]
+            entry["doc_width"], entry["tf_width"], entry["pos_width"] = widths
+            entry["docs"] = write(doc_deltas, widths[0])
+            entry["tfs"] = write(tfs, widths[1])
+            entry["positions"] = write(pos_deltas, widths[2])
+
+        arquivo.seek(0)
+        arquivo.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(lengths), len(words), len(blob),
+                                   int(lengths.sum(dtype=np.uint64))))
+        arquivo.write(offsets.astype("<u4").tobytes())
+        arquivo.write(lengths.astype("<u4").tobytes())
+        arquivo.seek(term_table)
+        arquivo.write(terms.tobytes())
+        arquivo.write(blob)
+    tmp_path.replace(target)
+    return target
+
+
+def build_search_index(source=SONGS_PARQUET, target=SEARCH_INDEX, chunk_size=CHUNK_SIZE):
+    """Gera o índice de busca a partir das letras do dataset colunar."""
+    batches = pq.ParquetFile(source).iter_batches(batch_size=chunk_size, columns=["lyrics"])
+    return write_index((batch.column(0).to_pylist() for batch in batches), target)
+
+
+def _header(path):
+    with open(path, "rb") as arquivo:
+        return _HEADER.unpack(arquivo.read(_HEADER.size))
+
+
+def ensure_search_index(source=SONGS_PARQUET, target=SEARCH_INDEX):
+    """Gera o índice apenas se ele não existir, for mais antigo que o dataset ou de outra versão."""
+    source, target = Path(source), Path(target)
+    if target.exists() and target.stat().st_mtime >= source.stat().st_mtime:
+        magic, version = _header(target)[:2]
+        if magic == MAGIC and version == FORMAT_VERSION:
+            return target
+    return build_search_index(source, target)
+
+
+def parse_query(text):
+    """Cláusulas ``(tipo, palavras)`` da consulta: ``term``, ``phrase`` ou ``prefix``."""
+    clauses = []
+    for phrase, word in _QUERY.findall(text):
+        words = tokenize(phrase or word)
+        if not phrase and word.endswith("*") and words:
+            clauses.append(("prefix", words[:1]))
+        elif phrase and len(words) > 1:
+            clauses.append(("phrase", words))
+        else:
+            clauses.extend(("term", [w]) for w in words)
+    return clauses
+
+
+class Hits(NamedTuple):
+    """Resultado de uma busca: posições das músicas (linhas do dataset), scores e total encontrado."""
+
+    rows: np.ndarray
+    scores: np.ndarray
+    total: int
+
+
+class SearchIndex:
+    """Índice de busca mapeado na memória."""
+
+    def __init__(self, buffer):
+        magic, version, _, doc_count, term_count, blob_size, total = _HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Índice de busca inválido ou da versão {version} (esperada {FORMAT_VERSION})")
+        self.buffer = buffer
+        start = _HEADER.size
+        self.offsets = np.frombuffer(buffer, dtype="<u4", count=term_count + 1, offset=start)
+        start += self.offsets.nbytes
+        self.lengths = np.frombuffer(buffer, dtype="<u4", count=doc_count, offset=start)
+        start = _aligned(start + self.lengths.nbytes)
+        self.terms = np.frombuffer(buffer, dtype=TERM_DTYPE, count=term_count, offset=start)
+        start += self.terms.nbytes
+        self.blob = memoryview(buffer)[start:start + blob_size]
+        self.avg_length = total / doc_count if doc_count else 0.0
+
+    @classmethod
+    def open(cls, path=SEARCH_INDEX):
+        with open(path, "rb") as arquivo:
+            return cls(mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def _key(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]])
+
+    def word(self, i):
+        return self._key(i).decode("utf-8")
+
+    def _lower_bound(self, key):
+        low, high = 0, len(self.terms)
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def lookup(self, word):
+        """Posição de ``word`` no vocabulário (-1 se ela não estiver no índice)."""
+        key = word.encode("utf-8")
+        i = self._lower_bound(key)
+        return i if i < len(self.terms) and self._key(i) == key else -1
+
+    def prefix(self, prefix):
+        """Posições dos termos que começam por ``prefix`` (uma faixa contígua)."""
+        key = prefix.encode("utf-8")
+        # Nenhum byte de UTF-8 é 0xff: a faixa termina antes de ``prefix + b"\xff"``
+        return range(self._lower_bound(key), self._lower_bound(key + b"\xff"))
+
+    def _array(self, offset, count, width):
+        return np.frombuffer(self.buffer, dtype=_DTYPES[width], count=int(count), offset=int(offset))
+
+    def postings(self, term):
+        """Músicas (em ordem) e frequência de ``term`` em cada uma."""
+        entry = self.terms[term]
+        docs = np.cumsum(self._array(entry["docs"], entry["df"], entry["doc_width"]), dtype=np.int64)
+        docs += int(entry["first"])
+        return docs, self._array(entry["tfs"], entry["df"], entry["tf_width"]).astype(np.int64)
+
+    def positions(self, term, tfs, which):
+        """Posições de ``term`` nas músicas ``which`` (índices em ``postings(term)``).
+
+        Devolve ``(música, posição)``, com a música como índice em ``which``.
+        """
+        entry = self.terms[term]
+        deltas = self._array(entry["positions"], entry["cf"], entry["pos_width"])
+        counts = tfs[which]
+        if len(which) < len(tfs):
+            keep = np.zeros(len(tfs), dtype=bool)
+            keep[which] = True
+            deltas = deltas[np.repeat(keep, tfs)]
+        rank = np.repeat(np.arange(len(which)), counts)
+        # Soma acumulada por música: desconta o acumulado antes do início de cada uma
+        summed = np.cumsum(deltas, dtype=np.int64)
+        first = np.cumsum(counts) - counts
+        base = summed[first] - deltas[first]
+        return rank, summed - base[rank]
+
+    def _bm25(self, term, docs, tfs):
+        df = int(self.terms[term]["df"])
+        idf = np.log1p((len(self) - df + 0.5) / (df + 0.5))
+        norm = K1 * (1 - B + B * self.lengths[docs] / self.avg_length)
+        return idf * tfs * (K1 + 1) / (tfs + norm)
+
+    def _term(self, term, mask):
+        docs, tfs = self.postings(term)
+        if mask is not None:
+            keep = mask[docs]
+            docs, tfs = docs[keep], tfs[keep]
+        return docs, self._bm25(term, docs, tfs)
+
+    def _prefix(self, prefix, mask):
+        found = self.prefix(prefix)
+        terms = np.arange(found.start, found.stop)
+        if len(terms) > MAX_EXPANSIONS:
+            df = self.terms["df"][terms]
+            terms = terms[np.argpartition(-df.astype(np.int64), MAX_EXPANSIONS - 1)[:MAX_EXPANSIONS]]
+        matches = [self._term(term, mask) for term in terms]
+        if not matches:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        docs, inverse = np.unique(np.concatenate([docs for docs, _ in matches]), return_inverse=True)
+        return docs, np.bincount(inverse, weights=np.concatenate([scores for _, scores in matches]))
+
+    def _phrase(self, words, mask):
+        terms = [self.lookup(word) for word in words]
+        if min(terms) < 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        postings = {term: self.postings(term) for term in set(terms)}
+        candidates = None
+        for docs, _ in postings.values():
+            candidates = docs if candidates is None else candidates[_common(candidates, docs, len(self))[0]]
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        # Chave (música, início da frase), presente para todos os termos da frase.
+        # As chaves de cada termo já saem ordenadas, então a interseção é uma
+        # busca binária, e as músicas que ficam sem chave não são mais lidas.
+        keys = None
+        for offset, term in sorted(enumerate(terms), key=lambda item: self.terms[item[1]]["cf"]):
+            docs, tfs = postings[term]
+            if keys is not None:
+                # As músicas das chaves já estão em ordem: renumera sem ordenar
+                ranks = keys >> 32
+                new = np.diff(ranks, prepend=-1) != 0
+                candidates = candidates[ranks[new]]
+                keys = (np.cumsum(new) - 1) << 32 | (keys & 0xFFFFFFFF)
+            rank, position = self.positions(term, tfs, _common(docs, candidates, len(self))[0])
+            term_keys = rank << 32 | (position - offset + len(terms))
+            keys = term_keys if keys is None else keys[_common(keys, term_keys)[0]]
+            if not len(keys):
+                break
+        ranks = keys >> 32
+        found = candidates[ranks[np.diff(ranks, prepend=-1) != 0]]
+        scores = np.zeros(len(found))
+        for term, (docs, tfs) in postings.items():
+            scores += self._bm25(term, found, tfs[_common(docs, found, len(self))[0]])
+        return found, scores
+
+    def normalize(self, clauses):
+        """Remove as palavras que a limpeza das letras descartaria e que não estão no índice."""
+        normalized = []
+        for kind, words in clauses:
+            if kind != "prefix":
+                words = [word for word in words if self.lookup(word) >= 0 or clean_lyrics(word)[0]]
+                if not words:
+                    continue
+                kind = "phrase" if len(words) > 1 else "term"
+            normalized.append((kind, words))
+        return normalized
+
+    def search(self, query, mask=None, limit=20):
+        """Músicas que atendem a todas as cláusulas de ``query``, das mais relevantes às menos.
+
+        ``mask`` é uma máscara booleana com uma posição por música (``None`` = todas).
+        """
+        clauses = self.normalize(parse_query(query) if isinstance(query, str) else query)
+        if not clauses:
+            return Hits(np.zeros(0, dtype=np.int64), np.zeros(0), 0)
+        matches = []
+        for kind, words in clauses:
+            if kind == "phrase":
+                matches.append(self._phrase(words, mask))
+            elif kind == "prefix":
+                matches.append(self._prefix(words[0], mask))
+            else:
+                term = self.lookup(words[0])
+                matches.append(self._term(term, mask) if term >= 0 else (np.zeros(0, dtype=np.int64), np.zeros(0)))
+        # Interseção a partir da lista mais curta
+        matches.sort(key=lambda match: len(match[0]))
+        docs, scores = matches[0]
+        for other_docs, other_scores in matches[1:]:
+            mine, theirs = _common(docs, other_docs, len(self))
+            docs, scores = docs[mine], scores[mine] + other_scores[theirs]
+        if len(docs) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(docs))
+        # Empates ficam na ordem do dataset
+        top = top[np.lexsort((docs[top], -scores[top]))]
+        return Hits(docs[top], scores[top], len(docs))
+
+
+def snippet(text, clauses, width=80):
+    """Trecho de ``text`` em volta da primeira ocorrência de alguma palavra das cláusulas."""
+    words = [re.escape(word) + (r"\w*" if kind == "prefix" else "") for kind, words in clauses for word in words]
+    found = re.search(r"\b(?:" + "|".join(words) + r")\b", text) if words else None
+    if found is None:
+        return text[:width] + ("…" if len(text) > width else "")
+    start = max(0, found.start() - width // 2)
+    stop = min(len(text), found.end() + width // 2)
+    return ("…" if start else "") + text[start:stop] + ("…" if stop < len(text) else "")
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else SONGS_PARQUET
+    target = sys.argv[2] if len(sys.argv) > 2 else SEARCH_INDEX
+    index = SearchIndex.open(build_search_index(source, target))
+    print(f"{len(index)} músicas, {len(index.terms)} termos -> {target} "
+          f"({Path(target).stat().st_size / 1024:.0f} KB)")
@@ -0,0 +1,112 @@
+"""Barra lateral compartilhada e cache de resultados por estado dos filtros.
+
+Todas as páginas mostram os mesmos filtros (anos, artistas, álbuns e gêneros).
+``render_sidebar`` desenha esses controles e devolve um ``FilterState``
+canônico: anos como inteiros e seleções ordenadas e sem repetição, então a
+mesma escolha feita em outra ordem, em outra página ou por outro usuário vira a
+mesma chave.
+
+Com essa chave, o DataFrame filtrado, as métricas e os gráficos Plotly ficam
+no cache LRU de ``load_result_cache``, compartilhado entre páginas e sessões.
+Trocar de página ou repetir uma visão comum, como a seleção padrão, não refaz
+filtragem, agregações nem gráficos. A chave também leva a ``dataset_version``,
+então resultados de um dataset anterior não são reaproveitados depois que ele
+é gerado de novo.
+"""
+from typing import NamedTuple
+
+import streamlit as st
+
+from inferify.data import dataset_version, load_result_cache, load_song_filter, load_songs
+
+
+class FilterState(NamedTuple):
+    years: tuple
+    artists: tuple
+    albums: tuple
+    genres: tuple
+
+    @classmethod
+    def canonical(cls, years, artists, albums, genres):
+        return cls(
+            (int(years[0]), int(years[1])),
+            tuple(sorted(set(artists))),
+            tuple(sorted(set(albums))),
+            tuple(sorted(set(genres))),
+        )
+
+
+def render_sidebar():
+    """Desenha os filtros da barra lateral e devolve o estado escolhido."""
+    filtro = load_song_filter()
+
+    st.sidebar.header("🔍 Filtros")
+
+    # --- Filtro de Ano (com Slider mais bonito) ---
+    anos_disponiveis = filtro.columns["release_year"].values
+    ano_min, ano_max = int(anos_disponiveis.min()), int(anos_disponiveis.max())
+
+    anos_selecionados = st.sidebar.slider(
+        "Intervalo de Anos",
+        min_value=ano_min,
+        max_value=ano_max,
+        value=(ano_min, ano_max),
+        step=1
+    )
+
+    # --- Filtro de Artista ---
+    artista_disponiveis = list(filtro.columns["artist"].values)
+    artista_selecionadas = st.sidebar.multiselect(
+        "Selecione Artista(s) ou Banda(s)",
+        options=artista_disponiveis,
+        default=artista_disponiveis[:5],  # mostra só alguns como padrão
+        help="Pesquise pelo nome do artista ou banda"
+    )
+
+    # --- Filtro de Álbum ---
+    album_disponiveis = list(filtro.columns["Album"].values)
+    album_selecionados = st.sidebar.multiselect(
+        "Selecione Álbum(s)",
+        options=album_disponiveis,
+        default=album_disponiveis[:5],
+        help="Pesquise pelo nome do álbum"
+    )
+
+    # --- Filtro de Gênero ---
+    genero = sorted(str(value) for value in filtro.columns["genre"].values)
+    genero_um = st.sidebar.multiselect(
+        "Selecione Gênero(s) Musicais",
+        options=genero,
+        default=genero[:5],
+        help="Pesquise ou selecione múltiplos gêneros"
+    )
+
+    return FilterState.canonical(anos_selecionados, artista_selecionadas, album_selecionados, genero_um)
+
+
+def cached(name, state, compute):
+    """Resultado de ``compute()`` guardado por versão do dataset, nome e estado dos filtros.
+
+    O valor é compartilhado entre sessões: quem o recebe não deve alterá-lo.
+    """
+    return load_result_cache().get_or_compute((dataset_version(), name, state), compute)
+
+
+def filtered_songs(state, lyrics=False):
+    """Músicas que passam nos filtros de ``state`` (somente leitura)."""
+    version = dataset_version()
+
+    def compute():
+        # Filtro e músicas da mesma versão, para as posições baterem
+        filtro = load_song_filter(version)
+        return load_songs(lyrics=lyrics, version=version).iloc[filtro.rows(filtro.select(*state))]
+    return load_result_cache().get_or_compute((version, ("songs", lyrics), state), compute)
+
+
+def cached_figure(name, state, build):
+    """Figura Plotly de ``build()``, pronta para o ``st.plotly_chart``.
+
+    A figura é guardada já validada: refazê-la a partir do JSON passaria de novo
+    pela validação do Plotly, que converte os textos numéricos das barras.
+    """
+    return cached(("figure", name), state, build)
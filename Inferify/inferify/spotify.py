@@ -0,0 +1,218 @@
+"""Coleta em lote da popularidade dos artistas na API do Spotify.
+
+Substitui o ``Popularidade/Coleta_Spotify.ipynb``, que chamava
+``sp.artist(artist_id)`` uma vez por artista e juntava um DataFrame de uma
+linha por chamada. Aqui os IDs são agrupados de ``BATCH_SIZE`` em
+``BATCH_SIZE`` no endpoint ``/artists?ids=...``, os lotes rodam em paralelo
+respeitando um limite de requisições por segundo, com novas tentativas e espera
+exponencial em erros 429/5xx, e o ``artistas_popularidade.csv`` é montado de
+uma vez a partir das colunas. Mil artistas custam 20 requisições. Cada coleta
+também é acrescentada ao histórico de ``inferify.history``.
+
+A coleta é juntada ao CSV que já existe em ``--output``: os artistas coletados
+têm popularidade, seguidores e imagem atualizados, os que não foram coletados
+continuam como estavam, e ``tipo`` e ``pais`` de cada artista já conhecido são
+mantidos.
+
+Uso (dentro da pasta ``Inferify``)::
+
+    SPOTIPY_CLIENT_ID=... SPOTIPY_CLIENT_SECRET=... python -m inferify.spotify --output artistas_popularidade.csv
+
+Para testar sem credenciais e sem rede, ver ``inferify.spotify_mock``.
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from inferify.dataset import APP_DIR
+from inferify.genius import RETRY_STATUS, RateLimiter, retry_delay
+from inferify.history import HISTORY_DIR, append_snapshot
+
+API_URL = "https://api.spotify.com/v1"
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+# Máximo de IDs aceitos por ``GET /artists``
+BATCH_SIZE = 50
+
+# IDs coletados no notebook original
+ARTIST_IDS = [
+    "5pKCCKE2ajJHZ9KAiaK11H", "5yG7ZAZafVaAlMTeBybKAL", "0hCNtLu0JehylgoiP8L4Gh",
+    "5Rl15oVamLq7FbSb0NNBNy", "20JZFwl6HVl6yg8a4H3ZqK", "74XFHRwlV6OrjEM0A2NCMF",
+    "0p4nmQO2msCgU4IF37Wi3j", "1Xylc3o4UrD53lo9CvFvVg", "4NHQUGzhtTLFvgF5SZesLK",
+    "738wLrAtLtCtFOLvQBXOXp", "41MozSoPIsD1dJM0CLPjZF", "3c0gDdb9lhnHGFtP4prQpn",
+    "3Nrfpe0tUJi4K4DXYWgMUX", "1Xyo4u8uXC1ZmMpatF05PJ", "1uNFoZAHBGtllmzznpCI3s",
+    "6vWDO969PvNqNYHIOW5v0m", "5eAWCfyUhZtHHtBdNk56l1",
+]
+# O Spotify classifica tudo como "artist"; estes nomes são bandas no painel
+BANDS = [
+    "Fifth Harmony", "Little Mix", "One Direction", "5 Seconds of Summer", "Panic! At The Disco", "Paramore", "Major Lazer",
+    "BLACKPINK", "KATSEYE", "BTS", "System Of A Down",
+]
+POPULARITY_COLUMNS = ["nome", "popularidade", "seguidores", "imagem_principal", "tipo", "pais"]
+
+
+def batches(ids, size=BATCH_SIZE):
+    """IDs sem repetição, em listas de até ``size``."""
+    ids = list(dict.fromkeys(ids))
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+
+class SpotifyClient:
+    """Cliente da API do Spotify (fluxo client credentials) com limite de taxa e novas tentativas.
+
+    ``api_url`` e ``token_url`` podem apontar para o ``inferify.spotify_mock``.
+    """
+
+    def __init__(self, client_id=None, client_secret=None, api_url=API_URL, token_url=TOKEN_URL,
+                 rate=5.0, max_workers=4, max_retries=5, backoff=0.5, timeout=15):
+        self.client_id = client_id or os.environ.get("SPOTIPY_CLIENT_ID", "")
+        self.client_secret = client_secret or os.environ.get("SPOTIPY_CLIENT_SECRET", "")
+        self.api_url = api_url.rstrip("/")
+        self.token_url = token_url
+        self.limiter = RateLimiter(rate)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.network_requests = 0
+        self._token = None
+        self._token_expires = 0.0
+        self._lock = threading.Lock()
+
+    def _open(self, request):
+        """Corpo da resposta, com novas tentativas em 429/5xx e falhas de conexão."""
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            with self._lock:
+                self.network_requests += 1
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return response.read()
+            except urllib.error.HTTPError as erro:
+                if erro.code not in RETRY_STATUS or attempt == self.max_retries:
+                    raise
+                delay = retry_delay(erro.headers, self.backoff * 2 ** attempt)
+            except (urllib.error.URLError, TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+            time.sleep(delay * (1 + random.random() / 2))
+
+    def token(self, refresh=False):
+        """Token de acesso, renovado um minuto antes de expirar."""
+        with self._lock:
+            if self._token and not refresh and time.monotonic() < self._token_expires:
+                return self._token
+        credentials = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
+        request = urllib.request.Request(
+            self.token_url, data=b"grant_type=client_credentials",
+            headers={"Authorization": f"Basic {credentials}",
+                     "Content-Type": "application/x-www-form-urlencoded"},
+        )
+        body = json.loads(self._open(request))
+        with self._lock:
+            self._token = body["access_token"]
+            self._token_expires = time.monotonic() + body.get("expires_in", 3600) - 60
+            return self._token
+
+    def api(self, path, **params):
+        query = f"?{urllib.parse.urlencode(params)}" if params else ""
+        url = f"{self.api_url}{path}{query}"
+        for refresh in (False, True):
+            request = urllib.request.Request(url, headers={"Authorization": f"Bearer {self.token(refresh)}"})
+            try:
+                return json.loads(self._open(request))
+            except urllib.error.HTTPError as erro:
+                # Token expirado: pede outro uma vez
+                if erro.code != 401 or refresh:
+                    raise
+
+    def artists(self, ids):
+        """Dados completos dos artistas em ``ids``; IDs desconhecidos são ignorados."""
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            responses = pool.map(lambda batch: self.api("/artists", ids=",".join(batch))["artists"], batches(ids))
+            return [artist for response in responses for artist in response if artist]
+
+
+def popularity_frame(artists, bands=BANDS, countries=None, types=None):
+    """DataFrame no formato do ``artistas_popularidade.csv``, montado a partir das colunas.
+
+    ``countries`` (nome -> país) preenche a coluna ``pais``, que não vem da API, e
+    ``types`` (nome -> tipo) mantém o ``tipo`` já conhecido de cada artista.
+    """
+    countries = countries or {}
+    types = types or {}
+    bands = set(bands)
+    names = [artist["name"] for artist in artists]
+    return pd.DataFrame({
+        "nome": names,
+        "popularidade": [artist["popularity"] for artist in artists],
+        "seguidores": [artist["followers"]["total"] for artist in artists],
+        "imagem_principal": [artist["images"][0]["url"] if artist["images"] else None for artist in artists],
+        "tipo": [types.get(name, "band" if name in bands else artist["type"])
+                 for name, artist in zip(names, artists)],
+        "pais": [countries.get(name) for name in names],
+    }, columns=POPULARITY_COLUMNS)
+
+
+def read_previous(path):
+    """O ``artistas_popularidade.csv`` anterior, ou um DataFrame vazio se não existir."""
+    if not Path(path).exists():
+        return pd.DataFrame(columns=POPULARITY_COLUMNS)
+    return pd.read_csv(path)
+
+
+def known(previous, column):
+    """Valores de ``column`` por nome de artista no CSV anterior, sem os vazios."""
+    values = previous[["nome", column]].dropna()
+    return dict(zip(values["nome"], values[column]))
+
+
+def merge_popularity(frame, previous):
+    """Coleta nova sobre o CSV anterior, na ordem dele; artistas novos vão para o fim."""
+    kept = previous[~previous["nome"].isin(frame["nome"])]
+    order = list(dict.fromkeys([*previous["nome"], *frame["nome"]]))
+    merged = pd.concat([kept, frame], ignore_index=True).set_index("nome").loc[order].reset_index()
+    return merged[POPULARITY_COLUMNS]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Coleta popularidade e seguidores de artistas no Spotify.")
+    parser.add_argument("ids", nargs="*", help="IDs de artistas (padrão: os do notebook)")
+    parser.add_argument("--ids-file", type=Path, help="arquivo com um ID por linha")
+    parser.add_argument("--output", type=Path, default=APP_DIR / "artistas_popularidade.csv")
+    parser.add_argument("--api-url", default=API_URL, help="URL da API (ex.: servidor local de testes)")
+    parser.add_argument("--token-url", default=TOKEN_URL)
+    parser.add_argument("--rate", type=float, default=5.0, help="requisições por segundo")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--history-dir", type=Path, default=HISTORY_DIR, help="histórico de coletas")
+    parser.add_argument("--no-history", action="store_true", help="não acrescenta a coleta ao histórico")
+    args = parser.parse_args(argv)
+
+    ids = list(args.ids)
+    if args.ids_file:
+        ids += [line.strip() for line in args.ids_file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    client = SpotifyClient(api_url=args.api_url, token_url=args.token_url, rate=args.rate, max_workers=args.workers)
+    start = time.perf_counter()
+    previous = read_previous(args.output)
+    frame = popularity_frame(client.artists(ids or ARTIST_IDS),
+                             countries=known(previous, "pais"), types=known(previous, "tipo"))
+    merge_popularity(frame, previous).to_csv(args.output, index=False)
+    print(f"{len(frame)} artistas coletados, {len(previous)} no CSV anterior -> {args.output}")
+    if not args.no_history:
+        print(f"{append_snapshot(frame, directory=args.history_dir)} coletas acrescentadas ao histórico")
+    print(f"{client.network_requests} requisições de rede em {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
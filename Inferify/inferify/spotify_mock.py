@@ -0,0 +1,126 @@
+"""Servidor local que imita os endpoints do Spotify usados pelo ``inferify.spotify``.
+
+Responde ``POST /api/token`` (client credentials) e ``GET /v1/artists?ids=...``
+com artistas gerados de forma determinística a partir de cada ID. Como a API
+real, recusa lotes com mais de 50 IDs e devolve ``null`` para IDs desconhecidos
+(aqui, os que começam com ``0000``). ``--fail-every N`` responde 429 a cada N
+requisições e ``--error-every N`` responde 503, para exercitar as novas
+tentativas.
+
+Uso (dentro da pasta ``Inferify``)::
+
+    python -m inferify.spotify_mock --port 8766
+    python -m inferify.spotify --api-url http://127.0.0.1:8766/v1 \\
+        --token-url http://127.0.0.1:8766/api/token --output /tmp/popularidade.csv
+"""
+import argparse
+import hashlib
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from inferify.spotify import BATCH_SIZE
+
+
+class SpotifyMock:
+    """Artistas sintéticos por ID e contadores de requisições."""
+
+    def __init__(self, names=None):
+        self.names = names or {}
+        self.requests = 0
+        self.batches = 0
+        self.lock = threading.Lock()
+
+    def artist(self, artist_id):
+        if artist_id.startswith("0000"):
+            return None
+        seed = int.from_bytes(hashlib.sha256(artist_id.encode()).digest()[:8], "little")
+        return {
+            "id": artist_id,
+            "name": self.names.get(artist_id, f"Artista {artist_id[:8]}"),
+            "popularity": seed % 101,
+            "followers": {"href": None, "total": seed % 50_000_000},
+            "genres": [],
+            "images": [{"url": f"https://i.scdn.co/image/{artist_id}", "height": 640, "width": 640}],
+            "type": "artist",
+            "uri": f"spotify:artist:{artist_id}",
+            "external_urls": {"spotify": f"https://open.spotify.com/artist/{artist_id}"},
+        }
+
+
+def make_handler(mock, fail_every=0, error_every=0):
+    class Handler(BaseHTTPRequestHandler):
+        def _count(self):
+            with mock.lock:
+                mock.requests += 1
+                count = mock.requests
+            if fail_every and count % fail_every == 0:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return False
+            if error_every and count % error_every == 0:
+                self.send_error(503)
+                return False
+            return True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if not self._count():
+                return
+            if self.path != "/api/token" or not self.headers.get("Authorization", "").startswith("Basic "):
+                return self.send_error(400)
+            self._send({"access_token": "mock-token", "token_type": "Bearer", "expires_in": 3600})
+
+        def do_GET(self):
+            if not self._count():
+                return
+            if self.headers.get("Authorization") != "Bearer mock-token":
+                return self.send_error(401)
+            url = urllib.parse.urlsplit(self.path)
+            if url.path != "/v1/artists":
+                return self.send_error(404)
+            ids = [i for i in dict(urllib.parse.parse_qsl(url.query)).get("ids", "").split(",") if i]
+            if not ids or len(ids) > BATCH_SIZE:
+                return self.send_error(400)
+            with mock.lock:
+                mock.batches += 1
+            self._send({"artists": [mock.artist(artist_id) for artist_id in ids]})
+
+        def _send(self, body):
+            content = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(port=8766, names=None, fail_every=0, error_every=0):
+    """Cria o servidor (sem iniciá-lo); use ``serve_forever()`` ou uma thread."""
+    mock = SpotifyMock(names)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(mock, fail_every, error_every))
+    server.mock = mock
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API do Spotify.")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--fail-every", type=int, default=0, help="responde 429 a cada N requisições")
+    parser.add_argument("--error-every", type=int, default=0, help="responde 503 a cada N requisições")
+    args = parser.parse_args(argv)
+
+    server = serve(args.port, fail_every=args.fail_every, error_every=args.error_every)
+    print(f"Spotify simulado em http://127.0.0.1:{server.server_address[1]}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Índice de frequência de termos por música.
+
+Gera, uma única vez, uma matriz esparsa música × palavra com a contagem de cada
+termo e um vocabulário compartilhado. As palavras mais frequentes de qualquer
+filtro passam a ser uma soma das linhas selecionadas seguida de um
+``argpartition``, sem precisar juntar e reprocessar o texto das letras.
+
+Uso: ``python -m inferify.terms [songs.parquet] [saida.npz]``
+"""
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from inferify.dataset import DATASET_DIR, SONGS_PARQUET, read_lyrics
+
+TERMS_NPZ = DATASET_DIR / "termos.npz"
+
+# Mesmo tratamento usado no gráfico de palavras: só letras e espaços
+_NON_LETTERS = re.compile(r"[^a-zA-Z\s]")
+
+
+def tokenize(text):
+    """Quebra uma letra em palavras minúsculas, sem pontuação e números."""
+    return _NON_LETTERS.sub("", text.lower()).split()
+
+
+class TermIndex:
+    """Matriz esparsa de contagens (músicas × vocabulário)."""
+
+    def __init__(self, matrix, vocabulary):
+        self.matrix = matrix.tocsr()
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        self._postings = None
+
+    @classmethod
+    def build(cls, lyrics):
+        """Monta o índice a partir de uma sequência de letras."""
+        vocab = {}
+        indices, indptr = [], [0]
+        for text in lyrics:
+            # O vocabulário segue a ordem da primeira ocorrência no corpus
+            indices.extend(vocab.setdefault(word, len(vocab)) for word in tokenize(text or ""))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.int32)
+        matrix = sp.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(vocab)),
+        )
+        # Soma as repetições de uma mesma palavra dentro da música
+        matrix.sum_duplicates()
+        return cls(matrix, list(vocab))
+
+    def save(self, path=TERMS_NPZ):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            data=self.matrix.data,
+            indices=self.matrix.indices,
+            indptr=self.matrix.indptr,
+            shape=np.asarray(self.matrix.shape),
+            vocabulary=self.vocabulary.astype(str),
+        )
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path=TERMS_NPZ):
+        with np.load(path) as arquivo:
+            matrix = sp.csr_matrix(
+                (arquivo["data"], arquivo["indices"], arquivo["indptr"]),
+                shape=tuple(arquivo["shape"]),
+            )
+            return cls(matrix, arquivo["vocabulary"])
+
+    def rows_with(self, words):
+        """Músicas que contêm ao menos uma das ``words`` (índice invertido)."""
+        if self._postings is None:
+            self._postings = self.matrix.tocsc()
+            self._positions = pd.Index(self.vocabulary)
+        columns = self._positions.get_indexer(list(words))
+        columns = columns[columns >= 0]
+        return np.unique(self._postings[:, columns].indices)
+
+    def counts(self, rows=None):
+        """Contagem total de cada termo nas músicas ``rows`` (todas se ``None``)."""
+        matrix = self.matrix if rows is None else self.matrix[np.asarray(rows, dtype=np.int64)]
+        return np.asarray(matrix.sum(axis=0)).ravel()
+
+    def top_terms(self, rows=None, n=20):
+        """As ``n`` palavras mais frequentes nas músicas ``rows``."""
+        counts = self.counts(rows)
+        n = min(n, np.count_nonzero(counts))
+        if n == 0:
+            return pd.DataFrame({"word": pd.Series(dtype=object), "count": pd.Series(dtype=np.int64)})
+        top = np.argpartition(-counts, n - 1)[:n]
+        # Empates ficam na ordem do vocabulário (primeira ocorrência no corpus)
+        top = top[np.lexsort((top, -counts[top]))]
+        return pd.DataFrame({"word": self.vocabulary[top], "count": counts[top].astype(np.int64)})
+
+
+def build_term_index(source=SONGS_PARQUET, target=TERMS_NPZ):
+    """Gera o índice de termos a partir do dataset colunar."""
+    return TermIndex.build(read_lyrics(source)).save(target)
+
+
+def ensure_term_index(source=SONGS_PARQUET, target=TERMS_NPZ):
+    """Gera o índice apenas se ele não existir ou for mais antigo que o dataset."""
+    source, target = Path(source), Path(target)
+    if not target.exists() or target.stat().st_mtime < source.stat().st_mtime:
+        build_term_index(source, target)
+    return target
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else SONGS_PARQUET
+    target = sys.argv[2] if len(sys.argv) > 2 else TERMS_NPZ
+    print(f"Índice de termos gerado em {build_term_index(source, target)}")
@@ -0,0 +1,97 @@
+"""Miniaturas locais das fotos dos artistas.
+
+A galeria da página de Popularidade usava ``st.image(imagem_principal)``
+direto: a cada execução o navegador baixava do CDN do Spotify uma foto grande
+(640 px) por artista. Aqui cada foto é baixada uma única vez, recortada e
+reduzida para ``THUMBNAIL_SIZE`` px, recomprimida em JPEG e guardada em disco
+com o nome do SHA-256 da URL. A página envia só esses bytes, algumas dezenas de
+KB por artista.
+
+Se a foto não puder ser baixada (sem internet, URL inválida), ``get`` devolve
+``None`` e a URL não é tentada de novo até o painel reiniciar.
+
+Uso (dentro da pasta ``Inferify``), para baixar tudo antes de abrir o painel::
+
+    python -m inferify.thumbnails
+"""
+import hashlib
+import io
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from inferify.dataset import APP_DIR, CACHE_DIR
+
+THUMBNAIL_DIR = CACHE_DIR / "thumbnails"
+# Lado da miniatura quadrada, em pixels, e qualidade do JPEG
+THUMBNAIL_SIZE = 200
+JPEG_QUALITY = 80
+DOWNLOAD_TIMEOUT = 5
+
+
+def make_thumbnail(content, size=THUMBNAIL_SIZE, quality=JPEG_QUALITY):
+    """Imagem em ``content`` recortada ao centro em ``size`` × ``size`` e salva como JPEG."""
+    with Image.open(io.BytesIO(content)) as image:
+        image = ImageOps.fit(ImageOps.exif_transpose(image).convert("RGB"), (size, size), Image.LANCZOS)
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return output.getvalue()
+
+
+class ThumbnailStore:
+    """Miniaturas em disco, uma por arquivo, nomeadas pelo SHA-256 da URL original."""
+
+    def __init__(self, directory=THUMBNAIL_DIR, size=THUMBNAIL_SIZE, timeout=DOWNLOAD_TIMEOUT):
+        self.directory = Path(directory)
+        self.size = size
+        self.timeout = timeout
+        self.failed = set()
+        self.lock = threading.Lock()
+
+    def _path(self, url):
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / str(self.size) / digest[:2] / f"{digest}.jpg"
+
+    def _download(self, url):
+        request = urllib.request.Request(url, headers={"User-Agent": "inferify"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def get(self, url):
+        """Bytes JPEG da miniatura de ``url``, baixando e reduzindo a foto na primeira vez."""
+        if not url or url in self.failed:
+            return None
+        path = self._path(url)
+        if path.exists():
+            return path.read_bytes()
+        try:
+            content = make_thumbnail(self._download(url), self.size)
+        except (OSError, ValueError):
+            with self.lock:
+                self.failed.add(url)
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(content)
+        tmp_path.replace(path)
+        return content
+
+    def get_many(self, urls, max_workers=8):
+        """Miniaturas de ``urls`` na mesma ordem, com os downloads em paralelo."""
+        urls = list(urls)
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+            return list(pool.map(self.get, urls))
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    urls = pd.read_csv(APP_DIR / "artistas_popularidade.csv")["imagem_principal"].dropna().unique()
+    thumbnails = ThumbnailStore().get_many(urls)
+    done = sum(thumbnail is not None for thumbnail in thumbnails)
+    print(f"{done} de {len(urls)} miniaturas em {THUMBNAIL_DIR}")
@@ -0,0 +1,113 @@
+"""Polaridade VADER das letras, em lote.
+
+Versão em lote do ``analyzer.polarity_scores(x)`` aplicado letra a letra pelos
+notebooks ``Analytics_Lyric.ipynb``. O analisador (e o léxico que ele carrega)
+é criado uma vez e, com ``workers > 1``, compartilhado com os processos do pool
+de ``inferify.parallel``; as letras são pontuadas em partes, na ordem original.
+
+``polarity_columns`` é a etapa do build: guarda a polaridade de cada letra em
+``dados/vader.parquet``, endereçada pelo hash do texto, e só pontua as letras
+que ainda não estão lá. Um build em que nenhuma letra mudou nem chega a
+importar o NLTK, e o painel só lê as colunas ``neg``, ``neu``, ``pos`` e
+``compound`` do dataset.
+
+Requer o NLTK com o ``vader_lexicon`` baixado (``nltk.download('vader_lexicon')``).
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from inferify.dataset import DATASET_DIR, VADER_COLUMNS
+from inferify.parallel import map_chunks
+
+VADER_CACHE = DATASET_DIR / "vader.parquet"
+
+
+def load_analyzer():
+    """``SentimentIntensityAnalyzer`` do NLTK, com mensagem clara se faltar o léxico."""
+    from nltk.sentiment import SentimentIntensityAnalyzer
+
+    try:
+        return SentimentIntensityAnalyzer()
+    except LookupError as erro:
+        raise LookupError("Léxico do VADER não encontrado; rode nltk.download('vader_lexicon')") from erro
+
+
+def _polarity_chunk(analyzer, texts):
+    scores = np.empty((len(texts), len(VADER_COLUMNS)), dtype=np.float64)
+    for i, text in enumerate(texts):
+        polarity = analyzer.polarity_scores(text)
+        scores[i] = [polarity[col] for col in VADER_COLUMNS]
+    return scores
+
+
+def polarity_scores(texts, analyzer=None, workers=1):
+    """``neg``, ``neu``, ``pos`` e ``compound`` de cada texto, na ordem de ``texts``."""
+    analyzer = analyzer or load_analyzer()
+    texts = [text if isinstance(text, str) else "" for text in texts]
+    parts = map_chunks(_polarity_chunk, texts, analyzer, workers)
+    scores = np.vstack(parts) if parts else np.zeros((0, len(VADER_COLUMNS)))
+    return pd.DataFrame(scores, columns=VADER_COLUMNS)
+
+
+def lyric_hashes(texts):
+    """Hash de 64 bits de cada letra, a chave do cache."""
+    return pd.util.hash_array(np.asarray(list(texts), dtype=object))
+
+
+class PolarityCache:
+    """Polaridade por hash de letra, gravada em Parquet."""
+
+    def __init__(self, path=VADER_CACHE):
+        self.path = Path(path)
+        if self.path.exists():
+            frame = pd.read_parquet(self.path, engine="pyarrow")
+            self.table = frame.set_index("hash")[VADER_COLUMNS]
+        else:
+            self.table = pd.DataFrame(np.zeros((0, len(VADER_COLUMNS))), columns=VADER_COLUMNS,
+                                      index=pd.Index([], dtype="uint64", name="hash"))
+        self.changed = False
+
+    def __len__(self):
+        return len(self.table)
+
+    def lookup(self, hashes):
+        """Linhas de ``hashes`` já calculadas (NaN nas que faltam)."""
+        return self.table.reindex(hashes).to_numpy(dtype=np.float64)
+
+    def add(self, hashes, scores):
+        new = pd.DataFrame(scores, columns=VADER_COLUMNS, index=pd.Index(hashes, dtype="uint64", name="hash"))
+        self.table = pd.concat([self.table, new[~new.index.isin(self.table.index)]])
+        self.changed = True
+
+    def save(self):
+        if not self.changed:
+            return self.path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        self.table.astype("float64").reset_index().to_parquet(tmp_path, engine="pyarrow", index=False,
+                                                              compression="zstd")
+        tmp_path.replace(self.path)
+        self.changed = False
+        return self.path
+
+
+def polarity_columns(texts, workers=1, cache=None, analyzer=None):
+    """Colunas ``neg``, ``neu``, ``pos`` e ``compound`` de ``texts``, usando e completando o cache.
+
+    O analisador só é criado (e o NLTK importado) se alguma letra não estiver no cache.
+    """
+    texts = [text if isinstance(text, str) else "" for text in texts]
+    cache = cache if cache is not None else PolarityCache()
+    hashes = lyric_hashes(texts)
+    scores = cache.lookup(hashes)
+    missing = np.flatnonzero(np.isnan(scores[:, 0]))
+    if len(missing):
+        # Letras repetidas são pontuadas uma vez só
+        unique, first = np.unique(hashes[missing], return_index=True)
+        new = polarity_scores([texts[i] for i in missing[first]], analyzer, workers).to_numpy()
+        cache.add(unique, new)
+        scores[missing] = new[np.searchsorted(unique, hashes[missing])]
+        cache.save()
+    return pd.DataFrame(scores, columns=VADER_COLUMNS)
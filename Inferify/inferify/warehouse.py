@@ -0,0 +1,226 @@
+"""Banco SQLite único com as músicas de todos os artistas.
+
+Substitui os ``<Artista>.db`` gerados por cada notebook (uma tabela ``lyrics``
+solta por arquivo) por um único banco normalizado:
+
+- ``artist``: nome, sexo e banda (do ``artistas_info.csv``);
+- ``album``: álbuns de cada artista;
+- ``song``: título, ano, gênero e contagem de palavras;
+- ``lyrics``: a letra limpa, separada para não pesar nas consultas;
+- ``emotion_scores``: score, sentimento, filtro e as oito emoções.
+
+A view ``songs_info`` junta tudo (menos as letras) com os mesmos nomes de
+colunas do CSV, então pode ser consultada direto em SQL::
+
+    SELECT artist, AVG(score) FROM songs_info WHERE release_year >= 2015 GROUP BY artist
+
+Uso: ``python -m inferify.warehouse [songs.parquet] [saida.db]``
+"""
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from inferify.dataset import APP_DIR, DATASET_DIR, EMOTION_COLUMNS, SONGS_PARQUET, read_dataset
+
+WAREHOUSE_DB = DATASET_DIR / "inferify.db"
+ARTISTS_INFO = APP_DIR / "artistas_info.csv"
+
+# Linhas por ``executemany``; tudo roda em uma única transação
+BATCH_SIZE = 5000
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS artist (
+    artist_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    sex TEXT,
+    band TEXT
+);
+CREATE TABLE IF NOT EXISTS album (
+    album_id INTEGER PRIMARY KEY,
+    artist_id INTEGER NOT NULL REFERENCES artist(artist_id),
+    name TEXT NOT NULL,
+    UNIQUE (artist_id, name)
+);
+CREATE TABLE IF NOT EXISTS song (
+    song_id INTEGER PRIMARY KEY,
+    artist_id INTEGER NOT NULL REFERENCES artist(artist_id),
+    album_id INTEGER REFERENCES album(album_id),
+    title TEXT NOT NULL,
+    release_year INTEGER,
+    genre TEXT,
+    word_count INTEGER,
+    UNIQUE (artist_id, title)
+);
+CREATE TABLE IF NOT EXISTS lyrics (
+    song_id INTEGER PRIMARY KEY REFERENCES song(song_id),
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS emotion_scores (
+    song_id INTEGER PRIMARY KEY REFERENCES song(song_id),
+    score REAL,
+    sentiment TEXT,
+    filter TEXT,
+    {", ".join(f"{col} REAL" for col in EMOTION_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS idx_song_artist ON song(artist_id);
+CREATE INDEX IF NOT EXISTS idx_song_year ON song(release_year);
+CREATE INDEX IF NOT EXISTS idx_song_genre ON song(genre);
+CREATE INDEX IF NOT EXISTS idx_album_name ON album(name);
+CREATE VIEW IF NOT EXISTS songs_info AS
+SELECT s.song_id, a.name AS artist, s.title, s.genre, al.name AS Album, s.release_year,
+       s.word_count AS "Word Count", e.score, e.sentiment, e.filter,
+       {", ".join(f"e.{col}" for col in EMOTION_COLUMNS)}
+FROM song s
+JOIN artist a ON a.artist_id = s.artist_id
+LEFT JOIN album al ON al.album_id = s.album_id
+LEFT JOIN emotion_scores e ON e.song_id = s.song_id;
+"""
+
+
+def connect(path=WAREHOUSE_DB):
+    """Abre o banco para escrita, em modo WAL, criando o esquema se preciso."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _batches(rows):
+    rows = list(rows)
+    for start in range(0, len(rows), BATCH_SIZE):
+        yield rows[start:start + BATCH_SIZE]
+
+
+def _executemany(conn, sql, rows):
+    for batch in _batches(rows):
+        conn.executemany(sql, batch)
+
+
+def insert_songs(conn, songs, artists=None):
+    """Insere (ou atualiza) músicas no formato do ``songs_info.csv``.
+
+    ``artists`` é o ``artistas_info.csv`` (colunas ``nome``, ``sexo``,
+    ``banda``). Músicas já presentes (mesmo artista e título) são substituídas,
+    então um notebook pode regravar só o seu artista.
+    """
+    songs = songs.reset_index(drop=True)
+    with conn:
+        if artists is not None:
+            _executemany(conn, """
+                INSERT INTO artist (name, sex, band) VALUES (?, ?, ?)
+                ON CONFLICT (name) DO UPDATE SET sex = excluded.sex, band = excluded.band
+            """, artists[["nome", "sexo", "banda"]].astype(object).where(artists.notna(), None).itertuples(index=False))
+        _executemany(conn, "INSERT OR IGNORE INTO artist (name) VALUES (?)",
+                     ((name,) for name in songs["artist"].astype(str).unique()))
+        artist_ids = dict(conn.execute("SELECT name, artist_id FROM artist"))
+        artist_col = songs["artist"].astype(str).map(artist_ids)
+
+        albums = pd.DataFrame({"artist_id": artist_col, "name": songs["Album"].astype(str)}).drop_duplicates()
+        _executemany(conn, "INSERT OR IGNORE INTO album (artist_id, name) VALUES (?, ?)",
+                     albums.itertuples(index=False))
+        album_ids = {(artist_id, name): album_id
+                     for album_id, artist_id, name in conn.execute("SELECT album_id, artist_id, name FROM album")}
+        album_col = [album_ids[key] for key in zip(artist_col, songs["Album"].astype(str))]
+
+        _executemany(conn, """
+            INSERT INTO song (artist_id, album_id, title, release_year, genre, word_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (artist_id, title) DO UPDATE SET
+                album_id = excluded.album_id, release_year = excluded.release_year,
+                genre = excluded.genre, word_count = excluded.word_count
+        """, zip(artist_col.tolist(), album_col, songs["title"].astype(str), songs["release_year"].tolist(),
+                 songs["genre"].astype(str), songs["Word Count"].tolist()))
+        song_ids = {(artist_id, title): song_id
+                    for song_id, artist_id, title in conn.execute("SELECT song_id, artist_id, title FROM song")}
+        song_col = [song_ids[key] for key in zip(artist_col, songs["title"].astype(str))]
+
+        if "lyrics" in songs:
+            _executemany(conn, "INSERT OR REPLACE INTO lyrics (song_id, text) VALUES (?, ?)",
+                         zip(song_col, songs["lyrics"].fillna("").astype(str)))
+        score_columns = ["score", "sentiment", "filter"] + EMOTION_COLUMNS
+        scores = songs[score_columns].astype(object)
+        scores[["sentiment", "filter"]] = scores[["sentiment", "filter"]].astype(str)
+        _executemany(conn, f"""
+            INSERT OR REPLACE INTO emotion_scores (song_id, {", ".join(score_columns)})
+            VALUES (?, {", ".join("?" * len(score_columns))})
+        """, ((song_id, *row) for song_id, row in zip(song_col, scores.itertuples(index=False))))
+    return len(song_col)
+
+
+def read_artists_info(path=ARTISTS_INFO):
+    artists = pd.read_csv(path, dtype="string")
+    return artists.apply(lambda col: col.str.strip())
+
+
+def build_warehouse(source=SONGS_PARQUET, target=WAREHOUSE_DB, artists_path=ARTISTS_INFO):
+    """Gera o banco a partir do dataset colunar e do ``artistas_info.csv``."""
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_suffix(".tmp")
+    tmp_path.unlink(missing_ok=True)
+    conn = connect(tmp_path)
+    try:
+        artists = read_artists_info(artists_path) if Path(artists_path).exists() else None
+        insert_songs(conn, read_dataset(source, lyrics=True), artists)
+        conn.execute("PRAGMA optimize")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    tmp_path.replace(target)
+    return target
+
+
+def ensure_warehouse(source=SONGS_PARQUET, target=WAREHOUSE_DB):
+    """Gera o banco apenas se ele não existir ou for mais antigo que o dataset."""
+    source, target = Path(source), Path(target)
+    if not target.exists() or target.stat().st_mtime < source.stat().st_mtime:
+        build_warehouse(source, target)
+    return target
+
+
+class Warehouse:
+    """Conexão somente leitura ao banco, com trava para ser usada por várias threads."""
+
+    def __init__(self, path=WAREHOUSE_DB):
+        self.conn = sqlite3.connect(f"file:{Path(path).as_posix()}?mode=ro", uri=True, check_same_thread=False)
+        self.lock = threading.Lock()
+
+    def query(self, sql, params=()):
+        with self.lock:
+            return pd.read_sql_query(sql, self.conn, params=params)
+
+    def aggregate(self, by, columns, years=None, artists=None, albums=None, genres=None):
+        """Agrega a view ``songs_info``, filtrando por anos, artistas, álbuns e gêneros.
+
+        ``by`` é uma coluna ou lista de colunas (ou ``None`` para uma linha só) e
+        ``columns`` mapeia o nome do resultado para uma expressão SQL, ex.:
+        ``{"songs": "COUNT(*)", "albums": "COUNT(DISTINCT Album)"}``.
+        """
+        by = [by] if isinstance(by, str) else list(by or [])
+        where, params = [], []
+        if years is not None:
+            where.append("release_year BETWEEN ? AND ?")
+            params += [int(years[0]), int(years[1])]
+        for column, values in (("artist", artists), ("Album", albums), ("genre", genres)):
+            if values is not None:
+                values = list(values)
+                where.append(f'"{column}" IN ({", ".join("?" * len(values))})')
+                params += values
+        select = [f'"{col}"' for col in by] + [f'{expr} AS "{name}"' for name, expr in columns.items()]
+        sql = f"SELECT {', '.join(select)} FROM songs_info"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if by:
+            sql += " GROUP BY " + ", ".join(f'"{col}"' for col in by)
+        return self.query(sql, params)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else SONGS_PARQUET
+    target = sys.argv[2] if len(sys.argv) > 2 else WAREHOUSE_DB
+    print(f"Banco gerado em {build_warehouse(source, target)}")
@@ -0,0 +1,166 @@
+"""Nuvens de palavras geradas a partir de tabelas de frequência.
+
+Os notebooks ``Analytics_Lyric.ipynb`` juntavam o texto de todas as letras para
+a nuvem geral e, para cada uma das oito emoções, filtravam o DataFrame de novo
+e rodavam ``word_tokenize`` outra vez sobre as letras escolhidas antes de
+chamar ``WordCloud(...).generate(' '.join(words))``: o corpus era tokenizado
+nove vezes e o ``generate`` ainda refazia a contagem.
+
+Aqui as letras são tokenizadas uma única vez, no índice de ``inferify.terms``.
+As tabelas por artista e por emoção (grupos × vocabulário) saem de um produto
+esparso com esse índice, e qualquer filtro da barra lateral é uma soma de
+linhas. A nuvem é desenhada com ``WordCloud.generate_from_frequencies`` direto
+das contagens, sem texto intermediário.
+
+Cada imagem PNG é guardada em disco com o nome do SHA-256 das frequências,
+do tamanho e das cores: filtros diferentes com as mesmas palavras reaproveitam
+a mesma imagem, e o cache continua válido quando o dataset muda. No painel, a
+imagem de cada (filtro, emoção, tamanho) ainda fica no cache de resultados.
+
+Uso (dentro da pasta ``Inferify``), para gerar de antemão as nuvens do corpus,
+de cada emoção e de cada artista::
+
+    python -m inferify.wordclouds
+"""
+import hashlib
+import io
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from inferify.dataset import APP_DIR, CACHE_DIR, EMOTION_COLUMNS, ensure_dataset, read_dataset
+from inferify.terms import TermIndex, ensure_term_index
+
+WORDCLOUD_DIR = CACHE_DIR / "nuvens"
+MAX_WORDS = 200
+WIDTH, HEIGHT = 800, 400
+COLORMAP = "Blues"
+# Palavras indesejadas removidas nos notebooks (nomes das integrantes e interjeições)
+EXTRA_STOPWORDS = {"jade", "anne", "leigh", "jesy", "perrie", "na", "yeah", "that", "this", "when", "what"}
+
+
+def default_stopwords():
+    """``STOPWORDS`` do ``wordcloud`` (também sem apóstrofo, como no índice) e as indesejadas."""
+    from wordcloud import STOPWORDS
+
+    return set(STOPWORDS) | {word.replace("'", "") for word in STOPWORDS} | EXTRA_STOPWORDS
+
+
+class FrequencyTable:
+    """Contagem de cada termo do vocabulário por grupo (artista, emoção...)."""
+
+    def __init__(self, groups, matrix):
+        self.groups = pd.Index(groups)
+        self.matrix = matrix.tocsr()
+
+    @classmethod
+    def build(cls, index, labels):
+        """Soma as linhas de ``index`` (um ``TermIndex``) de cada valor de ``labels``."""
+        codes, groups = pd.factorize(pd.Series(labels).astype(object), sort=True)
+        valid = np.flatnonzero(codes >= 0)
+        indicator = sp.csr_matrix(
+            (np.ones(len(valid), dtype=np.int32), (codes[valid], valid)),
+            shape=(len(groups), index.matrix.shape[0]),
+        )
+        return cls(groups, indicator @ index.matrix)
+
+    def counts(self, group):
+        """Contagens de ``group`` (zeros se ele não existir)."""
+        position = self.groups.get_indexer([group])[0]
+        if position < 0:
+            return np.zeros(self.matrix.shape[1], dtype=np.int64)
+        return self.matrix[position].toarray().ravel()
+
+
+class WordCloudService:
+    """Tabelas de frequência do corpus e nuvens desenhadas a partir delas."""
+
+    def __init__(self, index, songs, directory=WORDCLOUD_DIR, stopwords=None, max_words=MAX_WORDS):
+        self.index = index
+        self.directory = Path(directory)
+        self.max_words = max_words
+        stopwords = default_stopwords() if stopwords is None else set(stopwords)
+        self.keep = ~pd.Index(index.vocabulary).isin(stopwords)
+        self.sentiment = songs["sentiment"].astype(object).to_numpy()
+        self.artist = songs["artist"].astype(object).to_numpy()
+        self.by_artist = FrequencyTable.build(index, songs["artist"])
+        self.by_emotion = FrequencyTable.build(index, songs["sentiment"])
+
+    def frequencies(self, rows=None, emotion=None, artist=None):
+        """Até ``max_words`` palavras mais frequentes (palavra -> contagem), sem stopwords.
+
+        ``rows`` restringe às músicas nessas posições, ``emotion`` às com esse
+        sentimento dominante e ``artist`` às desse artista. Sem ``rows``, um
+        artista ou uma emoção sozinhos vêm direto das tabelas pré-calculadas.
+        """
+        if rows is None and (emotion is None) != (artist is None):
+            table, group = (self.by_emotion, emotion) if artist is None else (self.by_artist, artist)
+            counts = table.counts(group)
+        else:
+            selected = np.zeros(len(self.sentiment), dtype=bool)
+            selected[slice(None) if rows is None else np.asarray(rows, dtype=np.int64)] = True
+            if emotion is not None:
+                selected &= self.sentiment == emotion
+            if artist is not None:
+                selected &= self.artist == artist
+            counts = self.index.counts(np.flatnonzero(selected))
+        counts = np.where(self.keep, counts, 0)
+        n = min(self.max_words, np.count_nonzero(counts))
+        if n == 0:
+            return {}
+        top = np.argpartition(-counts, n - 1)[:n]
+        # Empates ficam na ordem do vocabulário, como em ``TermIndex.top_terms``
+        top = top[np.lexsort((top, -counts[top]))]
+        return dict(zip(self.index.vocabulary[top].tolist(), counts[top].tolist()))
+
+    def _path(self, frequencies, width, height, colormap):
+        key = json.dumps([sorted(frequencies.items()), width, height, colormap])
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.png"
+
+    def render(self, frequencies, width=WIDTH, height=HEIGHT, colormap=COLORMAP):
+        """Bytes PNG da nuvem de ``frequencies``, desenhada só na primeira vez (``None`` se vazia)."""
+        if not frequencies:
+            return None
+        path = self._path(frequencies, width, height, colormap)
+        if path.exists():
+            return path.read_bytes()
+        from wordcloud import WordCloud
+
+        # Mesmos parâmetros visuais dos notebooks
+        cloud = WordCloud(width=width, height=height, background_color="white", colormap=colormap,
+                          random_state=21, relative_scaling=0.5, max_words=self.max_words)
+        output = io.BytesIO()
+        cloud.generate_from_frequencies(frequencies).to_image().save(output, format="PNG", optimize=True)
+        content = output.getvalue()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(content)
+        tmp_path.replace(path)
+        return content
+
+    def image(self, rows=None, emotion=None, artist=None, width=WIDTH, height=HEIGHT, colormap=COLORMAP):
+        """Nuvem das músicas escolhidas como em ``frequencies``."""
+        return self.render(self.frequencies(rows, emotion, artist), width, height, colormap)
+
+
+def main():
+    dataset_path = ensure_dataset(APP_DIR / "songs_info.csv")
+    start = time.perf_counter()
+    service = WordCloudService(TermIndex.load(ensure_term_index(dataset_path)), read_dataset(dataset_path))
+    print(f"Tabelas de frequência em {time.perf_counter() - start:.2f}s")
+    groups = [{}] + [{"emotion": emotion} for emotion in EMOTION_COLUMNS]
+    groups += [{"artist": artist} for artist in service.by_artist.groups]
+    start = time.perf_counter()
+    for group in groups:
+        service.image(**group)
+    print(f"{len(groups)} nuvens em {time.perf_counter() - start:.2f}s -> {service.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import time
+import streamlit as st
+import pandas as pd
+from inferify.data import load_lyrics_at, load_search_index, load_song_filter
+from inferify.sidebar import render_sidebar, filtered_songs, cached
+from inferify.search import parse_query, snippet
+
+# --- Configuração da Página ---
+st.set_page_config(
+    page_title="Inferify - Busca nas Letras",
+    layout="wide",
+)
+
+# --- Carregamento dos dados ---
+indice_busca = load_search_index()
+
+# --- Barra Lateral (Filtros) ---
+estado = render_sidebar()
+
+# --- Conteúdo Principal ---
+st.title("🔎 Busca nas Letras")
+st.markdown("Busque palavras nas letras das músicas que passam pelos filtros da barra lateral. "
+            "Use aspas para frases (`\"broken heart\"`) e `*` para prefixos (`danc*`); "
+            "os resultados são ordenados por relevância (BM25).")
+
+col_busca1, col_busca2 = st.columns([4, 1])
+with col_busca1:
+    consulta = st.text_input("Buscar", placeholder='love "broken heart" danc*')
+with col_busca2:
+    limite = st.selectbox("Resultados", [10, 20, 50, 100], index=1)
+
+if consulta.strip():
+    # Mesmos filtros das outras páginas, como máscara das músicas buscadas
+    def mascara_filtros():
+        filtro = load_song_filter()
+        return filtro.mask(filtro.select(*estado))
+
+    mascara = cached("busca/mascara", estado, mascara_filtros)
+    inicio = time.perf_counter()
+    resultado = indice_busca.search(consulta, mask=mascara, limit=limite)
+    tempo_ms = (time.perf_counter() - inicio) * 1000
+
+    st.caption(f"{resultado.total} músicas encontradas em {tempo_ms:.1f} ms")
+
+    if resultado.total:
+        musicas = filtered_songs(estado).loc[resultado.rows]
+        clausulas = indice_busca.normalize(parse_query(consulta))
+        # Só as letras dos resultados, lidas dos grupos do Parquet que as contêm
+        letras = load_lyrics_at(tuple(int(linha) for linha in resultado.rows))
+        tabela = pd.DataFrame({
+            "Título": musicas["title"].to_numpy(),
+            "Artista": musicas["artist"].astype(str).to_numpy(),
+            "Álbum": musicas["Album"].astype(str).to_numpy(),
+            "Ano": musicas["release_year"].to_numpy(),
+            "Relevância": resultado.scores.round(2),
+            "Trecho": [snippet(letras[linha], clausulas) for linha in resultado.rows],
+        })
+        st.dataframe(tabela, use_container_width=True, hide_index=True)
+    else:
+        st.warning("Nenhuma música encontrada para essa busca com os filtros escolhidos.")
+else:
+    st.info("Digite uma ou mais palavras para buscar nas letras.")
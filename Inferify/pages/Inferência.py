@@ -1,6 +1,10 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from inferify.data import load_popularity, load_artists, load_cube, load_member_filter, load_wordclouds, load_songs, load_neighbors, load_song_filter
+from inferify.sidebar import render_sidebar, filtered_songs, cached, cached_figure
+from inferify.distributions import histogram_figure
+from inferify.dataset import EMOTION_COLUMNS
 
 # --- Configuração da Página ---
 st.set_page_config(
@@ -9,85 +13,36 @@ st.set_page_config(
 )
 
 # --- Carregamento dos dados ---
-df = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Inferify/songs_info.csv")
-df_um = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Inferify/artistas_popularidade.csv")
-df_dois = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Inferify/artistas_info.csv")
+df_um = load_popularity()
+df_dois = load_artists()
+cubo = load_cube()
 
 # --- Colunas que queremos inverter ---
 colunas_inverter = ["score","joy","sadness","surprise","trust","anger","disgust","anticipation","fear"]
 
-# --- Inverter sinais ---
-for col in colunas_inverter:
-    if col in df.columns:
-        df[col] = df[col] * -1
-
-# --- Limpeza e padronização ---
-df['release_year'] = df['release_year'].astype(int)
-df['artist'] = df['artist'].astype(str).str.strip()
-df['Album'] = df['Album'].astype(str).str.strip()
-df['genre'] = df['genre'].astype(str).str.strip()
-df['sentiment'] = df['sentiment'].astype(str).str.strip()
+# --- Máximo de músicas listadas na escolha da música parecida ---
+MAX_CANDIDATAS = 50
 
 # --- Barra Lateral (Filtros) ---
-st.sidebar.header("🔍 Filtros")
-
-# --- Filtro de Ano (com Slider mais bonito) ---
-anos_disponiveis = sorted(df['release_year'].dropna().unique())
-ano_min, ano_max = int(min(anos_disponiveis)), int(max(anos_disponiveis))
-
-anos_selecionados = st.sidebar.slider(
-    "Intervalo de Anos",
-    min_value=ano_min,
-    max_value=ano_max,
-    value=(ano_min, ano_max),
-    step=1
-)
+estado = render_sidebar()
 
-# --- Filtro de Artista ---
-artista_disponiveis = sorted(df['artist'].dropna().unique())
-artista_selecionadas = st.sidebar.multiselect(
-    "Selecione Artista(s) ou Banda(s)",
-    options=artista_disponiveis,
-    default=artista_disponiveis[:5],  # mostra só alguns como padrão
-    help="Pesquise pelo nome do artista ou banda"
-)
+# --- Filtragem do DataFrame Principal, com os sinais invertidos ---
+def inverter_sinais():
+    df_filtrado = filtered_songs(estado)
+    return df_filtrado.assign(**{col: df_filtrado[col] * -1 for col in colunas_inverter if col in df_filtrado.columns})
 
-# --- Filtro de Álbum ---
-album_disponiveis = sorted(df['Album'].dropna().unique())
-album_selecionados = st.sidebar.multiselect(
-    "Selecione Álbum(s)",
-    options=album_disponiveis,
-    default=album_disponiveis[:5],
-    help="Pesquise pelo nome do álbum"
-)
+df_filtrado = cached("inferencia/musicas", estado, inverter_sinais)
 
-# --- Filtro de Gênero ---
-genero = sorted(df['genre'].dropna().astype(str).unique())
-genero_um = st.sidebar.multiselect(
-    "Selecione Gênero(s) Musicais",
-    options=genero,
-    default=genero[:5],
-    help="Pesquise ou selecione múltiplos gêneros"
-)
-
-# --- Filtragem do DataFrame Principal ---
-df_filtrado = df[
-    (df['release_year'] >= anos_selecionados[0]) &
-    (df['release_year'] <= anos_selecionados[1]) &
-    (df['artist'].isin(artista_selecionadas)) &
-    (df['Album'].isin(album_selecionados)) &
-    (df['genre'].isin(genero_um))
-]
+# Mesmos filtros aplicados às células do cubo (cujos scores não estão invertidos)
+celulas = cached("celulas", estado, lambda: cubo.select(*estado))
 
 # --- Aplicar filtros também em df_um e df_dois ---
 artistas_filtrados = df_filtrado['artist'].unique()
 
 df_um_filtrado = df_um[df_um['nome'].isin(artistas_filtrados)]
 
-df_dois_filtrado = df_dois[
-    (df_dois['nome'].isin(artistas_filtrados)) |
-    (df_dois['banda'].isin(artistas_filtrados))
-].copy()
+membros = load_member_filter()
+df_dois_filtrado = df_dois.iloc[membros.rows(membros.members(artistas_filtrados))].copy()
 
 # --- Conteúdo Principal ---
 st.title("Dashboard de Análise de Emoções")
@@ -96,10 +51,12 @@ st.markdown("Explore os dados musicais dessas bandas e artistas em relação à
 # --- Métricas Principais ---
 st.subheader("Métricas Gerais")
 if not df_filtrado.empty:
-    score_medio = df_filtrado['score'].mean()
-    score_maximo = df_filtrado['score'].max()
-    emocao_mais_frequente = df_filtrado['sentiment'].mode()[0]
-    artista_mais_frequente = df_filtrado['artist'].mode()[0]
+    score_medio, score_maximo, emocao_mais_frequente, artista_mais_frequente = cached("inferencia/kpis", estado, lambda: (
+        -cubo.mean('score', mask=celulas),
+        -cubo.min('score', mask=celulas),
+        cubo.mode('sentiment', celulas),
+        cubo.mode('artist', celulas),
+    ))
 else:
     score_medio, score_maximo, emocao_mais_frequente, artista_mais_frequente = 0, 0, "", ""
 
@@ -117,76 +74,89 @@ st.subheader("Gráficos")
 col_graf1, col_graf2 = st.columns(2)
 
 # Gráfico 1 - Artistas por Score Médio
+def grafico_artistas():
+    top_artistas = (-cubo.mean('score', 'artist', celulas)).rename('score').sort_values().reset_index()
+    grafico_artistas = px.bar(
+        top_artistas,
+        x='score',
+        y='artist',
+        orientation='h',
+        title="Artistas por Score Médio",
+        labels={'score': 'Score Médio', 'artist': ''}
+    )
+    grafico_artistas.update_layout(title_x=0.1, yaxis={'categoryorder': 'total ascending'})
+    return grafico_artistas
+
 with col_graf1:
     if not df_filtrado.empty:
-        top_artistas = df_filtrado.groupby('artist')['score'].mean().sort_values().reset_index()
-        grafico_artistas = px.bar(
-            top_artistas,
-            x='score',
-            y='artist',
-            orientation='h',
-            title="Artistas por Score Médio",
-            labels={'score': 'Score Médio', 'artist': ''}
-        )
-        grafico_artistas.update_layout(title_x=0.1, yaxis={'categoryorder': 'total ascending'})
-        st.plotly_chart(grafico_artistas, use_container_width=True)
+        st.plotly_chart(cached_figure("inferencia/artistas", estado, grafico_artistas), use_container_width=True)
     else:
         st.warning("Nenhum dado para exibir no gráfico de artistas.")
 
 # Gráfico 2 - Distribuição de Scores
+def grafico_hist():
+    grafico_hist = histogram_figure(
+        df_filtrado['score'],
+        bins=30,
+        label='Score',
+        title="Distribuição de Scores",
+        yaxis_title='Quantidade'
+    )
+    grafico_hist.update_layout(title_x=0.1)
+    return grafico_hist
+
 with col_graf2:
     if not df_filtrado.empty:
-        grafico_hist = px.histogram(
-            df_filtrado,
-            x='score',
-            nbins=30,
-            title="Distribuição de Scores",
-            labels={'score': 'Score', 'count': 'Quantidade'}
-        )
-        grafico_hist.update_layout(title_x=0.1)
-        st.plotly_chart(grafico_hist, use_container_width=True)
+        st.plotly_chart(cached_figure("inferencia/scores", estado, grafico_hist), use_container_width=True)
     else:
         st.warning("Nenhum dado para exibir no gráfico de distribuição de scores.")
 
 col_graf3, col_graf4 = st.columns(2)
 
 # Gráfico 3 - Proporção de Sentimentos
+def grafico_sentimentos():
+    sentimento_contagem = cubo.count('sentiment', celulas).sort_values(ascending=False).reset_index()
+    sentimento_contagem['sentiment'] = sentimento_contagem['sentiment'].astype(str)
+    sentimento_contagem.columns = ['sentimento', 'quantidade']
+    grafico_sentimentos = px.bar(
+        sentimento_contagem,
+        x='sentimento',
+        y='quantidade',
+        color='sentimento',
+        text='quantidade',
+        title='Proporção de Sentimentos nas Músicas'
+    )
+    grafico_sentimentos.update_layout(title_x=0.1, showlegend=False)
+    return grafico_sentimentos
+
 with col_graf3:
     if not df_filtrado.empty:
-        sentimento_contagem = df_filtrado['sentiment'].value_counts().reset_index()
-        sentimento_contagem.columns = ['sentimento', 'quantidade']
-        grafico_sentimentos = px.bar(
-            sentimento_contagem,
-            x='sentimento',
-            y='quantidade',
-            color='sentimento',
-            text='quantidade',
-            title='Proporção de Sentimentos nas Músicas'
-        )
-        grafico_sentimentos.update_layout(title_x=0.1, showlegend=False)
-        st.plotly_chart(grafico_sentimentos, use_container_width=True)
+        st.plotly_chart(cached_figure("inferencia/sentimentos", estado, grafico_sentimentos), use_container_width=True)
     else:
         st.warning("Nenhum dado para exibir no gráfico de sentimentos.")
 
 # Gráfico 4 - Evolução do Score Médio por Ano
+def grafico_ano():
+    score_por_ano = (-cubo.mean('score', 'release_year', celulas)).rename('score').reset_index()
+    grafico_ano = px.line(
+        score_por_ano,
+        x='release_year',
+        y='score',
+        title='Evolução do Score Médio por Ano',
+        labels={'release_year': 'Ano de Lançamento', 'score': 'Score Médio'}
+    )
+    grafico_ano.update_layout(title_x=0.1)
+    return grafico_ano
+
 with col_graf4:
     if not df_filtrado.empty:
-        score_por_ano = df_filtrado.groupby('release_year')['score'].mean().reset_index()
-        grafico_ano = px.line(
-            score_por_ano,
-            x='release_year',
-            y='score',
-            title='Evolução do Score Médio por Ano',
-            labels={'release_year': 'Ano de Lançamento', 'score': 'Score Médio'}
-        )
-        grafico_ano.update_layout(title_x=0.1)
-        st.plotly_chart(grafico_ano, use_container_width=True)
+        st.plotly_chart(cached_figure("inferencia/ano", estado, grafico_ano), use_container_width=True)
     else:
         st.warning("Nenhum dado para exibir no gráfico por ano.")
 
 # --- Gráfico 5 - Gêneros por Score Médio ---
-if not df_filtrado.empty:
-    top_generos = df_filtrado.groupby('genre')['score'].mean().sort_values().reset_index()
+def grafico_generos():
+    top_generos = (-cubo.mean('score', 'genre', celulas)).rename('score').sort_values().reset_index()
     grafico_generos = px.bar(
         top_generos,
         x='score',
@@ -196,13 +166,16 @@ if not df_filtrado.empty:
         labels={'score': 'Score Médio', 'genre': ''}
     )
     grafico_generos.update_layout(yaxis={'categoryorder': 'total ascending'})
-    st.plotly_chart(grafico_generos, use_container_width=True)
+    return grafico_generos
+
+if not df_filtrado.empty:
+    st.plotly_chart(cached_figure("inferencia/generos", estado, grafico_generos), use_container_width=True)
 else:
     st.warning("Nenhum dado para exibir no gráfico de gêneros.")
 
 # --- Gráfico 6 - Heatmap: Distribuição de Gêneros por Sentimento ---
-if not df_filtrado.empty:
-    genero_contagem_um = df_filtrado.groupby(['sentiment', 'genre']).size().reset_index(name='quantidade')
+def grafico_heatmap():
+    genero_contagem_um = cubo.count(['sentiment', 'genre'], celulas).reset_index(name='quantidade')
     
     grafico_heatmap = px.density_heatmap(
         genero_contagem_um,
@@ -219,9 +192,177 @@ if not df_filtrado.empty:
         yaxis_title="Sentimento",
         yaxis={'categoryorder':'total ascending'}
     )
-    
-    st.plotly_chart(grafico_heatmap, use_container_width=True)
+    return grafico_heatmap
+
+if not df_filtrado.empty:
+    st.plotly_chart(cached_figure("inferencia/heatmap", estado, grafico_heatmap), use_container_width=True)
 else:
 
     st.warning("Nenhum dado para exibir no heatmap de gêneros por sentimento.")
 
+# --- Polaridade VADER (calculada no build, sem NLTK no painel) ---
+st.markdown("---")
+st.subheader("Polaridade das Letras (VADER)")
+
+def classificar_polaridade():
+    # Mesma regra do fetch_sentiment dos notebooks
+    neutra = (df_filtrado['neu'] > df_filtrado['pos']) & (df_filtrado['neu'] > df_filtrado['neg'])
+    positiva = ~neutra & (df_filtrado['pos'] >= df_filtrado['neg'])
+    polaridade = pd.Series('Polaridade Negativa', index=df_filtrado.index)
+    polaridade[positiva] = 'Polaridade Positiva'
+    polaridade[neutra] = 'Polaridade Neutra'
+    return polaridade.value_counts().reindex(
+        ['Polaridade Positiva', 'Polaridade Neutra', 'Polaridade Negativa'], fill_value=0)
+
+def grafico_polaridade():
+    contagem = classificar_polaridade().rename_axis('polaridade').reset_index(name='quantidade')
+    grafico_polaridade = px.pie(
+        contagem,
+        names='polaridade',
+        values='quantidade',
+        color='polaridade',
+        color_discrete_map={'Polaridade Positiva': '#BECBB2', 'Polaridade Neutra': '#F2E3BC', 'Polaridade Negativa': '#C19875'},
+        title='Polaridade das Músicas'
+    )
+    grafico_polaridade.update_layout(title_x=0.1)
+    return grafico_polaridade
+
+def grafico_compound():
+    compound_artistas = df_filtrado.groupby('artist', observed=True)['compound'].mean().sort_values().reset_index()
+    grafico_compound = px.bar(
+        compound_artistas,
+        x='compound',
+        y='artist',
+        orientation='h',
+        title='Compound Médio por Artista',
+        labels={'compound': 'Compound Médio', 'artist': ''}
+    )
+    grafico_compound.update_layout(title_x=0.1)
+    return grafico_compound
+
+if 'compound' not in df_filtrado.columns:
+    st.info("O dataset ainda não tem as colunas de polaridade. Rode `python -m inferify.build` com o NLTK e o `vader_lexicon` instalados para calculá-las.")
+elif df_filtrado.empty:
+    st.warning("Nenhum dado para exibir a polaridade.")
+else:
+    col_pol1, col_pol2 = st.columns(2)
+    with col_pol1:
+        st.metric("Compound Médio", f"{df_filtrado['compound'].mean():.2f}")
+        st.plotly_chart(cached_figure("inferencia/polaridade", estado, grafico_polaridade), use_container_width=True)
+    with col_pol2:
+        st.plotly_chart(cached_figure("inferencia/compound", estado, grafico_compound), use_container_width=True)
+
+# --- Nuvem de Palavras por Emoção (tabelas de frequência e imagens em cache) ---
+st.markdown("---")
+st.subheader("Nuvem de Palavras por Emoção")
+
+col_nuvem1, col_nuvem2 = st.columns([1, 3])
+with col_nuvem1:
+    emocao_nuvem = st.selectbox("Emoção dominante", ["todas"] + EMOTION_COLUMNS)
+    largura_nuvem = st.select_slider("Largura (px)", options=[600, 800, 1000, 1200], value=800)
+
+with col_nuvem2:
+    if df_filtrado.empty:
+        st.warning("Nenhum dado para exibir a nuvem de palavras.")
+    else:
+        try:
+            nuvens = load_wordclouds()
+        except ImportError:
+            nuvens = None
+            st.info("Instale o pacote `wordcloud` (ver `requirements.txt`) para ver as nuvens de palavras.")
+        if nuvens is not None:
+            emocao = None if emocao_nuvem == "todas" else emocao_nuvem
+            imagem_nuvem = cached(("inferencia/nuvem", emocao, largura_nuvem), estado, lambda: nuvens.image(
+                rows=df_filtrado.index, emotion=emocao, width=largura_nuvem, height=largura_nuvem // 2))
+            if imagem_nuvem is None:
+                st.warning(f"Nenhuma música com emoção dominante {emocao_nuvem} nos filtros escolhidos.")
+            else:
+                st.image(imagem_nuvem, use_container_width=True)
+
+# --- Músicas com Perfil Emocional Parecido (índice de vizinhos por cosseno) ---
+st.markdown("---")
+st.subheader("Músicas com Perfil Emocional Parecido")
+
+if df_filtrado.empty:
+    st.warning("Nenhuma música para comparar.")
+else:
+    col_viz1, col_viz2 = st.columns([1, 3])
+    with col_viz1:
+        # Artista primeiro e o título digitado depois, para a lista de músicas ficar pequena
+        artistas_viz = cached("inferencia/artistas", estado, lambda: sorted(df_filtrado['artist'].astype(str).unique()))
+        artista_viz = st.selectbox("Artista", artistas_viz)
+        titulo_viz = st.text_input("Título contém", placeholder="Ex.: love")
+
+        def candidatas_musica():
+            titulos = df_filtrado.loc[df_filtrado['artist'] == artista_viz, 'title']
+            if titulo_viz.strip():
+                titulos = titulos[titulos.str.contains(titulo_viz.strip(), case=False, regex=False)]
+            return titulos.sort_values().head(MAX_CANDIDATAS)
+
+        candidatas = cached(("inferencia/candidatas", artista_viz, titulo_viz.strip().lower()), estado, candidatas_musica)
+        musica_viz = st.selectbox(
+            "Música",
+            candidatas.index,
+            format_func=lambda linha: candidatas.at[linha],
+            help=f"Até {MAX_CANDIDATAS} músicas do artista; digite parte do título para achar as outras.",
+        )
+        quantidade_viz = st.slider("Quantidade de músicas", 5, 30, 10)
+        outros_artistas = st.checkbox("Só de outros artistas", value=True)
+        so_filtros = st.checkbox("Só músicas dos filtros", value=False)
+
+    if musica_viz is None:
+        with col_viz2:
+            st.warning("Nenhuma música do artista com esse título.")
+    else:
+        # Candidatas: todo o corpus ou só as músicas dos filtros, sem o artista escolhido se pedido
+        def vizinhos_musica():
+            musicas = load_songs()
+            permitidas = None
+            if so_filtros:
+                filtro = load_song_filter()
+                permitidas = filtro.mask(filtro.select(*estado))
+            if outros_artistas:
+                outro_artista = (musicas['artist'] != musicas.at[musica_viz, 'artist']).to_numpy()
+                permitidas = outro_artista if permitidas is None else permitidas & outro_artista
+            vizinhos = load_neighbors().similar(musica_viz, quantidade_viz, permitidas)
+            return musicas.iloc[vizinhos['row']].assign(similaridade=vizinhos['similarity'].to_numpy())
+
+        chave_viz = ("inferencia/vizinhos", musica_viz, quantidade_viz, outros_artistas, so_filtros)
+        vizinhos = cached(chave_viz, estado, vizinhos_musica)
+
+        def grafico_perfil():
+            # Perfis normalizados (norma 1), os mesmos comparados pelo índice
+            perfis = load_neighbors().vectors
+            perfil = pd.DataFrame({
+                'emoção': EMOTION_COLUMNS * 2,
+                'intensidade': list(perfis[musica_viz]) + list(perfis[vizinhos.index].mean(axis=0)),
+                'perfil': ['Música escolhida'] * len(EMOTION_COLUMNS) + ['Média das parecidas'] * len(EMOTION_COLUMNS),
+            })
+            grafico_perfil = px.line_polar(
+                perfil,
+                r='intensidade',
+                theta='emoção',
+                color='perfil',
+                line_close=True,
+                title='Perfil Emocional'
+            )
+            grafico_perfil.update_layout(title_x=0.1)
+            return grafico_perfil
+
+        with col_viz2:
+            if vizinhos.empty:
+                st.warning("Esta música não tem palavras do léxico de emoções ou não há outras músicas para comparar.")
+            else:
+                st.dataframe(
+                    pd.DataFrame({
+                        "Título": vizinhos["title"].to_numpy(),
+                        "Artista": vizinhos["artist"].astype(str).to_numpy(),
+                        "Álbum": vizinhos["Album"].astype(str).to_numpy(),
+                        "Ano": vizinhos["release_year"].to_numpy(),
+                        "Sentimento": vizinhos["sentiment"].astype(str).to_numpy(),
+                        "Similaridade": vizinhos["similaridade"].round(3).to_numpy(),
+                    }),
+                    hide_index=True,
+                    use_container_width=True,
+                )
+                st.plotly_chart(cached_figure(("inferencia/perfil",) + chave_viz[1:], estado, grafico_perfil), use_container_width=True)
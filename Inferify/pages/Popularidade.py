@@ -1,7 +1,9 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import altair as alt
+from inferify.data import load_popularity, load_artists, load_thumbnails
+from inferify.sidebar import render_sidebar, filtered_songs, cached, cached_figure
+from inferify.history import read_history, growth
 
 # --- Configuração da Página ---
 st.set_page_config(
@@ -10,63 +12,17 @@ st.set_page_config(
 )
 
 # --- Carregamento dos dados ---
-df = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Inferify/songs_info.csv")
-df_um = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Inferify/artistas_popularidade.csv")
-df_dois = pd.read_csv("https://raw.githubusercontent.com/riguedes/TCC_UFOP/refs/heads/main/Inferify/artistas_info.csv")
+df_um = load_popularity()
+df_dois = load_artists()
 
 # --- Barra Lateral (Filtros) ---
-st.sidebar.header("🔍 Filtros")
-
-# --- Filtro de Ano (com Slider mais bonito) ---
-anos_disponiveis = sorted(df['release_year'].dropna().unique())
-ano_min, ano_max = int(min(anos_disponiveis)), int(max(anos_disponiveis))
-
-anos_selecionados = st.sidebar.slider(
-    "Intervalo de Anos",
-    min_value=ano_min,
-    max_value=ano_max,
-    value=(ano_min, ano_max),
-    step=1
-)
-
-# --- Filtro de Artista ---
-artista_disponiveis = sorted(df['artist'].dropna().unique())
-artista_selecionadas = st.sidebar.multiselect(
-    "Selecione Artista(s) ou Banda(s)",
-    options=artista_disponiveis,
-    default=artista_disponiveis[:5],  # mostra só alguns como padrão
-    help="Pesquise pelo nome do artista ou banda"
-)
-
-# --- Filtro de Álbum ---
-album_disponiveis = sorted(df['Album'].dropna().unique())
-album_selecionados = st.sidebar.multiselect(
-    "Selecione Álbum(s)",
-    options=album_disponiveis,
-    default=album_disponiveis[:5],
-    help="Pesquise pelo nome do álbum"
-)
-
-# --- Filtro de Gênero ---
-genero = sorted(df['genre'].dropna().astype(str).unique())
-genero_um = st.sidebar.multiselect(
-    "Selecione Gênero(s) Musicais",
-    options=genero,
-    default=genero[:5],
-    help="Pesquise ou selecione múltiplos gêneros"
-)
+estado = render_sidebar()
 
 # --- Filtragem do DataFrame Principal ---
-df_filtrado = df[
-    (df['release_year'] >= anos_selecionados[0]) &
-    (df['release_year'] <= anos_selecionados[1]) &
-    (df['artist'].isin(artista_selecionadas)) &
-    (df['Album'].isin(album_selecionados)) &
-    (df['genre'].isin(genero_um))
-]
+df_filtrado = filtered_songs(estado)
 
 # --- Filtragem do DataFrame de artistas com base nos filtros ---
-df_um_filtrado = df_um[df_um['nome'].isin(artista_selecionadas)]
+df_um_filtrado = df_um[df_um['nome'].isin(estado.artists)]
 
 # --- Conteúdo Principal ---
 st.title("Dashboard de Análise de Popularidade no Spotify")
@@ -75,20 +31,23 @@ st.markdown("---")
 
 # 1. Top 10 artistas por popularidade
 st.subheader("Top 10 Artistas por Popularidade")
-top_pop = df_um_filtrado.sort_values("popularidade", ascending=False).head(10)
-fig1 = px.bar(top_pop, x="nome", y="popularidade", color="popularidade", text="popularidade")
+fig1 = cached_figure("popularidade/top_popularidade", estado, lambda: px.bar(
+    df_um_filtrado.sort_values("popularidade", ascending=False).head(10),
+    x="nome", y="popularidade", color="popularidade", text="popularidade"))
 st.plotly_chart(fig1, use_container_width=True)
 
 # 2. Top 10 artistas por seguidores
 st.subheader("Top 10 Artistas por Seguidores")
-top_seg = df_um_filtrado.sort_values("seguidores", ascending=False).head(10)
-fig2 = px.bar(top_seg, x="nome", y="seguidores", color="seguidores", text="seguidores")
+fig2 = cached_figure("popularidade/top_seguidores", estado, lambda: px.bar(
+    df_um_filtrado.sort_values("seguidores", ascending=False).head(10),
+    x="nome", y="seguidores", color="seguidores", text="seguidores"))
 st.plotly_chart(fig2, use_container_width=True)
 
 # 3. Dispersão Popularidade x Seguidores
 st.subheader("Popularidade vs Seguidores")
-fig3 = px.scatter(df_um_filtrado, x="seguidores", y="popularidade", size="popularidade", 
-                  color="tipo", hover_name="nome", log_x=True)
+fig3 = cached_figure("popularidade/dispersao", estado, lambda: px.scatter(
+    df_um_filtrado, x="seguidores", y="popularidade", size="popularidade",
+    color="tipo", hover_name="nome", log_x=True))
 st.plotly_chart(fig3, use_container_width=True)
 
 # 4. Distribuição da popularidade por tipo
@@ -103,15 +62,44 @@ st.altair_chart(fig4, use_container_width=True)
 # 5. Artistas mais populares com imagem
 st.subheader("Ranking Geral de Popularidade")
 df_sorted = df_um_filtrado.sort_values("popularidade", ascending=False)
+# Miniaturas locais, ARTISTAS_POR_PAGINA por vez
+ARTISTAS_POR_PAGINA = 20
+total_paginas = max(1, -(-len(df_sorted) // ARTISTAS_POR_PAGINA))
+pagina = 1
+if total_paginas > 1:
+    pagina = st.number_input("Página", min_value=1, max_value=total_paginas, value=1, step=1)
+df_pagina = df_sorted.iloc[(pagina - 1) * ARTISTAS_POR_PAGINA:pagina * ARTISTAS_POR_PAGINA]
+miniaturas = load_thumbnails().get_many(df_pagina["imagem_principal"].fillna(""))
 cols = st.columns(5)
-for i, row in enumerate(df_sorted.itertuples()):
+for i, (row, miniatura) in enumerate(zip(df_pagina.itertuples(), miniaturas)):
     with cols[i % 5]:
-        st.image(row.imagem_principal, caption=f"{row.nome} ({row.popularidade})")
+        # Sem miniatura (foto fora do ar ou sem internet), o navegador tenta a URL original
+        st.image(miniatura if miniatura is not None else row.imagem_principal, caption=f"{row.nome} ({row.popularidade})")
 
 # 6. Média de popularidade por tipo
 st.subheader("Média de Popularidade por Tipo de Artista")
-mean_pop = df_um_filtrado.groupby("tipo")["popularidade"].mean().round(0).astype(int).reset_index()
-fig6 = px.bar(mean_pop, x="tipo", y="popularidade", color="tipo", text="popularidade")
+fig6 = cached_figure("popularidade/media_por_tipo", estado, lambda: px.bar(
+    df_um_filtrado.groupby("tipo")["popularidade"].mean().round(0).astype(int).reset_index(),
+    x="tipo", y="popularidade", color="tipo", text="popularidade"))
 
 st.plotly_chart(fig6, use_container_width=True)
 
+# 7. Evolução da popularidade e dos seguidores ao longo das coletas
+st.subheader("Evolução da Popularidade")
+df_historico = cached("popularidade/historico", estado, lambda: read_history(artists=estado.artists))
+if df_historico["data"].nunique() < 2:
+    st.info("O histórico ainda não tem coletas suficientes. Cada execução de `python -m inferify.spotify` acrescenta uma coleta.")
+else:
+    fig7 = cached_figure("popularidade/evolucao", estado, lambda: px.line(
+        df_historico, x="data", y="popularidade", color="nome", markers=True))
+    st.plotly_chart(fig7, use_container_width=True)
+
+    st.subheader("Crescimento Mensal de Seguidores (%)")
+    df_crescimento = cached("popularidade/crescimento", estado, lambda: growth(df_historico))
+    if df_crescimento.empty:
+        st.info("O crescimento mensal aparece a partir do segundo mês de coletas.")
+    else:
+        fig8 = cached_figure("popularidade/crescimento", estado, lambda: px.bar(
+            df_crescimento, x="data", y="crescimento", color="nome", barmode="group"))
+        st.plotly_chart(fig8, use_container_width=True)
+